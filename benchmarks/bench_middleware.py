@@ -0,0 +1,177 @@
+"""
+Per-request cost of the logging + security headers middleware stack:
+the previous BaseHTTPMiddleware versions against the plain ASGI ones,
+on /health and on a 100-chunk streaming response.
+
+Requests are driven in-process straight through the ASGI interface, so
+the numbers are the app and middleware only, without a server or HTTP
+parsing. Log output is disabled for the run; both stacks log the same.
+The ASGI LoggingMiddleware also records the Prometheus request metrics,
+which the legacy one predates, so its overhead includes that work.
+
+    python -m benchmarks.bench_middleware
+"""
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.handlers.liveness_handler import router as liveness_router
+from src.logger import logger
+from src.middleware.logging_middleware import LoggingMiddleware
+from src.middleware.security_headers import SecurityHeadersMiddleware
+
+
+# The middlewares as of 43aab81, before the ASGI rewrite, copied verbatim
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """Add security headers to all responses."""
+    
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        
+        # Security headers
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        response.headers["Content-Security-Policy"] = "default-src 'self'"
+        
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """Middleware to log all requests and responses."""
+    
+    async def dispatch(self, request: Request, call_next):
+        """Log request and response details."""
+        start_time = time.time()
+        
+        # Log request
+        logger.info(
+            f"Request: {request.method} {request.url.path}",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "client": request.client.host if request.client else None
+            }
+        )
+        
+        # Process request
+        response = await call_next(request)
+        
+        # Calculate duration
+        duration = time.time() - start_time
+        
+        # Log response
+        logger.info(
+            f"Response: {response.status_code} - Duration: {duration:.3f}s",
+            extra={
+                "status_code": response.status_code,
+                "duration": duration,
+                "path": request.url.path
+            }
+        )
+        
+        return response
+
+
+def build_app(security_headers=None, logging=None) -> FastAPI:
+    app = FastAPI()
+    if security_headers:
+        app.add_middleware(security_headers)
+    if logging:
+        app.add_middleware(logging)
+    app.include_router(liveness_router)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(100):
+                yield b"x" * 1024
+        return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+    return app
+
+
+async def request(app, path: str):
+    """One GET through the ASGI interface; returns (status, headers, body bytes)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent_request = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    result = {"status": None, "headers": [], "body": 0}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            result["headers"] = message["headers"]
+        elif message["type"] == "http.response.body":
+            result["body"] += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    disconnected.set()
+    return result["status"], dict(result["headers"]), result["body"]
+
+
+async def measure(app, path: str, count: int, rounds: int = 5) -> float:
+    """Best mean seconds per request over `rounds` batches of `count`."""
+    for _ in range(200):
+        await request(app, path)
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(count):
+            await request(app, path)
+        best = min(best, (time.perf_counter() - start) / count)
+    return best
+
+
+async def main():
+    logger.disabled = True
+    stacks = {
+        "no middleware": build_app(),
+        "BaseHTTPMiddleware x2": build_app(LegacySecurityHeadersMiddleware, LegacyLoggingMiddleware),
+        "pure ASGI x2": build_app(SecurityHeadersMiddleware, LoggingMiddleware),
+    }
+
+    # Same observable response from both stacks
+    legacy = await request(stacks["BaseHTTPMiddleware x2"], "/stream")
+    current = await request(stacks["pure ASGI x2"], "/stream")
+    assert legacy[0] == current[0] == 200 and legacy[2] == current[2] == 100 * 1024
+    assert legacy[1][b"x-frame-options"] == current[1][b"x-frame-options"] == b"DENY"
+
+    print(f"{'path':<8} {'stack':<24} {'per request':>12} {'overhead':>10}")
+    for path, count in (("/health", 2000), ("/stream", 300)):
+        baseline = None
+        for name, app in stacks.items():
+            seconds = await measure(app, path, count)
+            if baseline is None:
+                baseline = seconds
+            print(f"{path:<8} {name:<24} {seconds * 1e6:>10.1f}us {(seconds - baseline) * 1e6:>8.1f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,171 @@
+"""
+Compare the precompiled SOAP builder with the f-string envelopes YetiClient
+used before it. Legacy builders are copied here verbatim and include the
+`.encode()` httpx performs on str content, so both sides produce bytes.
+
+    python -m benchmarks.bench_soap_builder
+"""
+import time
+from types import SimpleNamespace
+from xml.parsers import expat
+
+from src.utils import soap_builder
+
+
+def _legacy_flight_availability(r) -> bytes:
+    return f"""<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:tem="http://tempuri.org/">
+   <soapenv:Header/>
+   <soapenv:Body>
+      <tem:FlightAvailability>
+         <tem:strAgencyCode>AGENCY</tem:strAgencyCode>
+         <tem:strPassword>secret</tem:strPassword>
+         <tem:strOrigin>{r.origin}</tem:strOrigin>
+         <tem:strDestination>{r.destination}</tem:strDestination>
+         <tem:strDepartFrom>{r.depart_date.replace('-', '')}</tem:strDepartFrom>
+         <tem:strDepartTo>{r.depart_date.replace('-', '')}</tem:strDepartTo>
+         <tem:strReturnFrom>{r.return_date.replace('-', '')}</tem:strReturnFrom>
+         <tem:strReturnTo>{r.return_date.replace('-', '')}</tem:strReturnTo>
+         <tem:iAdult>{r.adults}</tem:iAdult>
+         <tem:iChild>{r.children}</tem:iChild>
+         <tem:iInfant>{r.infants}</tem:iInfant>
+         <tem:iOther>{r.others}</tem:iOther>
+         <tem:nationality>{r.nationality}</tem:nationality>
+         <tem:strBookingClass></tem:strBookingClass>
+         <tem:strBoardingClass></tem:strBoardingClass>
+         <tem:strPromoCode></tem:strPromoCode>
+         <tem:strLanguageCode>EN</tem:strLanguageCode>
+      </tem:FlightAvailability>
+   </soapenv:Body>
+</soapenv:Envelope>""".encode()
+
+
+def _legacy_booking_save(request_data) -> bytes:
+    passengers_xml = ""
+    for p in request_data.passengers:
+        passengers_xml += f"""
+                <Passenger>
+                    <passenger_id>{p.passenger_id}</passenger_id>
+                    <passenger_type_rcd>{p.passenger_type_rcd}</passenger_type_rcd>
+                    <lastname>{p.lastname}</lastname>
+                    <firstname>{p.firstname}</firstname>
+                    <gender_type_rcd>{p.gender_type_rcd}</gender_type_rcd>
+                    <nationality_rcd>{p.nationality_rcd}</nationality_rcd>
+                    <date_of_birth>{p.date_of_birth}</date_of_birth>
+                </Passenger>"""
+
+    inner_xml = f"""<Booking>
+                <BookingHeader>
+                    <contact_name>{request_data.booking_header.contact_name}</contact_name>
+                    <contact_email>{request_data.booking_header.contact_email}</contact_email>
+                    <phone_mobile>{request_data.booking_header.phone_mobile}</phone_mobile>
+                    <phone_home>{request_data.booking_header.phone_home or ''}</phone_home>
+                    <phone_business>{request_data.booking_header.phone_business or ''}</phone_business>
+                </BookingHeader>
+                {passengers_xml}
+                <Payment>
+                    <form_of_payment_rcd>{request_data.payment.form_of_payment_rcd}</form_of_payment_rcd>
+                    <currency_rcd>{request_data.payment.currency_rcd}</currency_rcd>
+                    <payment_amount>{request_data.payment.payment_amount}</payment_amount>
+                </Payment>
+            </Booking>"""
+
+    return f"""<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:tem="http://tempuri.org/">
+   <soapenv:Header/>
+   <soapenv:Body>
+      <tem:BookingSave>
+         <tem:strXml>
+            <![CDATA[
+            {inner_xml}
+            ]]>
+         </tem:strXml>
+      </tem:BookingSave>
+   </soapenv:Body>
+</soapenv:Envelope>""".encode()
+
+
+AVAILABILITY = SimpleNamespace(
+    origin="KTM", destination="PKR", depart_date="2026-02-20", return_date="2026-02-27",
+    adults=2, children=1, infants=0, others=0, nationality="NP",
+)
+
+
+def _booking(passengers: int, lastname: str = "Sharma") -> SimpleNamespace:
+    return SimpleNamespace(
+        booking_header=SimpleNamespace(
+            contact_name="Ram Sharma", contact_email="ram@example.com",
+            phone_mobile="9800000000", phone_home=None, phone_business=None,
+        ),
+        passengers=[
+            SimpleNamespace(
+                passenger_id=str(i), passenger_type_rcd="ADULT", lastname=lastname,
+                firstname=f"Pax{i}", gender_type_rcd="M", nationality_rcd="NP",
+                date_of_birth="1990-01-01",
+            )
+            for i in range(passengers)
+        ],
+        payment=SimpleNamespace(form_of_payment_rcd="CASH", currency_rcd="NPR", payment_amount=12500.0),
+    )
+
+
+def _new_flight_availability(r) -> bytes:
+    return soap_builder.flight_availability(
+        agency_code="AGENCY", password="secret", origin=r.origin, destination=r.destination,
+        depart_from=r.depart_date.replace("-", ""), depart_to=r.depart_date.replace("-", ""),
+        return_from=r.return_date.replace("-", ""), return_to=r.return_date.replace("-", ""),
+        adults=r.adults, children=r.children, infants=r.infants, others=r.others,
+        nationality=r.nationality,
+    )
+
+
+CASES = {
+    "FlightAvailability": (AVAILABILITY, _legacy_flight_availability, _new_flight_availability),
+    "BookingSave(1 pax)": (_booking(1), _legacy_booking_save, soap_builder.booking_save),
+    "BookingSave(9 pax)": (_booking(9), _legacy_booking_save, soap_builder.booking_save),
+}
+
+
+def measure(fn, arg, number: int = 20000, repeat: int = 5) -> float:
+    """Best seconds per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(arg)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _is_well_formed(payload: bytes) -> bool:
+    try:
+        expat.ParserCreate().Parse(payload, True)
+        return True
+    except expat.ExpatError:
+        return False
+
+
+def _inner_is_well_formed(payload: bytes) -> bool:
+    start = payload.index(b"<![CDATA[") + len(b"<![CDATA[")
+    return _is_well_formed(payload[start:payload.index(b"]]>", start)].strip())
+
+
+def main():
+    print(f"{'operation':<20} {'legacy':>10} {'builder':>10} {'speedup':>8} {'legacy B':>9} {'builder B':>10}")
+    for name, (arg, legacy, new) in CASES.items():
+        legacy_s = measure(legacy, arg)
+        new_s = measure(new, arg)
+        print(
+            f"{name:<20} {legacy_s * 1e6:>8.2f}us {new_s * 1e6:>8.2f}us "
+            f"{legacy_s / new_s:>7.2f}x {len(legacy(arg)):>9} {len(new(arg)):>10}"
+        )
+
+    hostile = _booking(1, lastname="O'Neil & <Sons> ]]>")
+    print()
+    print("Passenger name with '&', '<' and ']]>':")
+    for label, fn in (("legacy", _legacy_booking_save), ("builder", soap_builder.booking_save)):
+        payload = fn(hostile)
+        print(f"  {label:<8} envelope well-formed={_is_well_formed(payload)} "
+              f"inner xml well-formed={_inner_is_well_formed(payload)}")
+
+
+if __name__ == "__main__":
+    main()
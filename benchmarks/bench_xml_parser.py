@@ -0,0 +1,65 @@
+"""
+Compare the tree parser (html.unescape + xmltodict) with the streaming
+expat parser on recorded FlightAvailability responses.
+
+    python -m benchmarks.bench_xml_parser
+"""
+import gc
+import time
+import tracemalloc
+
+from benchmarks.fixtures import availability_fixtures
+from src.utils.xml_parser import parse_yeti_xml_response
+from src.utils.streaming_xml_parser import iter_yeti_records, parse_yeti_xml_response_streaming
+
+
+def _consume_records(xml: str) -> int:
+    return sum(1 for _ in iter_yeti_records(xml))
+
+
+PARSERS = {
+    "tree": parse_yeti_xml_response,
+    "streaming": parse_yeti_xml_response_streaming,
+    "streaming_records": _consume_records,
+}
+
+
+def measure(fn, xml: str, repeat: int):
+    """Return (best seconds per call, peak bytes allocated during one call)."""
+    fn(xml)  # warm up
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn(xml)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    fn(xml)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    fixtures = availability_fixtures()
+    repeats = {"small": 200, "medium": 20, "huge": 3}
+
+    assert parse_yeti_xml_response(fixtures["medium"]) == parse_yeti_xml_response_streaming(fixtures["medium"])
+
+    print(f"{'fixture':<8} {'size':>10} {'parser':<18} {'time':>10} {'peak mem':>12}")
+    for name, xml in fixtures.items():
+        baseline = None
+        for parser_name, fn in PARSERS.items():
+            seconds, peak = measure(fn, xml, repeats[name])
+            if baseline is None:
+                baseline = (seconds, peak)
+                delta = ""
+            else:
+                delta = f"  ({seconds / baseline[0]:.2f}x time, {peak / baseline[1]:.2f}x mem)"
+            print(f"{name:<8} {len(xml):>10} {parser_name:<18} {seconds * 1000:>8.2f}ms {peak / 1024:>10.0f}KB{delta}")
+
+
+if __name__ == "__main__":
+    main()
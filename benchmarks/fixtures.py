@@ -0,0 +1,38 @@
+"""Recorded Yeti responses and helpers to scale them for benchmarks."""
+import os
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+_FLIGHT_OPEN = "&lt;AvailabilityFlight&gt;"
+_FLIGHT_CLOSE = "&lt;/AvailabilityFlight&gt;"
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def scale_availability(xml: str, flights: int) -> str:
+    """Repeat the recorded AvailabilityFlight elements until `flights` are present."""
+    start = xml.index(_FLIGHT_OPEN)
+    end = xml.rindex(_FLIGHT_CLOSE) + len(_FLIGHT_CLOSE)
+    block = xml[start:end]
+    recorded = block.count(_FLIGHT_OPEN)
+    repeats, remainder = divmod(flights, recorded)
+    parts = [block] * repeats
+    if remainder:
+        cut = 0
+        for _ in range(remainder):
+            cut = block.index(_FLIGHT_CLOSE, cut) + len(_FLIGHT_CLOSE)
+        parts.append(block[:cut])
+    return xml[:start] + "\n".join(parts) + xml[end:]
+
+
+def availability_fixtures() -> dict:
+    """Small (as recorded), medium and huge FlightAvailability responses."""
+    recorded = load_fixture("flight_availability_rs.xml")
+    return {
+        "small": recorded,
+        "medium": scale_availability(recorded, 200),
+        "huge": scale_availability(recorded, 5000),
+    }
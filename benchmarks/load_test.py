@@ -0,0 +1,242 @@
+"""
+Open-loop load test of the full booking flow against a running API:
+availability -> init -> add -> booking-session -> save -> itinerary.
+
+Flows start at a fixed rate (--rps) whether or not earlier ones have
+finished, so a slow server shows up as latency rather than as a lower
+request rate. Starts that would exceed --max-in-flight are counted as
+dropped instead of being delayed.
+
+    python -m benchmarks.yeti_simulator --port 8099 &
+    YETI_API_URL=http://127.0.0.1:8099/ RATE_LIMIT_ENABLED=false \\
+        uvicorn src.main:app --port 8000 --workers 4 &
+    python -m benchmarks.load_test --rps 20 --duration 60
+"""
+import argparse
+import asyncio
+import math
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from src.utils.xml_parser import extract_record_locator
+
+STEPS = ("availability", "init", "add", "booking-session", "save", "itinerary")
+
+SAVE_BODY = {
+    "booking_header": {
+        "contact_name": "Load Test",
+        "contact_email": "loadtest@example.com",
+        "phone_mobile": "9800000000",
+    },
+    "passengers": [{
+        "passenger_id": "0265c492-7fdb-4721-bd56-43ffabc763c7",
+        "passenger_type_rcd": "ADULT",
+        "lastname": "test",
+        "firstname": "test",
+        "gender_type_rcd": "M",
+        "nationality_rcd": "NP",
+        "date_of_birth": "19950101",
+    }],
+    "payment": {"form_of_payment_rcd": "CRAGT", "currency_rcd": "NPR", "payment_amount": 5050},
+}
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float]) -> Dict[str, Optional[float]]:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": values[-1] if values else None,
+    }
+
+
+class FlowRunner:
+    """Runs booking flows and collects per-step and per-flow results."""
+
+    def __init__(self, client: httpx.AsyncClient, origin: str, destination: str, depart_date: str):
+        self.client = client
+        self.origin = origin
+        self.destination = destination
+        self.depart_date = depart_date
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.flow_latencies: List[float] = []
+        self.flows_failed = 0
+        self.requests = 0
+
+    async def _step(self, step: str, path: str, body: dict, params: Optional[dict] = None) -> Optional[dict]:
+        self.requests += 1
+        start = time.perf_counter()
+        try:
+            response = await self.client.post(path, json=body, params=params)
+        except httpx.HTTPError as e:
+            self.errors[step][type(e).__name__] += 1
+            return None
+        self.latencies[step].append(time.perf_counter() - start)
+        if response.status_code != 200:
+            self.errors[step][str(response.status_code)] += 1
+            return None
+        return response.json()
+
+    async def run_flow(self) -> None:
+        start = time.perf_counter()
+        if await self._flow():
+            self.flow_latencies.append(time.perf_counter() - start)
+        else:
+            self.flows_failed += 1
+
+    async def _flow(self) -> bool:
+        availability = await self._step("availability", "/flights/availability", {
+            "origin": self.origin,
+            "destination": self.destination,
+            "depart_date": self.depart_date,
+            "adults": 1,
+        }, params={"view": "compact"})
+        if not availability or not availability.get("flights"):
+            return False
+        flight = availability["flights"][0]
+
+        init = await self._step("init", "/flights/init", {})
+        if not init:
+            return False
+        search_id = init["search_id"]
+
+        added = await self._step("add", "/flights/add", {
+            "search_id": search_id,
+            "flight_id": flight["flight_id"],
+            "fare_id": flight["fares"][0]["fare_id"] if flight["fares"] else "",
+            "origin": self.origin,
+            "destination": self.destination,
+            "adults": 1,
+        })
+        if not added:
+            return False
+
+        if not await self._step("booking-session", "/flights/booking-session", {"search_id": search_id}):
+            return False
+
+        saved = await self._step("save", "/flights/save", {"search_id": search_id, **SAVE_BODY})
+        if not saved:
+            return False
+        pnr = extract_record_locator(saved.get("raw_response", ""))
+        if not pnr:
+            self.errors["save"]["no_pnr"] += 1
+            return False
+
+        return bool(await self._step("itinerary", "/flights/itinerary", {"search_id": search_id, "pnr": pnr}))
+
+
+async def run_load(
+    base_url: str,
+    rps: float,
+    duration: float,
+    max_in_flight: int = 200,
+    timeout: float = 60.0,
+    origin: str = "KTM",
+    destination: str = "PKR",
+    depart_date: str = "20260220",
+) -> Dict[str, Any]:
+    """Drive flows at `rps` for `duration` seconds and return the summary."""
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        runner = FlowRunner(client, origin, destination, depart_date)
+        tasks = set()
+        dropped = 0
+        started = 0
+        begin = time.perf_counter()
+        total = int(rps * duration)
+        for i in range(total):
+            # Absolute schedule, so a slow iteration doesn't shift later starts
+            delay = begin + i / rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(tasks) >= max_in_flight:
+                dropped += 1
+                continue
+            task = asyncio.ensure_future(runner.run_flow())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            started += 1
+        if tasks:
+            await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - begin
+
+    completed = len(runner.flow_latencies)
+    return {
+        "base_url": base_url,
+        "target_rps": rps,
+        "duration": round(elapsed, 3),
+        "flows": {
+            "started": started,
+            "completed": completed,
+            "failed": runner.flows_failed,
+            "dropped": dropped,
+            "per_second": round(completed / elapsed, 3) if elapsed else 0.0,
+            "latency": summarize(runner.flow_latencies),
+        },
+        "requests": {
+            "sent": runner.requests,
+            "per_second": round(runner.requests / elapsed, 3) if elapsed else 0.0,
+        },
+        "steps": {
+            step: {**summarize(runner.latencies[step]), "errors": dict(runner.errors[step])}
+            for step in STEPS
+        },
+    }
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value * 1000:.1f}" if value is not None else "-"
+
+
+def print_report(summary: Dict[str, Any]) -> None:
+    flows = summary["flows"]
+    print(
+        f"{summary['duration']:.1f}s at {summary['target_rps']} flows/s target: "
+        f"{flows['completed']} completed, {flows['failed']} failed, {flows['dropped']} dropped; "
+        f"{flows['per_second']} flows/s, {summary['requests']['per_second']} requests/s"
+    )
+    print(f"{'step':<16} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}  errors")
+    rows = list(summary["steps"].items()) + [("flow", {**flows["latency"], "errors": {}})]
+    for step, stats in rows:
+        errors = ", ".join(f"{k}:{v}" for k, v in stats["errors"].items()) or "-"
+        print(
+            f"{step:<16} {stats['count']:>7} {_ms(stats['p50']):>9} {_ms(stats['p95']):>9} "
+            f"{_ms(stats['p99']):>9} {_ms(stats['max']):>9}  {errors}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open-loop load test of the booking flow")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rps", type=float, default=5.0, help="flows started per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep starting flows")
+    parser.add_argument("--max-in-flight", type=int, default=200)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--origin", default="KTM")
+    parser.add_argument("--destination", default="PKR")
+    parser.add_argument("--depart-date", default="20260220")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_load(
+        args.base_url, args.rps, args.duration, args.max_in_flight, args.timeout,
+        args.origin, args.destination, args.depart_date,
+    ))
+    print_report(summary)
+
+
+if __name__ == "__main__":
+    main()
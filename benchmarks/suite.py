@@ -0,0 +1,238 @@
+"""
+Microbenchmarks for the per-request CPU stages of an availability search,
+on the small (as recorded), medium and huge fixtures:
+
+    envelope.flight_availability   SOAP request bytes (soap_builder)
+    parse.tree / parse.streaming   Yeti XML -> dict
+    view.compact                   dict -> FlightSchema list (view=compact)
+    log.dto / log.model_json       audit_text (run by the audit sinks off the loop)
+    response.raw / response.compact
+                                   FastAPI's response_model serialization
+
+Each stage reports the best time over N runs and the peak memory
+allocated during one run. --json writes the results for keeping with a
+release; --compare reads such a file, prints the change per stage and
+exits non-zero if any stage got slower than --threshold.
+
+    python -m benchmarks.suite --json bench-0.2.0.json
+    python -m benchmarks.suite --compare bench-0.2.0.json
+"""
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.routing import APIRoute, serialize_response
+
+from benchmarks.fixtures import availability_fixtures
+from src.config import settings
+from src.dtos.flight_dto import ServiceResponseDTO
+from src.modules.audit_writer import audit_text
+from src.schemas.flight_offer_schema import FlightSchema
+from src.schemas.flight_schema import FlightAvailabilityResponse
+from src.utils import soap_builder
+from src.utils.flight_normalizer import normalize_availability
+from src.utils.streaming_xml_parser import parse_yeti_xml_response_streaming
+from src.utils.xml_parser import parse_yeti_xml_response
+
+SCHEMA_VERSION = 1
+REPEATS = {"small": 200, "medium": 20, "huge": 3}
+
+
+def measure(fn: Callable[[], Any], repeat: int):
+    """Return (best seconds per call, peak bytes allocated during one call)."""
+    fn()  # warm up
+    best = float("inf")
+    gc.collect()
+    # As timeit does: no collector pauses inside the timed calls
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def _run_sync(coro):
+    # serialize_response only awaits for sync endpoints; ours are async
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("coroutine suspended")
+
+
+async def _endpoint():
+    pass
+
+
+_RESPONSE_ROUTE = APIRoute(
+    "/flights/availability",
+    _endpoint,
+    methods=["POST"],
+    response_model=FlightAvailabilityResponse,
+    response_model_exclude_unset=True,
+)
+
+
+def fastapi_serialize(response: FlightAvailabilityResponse) -> bytes:
+    """Serialize the way FastAPI does for the /flights/availability route."""
+    return _run_sync(serialize_response(
+        field=_RESPONSE_ROUTE.response_field,
+        response_content=response,
+        exclude_unset=True,
+        dump_json=True,
+    ))
+
+
+def compact_view(data) -> List[FlightSchema]:
+    return [FlightSchema.model_validate(flight) for flight in normalize_availability(data)]
+
+
+def build_envelope() -> bytes:
+    return soap_builder.flight_availability(
+        agency_code=settings.YETI_AGENCY_CODE,
+        password=settings.YETI_PASSWORD,
+        origin="KTM",
+        destination="PKR",
+        depart_from="20260220",
+        depart_to="20260220",
+        return_from="",
+        return_to="",
+        adults=2,
+        children=1,
+        infants=0,
+        others=0,
+        nationality="NP",
+    )
+
+
+def stages(xml: str) -> Dict[str, Callable[[], Any]]:
+    """Stage name -> zero-argument callable, with inputs prepared outside the timing."""
+    parsed = parse_yeti_xml_response(xml)
+    flights = compact_view(parsed)
+    raw_response = FlightAvailabilityResponse(search_id="bench", data=parsed)
+    compact_response = FlightAvailabilityResponse(search_id="bench", flights=flights)
+    dto = ServiceResponseDTO(search_id="bench", data=parsed)
+    return {
+        "parse.tree": lambda: parse_yeti_xml_response(xml),
+        "parse.streaming": lambda: parse_yeti_xml_response_streaming(xml),
+        "view.compact": lambda: compact_view(parsed),
+        "log.dto": lambda: audit_text(dto),
+        "log.model_json": lambda: audit_text(raw_response),
+        "response.raw": lambda: fastapi_serialize(raw_response),
+        "response.compact": lambda: fastapi_serialize(compact_response),
+    }
+
+
+def run(scale: float = 1.0) -> List[Dict[str, Any]]:
+    results = []
+
+    def record(stage: str, fixture: str, size: int, fn: Callable[[], Any], repeat: int):
+        repeat = max(1, int(repeat * scale))
+        seconds, peak = measure(fn, repeat)
+        results.append({
+            "stage": stage,
+            "fixture": fixture,
+            "input_bytes": size,
+            "repeat": repeat,
+            "seconds": seconds,
+            "peak_bytes": peak,
+        })
+
+    record("envelope.flight_availability", "-", len(build_envelope()), build_envelope, 2000)
+    for fixture, xml in availability_fixtures().items():
+        for stage, fn in stages(xml).items():
+            record(stage, fixture, len(xml), fn, REPEATS[fixture])
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "version": settings.APP_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def print_results(results: List[Dict[str, Any]], baseline: Optional[Dict[tuple, Dict[str, Any]]] = None):
+    print(f"{'stage':<30} {'fixture':<8} {'time':>11} {'peak mem':>11}" + ("  vs baseline" if baseline else ""))
+    for r in results:
+        line = f"{r['stage']:<30} {r['fixture']:<8} {r['seconds'] * 1000:>9.3f}ms {r['peak_bytes'] / 1024:>9.0f}KB"
+        base = baseline.get((r["stage"], r["fixture"])) if baseline else None
+        if base:
+            line += f"  {r['seconds'] / base['seconds']:.2f}x time, {r['peak_bytes'] / max(base['peak_bytes'], 1):.2f}x mem"
+        print(line)
+
+
+def regressions(results, baseline, threshold: float) -> List[str]:
+    """Stages whose time grew by more than `threshold` (0.2 = 20%) over the baseline."""
+    slower = []
+    for r in results:
+        base = baseline.get((r["stage"], r["fixture"]))
+        if base and r["seconds"] > base["seconds"] * (1 + threshold):
+            slower.append(f"{r['stage']} [{r['fixture']}] {r['seconds'] / base['seconds']:.2f}x")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage CPU and memory microbenchmarks")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON ('-' for stdout)")
+    parser.add_argument("--compare", metavar="PATH", help="JSON results from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before failing (0.2 = 20%%)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply repeat counts (e.g. 0.1 for a quick run)")
+    args = parser.parse_args()
+
+    results = run(args.scale)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = {(r["stage"], r["fixture"]): r for r in json.load(f)["results"]}
+
+    if args.json == "-":
+        json.dump(report(results), sys.stdout, indent=2)
+        print()
+    else:
+        print_results(results, baseline)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report(results), f, indent=2)
+
+    if baseline:
+        slower = regressions(results, baseline, args.threshold)
+        if slower:
+            print(f"Slower than baseline by more than {args.threshold:.0%}: " + "; ".join(slower), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
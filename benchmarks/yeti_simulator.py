@@ -0,0 +1,183 @@
+"""
+Local stand-in for the Yeti SOAP endpoint, for load tests.
+
+Answers the six operations YetiClient uses. FlightAvailability returns the
+recorded response (optionally scaled to --flights flights); the other
+operations return responses modelled on the same SOAP shape from
+benchmarks/fixtures. ServiceInitialize hands out an ASP.NET_SessionId
+cookie that FlightAdd, BookingGetSession and BookingSave require, so the
+API's per-search session handling is exercised too.
+
+    python -m benchmarks.yeti_simulator --port 8099 --latency 0.15 --jitter 0.1 --error-rate 0.01
+
+then point the API at it with YETI_API_URL=http://127.0.0.1:8099/.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import string
+import uuid
+from string import Template
+from typing import Dict, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from benchmarks.fixtures import load_fixture, scale_availability
+
+SESSION_COOKIE = "ASP.NET_SessionId"
+OPERATIONS = (
+    "FlightAvailability",
+    "ServiceInitialize",
+    "FlightAdd",
+    "BookingGetSession",
+    "BookingSave",
+    "BookingGetItinerary",
+)
+
+_OPERATION = re.compile(rb"<(?:\w+:)?(" + "|".join(OPERATIONS).encode() + rb")[\s/>]")
+_RECORD_LOCATOR = re.compile(rb"<(?:\w+:)?strRecordLocator>([^<]*)<")
+_FLIGHT_ID = re.compile(rb"<flight_id>([^<]*)</flight_id>")
+_FARE_ID = re.compile(rb"<fare_id>([^<]*)</fare_id>")
+
+
+def _record_locator() -> str:
+    return "".join(random.choices(string.ascii_uppercase + string.digits, k=6))
+
+
+class YetiSimulator:
+    """
+    Simulated upstream. Each call sleeps `latency` seconds plus an
+    exponentially distributed extra with mean `jitter`, then fails with
+    `error_status` and a SOAP fault with probability `error_rate`.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        flights: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+        availability = load_fixture("flight_availability_rs.xml")
+        if flights:
+            availability = scale_availability(availability, flights)
+        self.availability = availability.encode("utf-8")
+        self.templates = {
+            name: Template(load_fixture(f"{fixture}.xml"))
+            for name, fixture in (
+                ("ServiceInitialize", "service_initialize_rs"),
+                ("FlightAdd", "flight_add_rs"),
+                ("BookingGetSession", "booking_get_session_rs"),
+                ("BookingSave", "booking_save_rs"),
+                ("BookingGetItinerary", "booking_get_itinerary_rs"),
+                ("Fault", "soap_fault"),
+            )
+        }
+        # session id -> booking state built up by FlightAdd/BookingSave
+        self.sessions: Dict[str, Dict[str, str]] = {}
+        self.calls: Dict[str, int] = {name: 0 for name in OPERATIONS}
+        self.errors = 0
+
+    def _xml(self, body: str, status: int = 200, cookie: Optional[str] = None) -> Response:
+        response = Response(body, status_code=status, media_type="text/xml; charset=utf-8")
+        if cookie:
+            response.set_cookie(SESSION_COOKIE, cookie, path="/")
+        return response
+
+    def _fault(self, message: str, status: int = 500) -> Response:
+        self.errors += 1
+        return self._xml(self.templates["Fault"].substitute(message=message), status)
+
+    async def handle(self, request: Request) -> Response:
+        payload = await request.body()
+        match = _OPERATION.search(payload)
+        if not match:
+            return self._fault("Unknown operation", 400)
+        operation = match.group(1).decode()
+        self.calls[operation] += 1
+
+        delay = self.latency + (random.expovariate(1 / self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and random.random() < self.error_rate:
+            return self._fault(f"Simulated {operation} failure", self.error_status)
+
+        if operation == "FlightAvailability":
+            return self._xml(self.availability)
+        if operation == "ServiceInitialize":
+            session_id = uuid.uuid4().hex
+            self.sessions[session_id] = {}
+            return self._xml(self.templates[operation].substitute(), cookie=session_id)
+        if operation == "BookingGetItinerary":
+            pnr = _RECORD_LOCATOR.search(payload)
+            return self._xml(self.templates[operation].substitute(
+                record_locator=pnr.group(1).decode() if pnr else ""
+            ))
+
+        session = self.sessions.get(request.cookies.get(SESSION_COOKIE, ""))
+        if session is None:
+            return self._fault("Session is not initialized")
+        if operation == "FlightAdd":
+            flight_id = _FLIGHT_ID.search(payload)
+            fare_id = _FARE_ID.search(payload)
+            session["flight_id"] = flight_id.group(1).decode() if flight_id else ""
+            session["fare_id"] = fare_id.group(1).decode() if fare_id else ""
+        elif operation == "BookingSave":
+            if "flight_id" not in session:
+                return self._fault("Booking has no flight segment")
+            session.setdefault("record_locator", _record_locator())
+            session["booking_id"] = str(uuid.uuid4()).upper()
+        return self._xml(self.templates[operation].substitute(
+            flight_id=session.get("flight_id", ""),
+            fare_id=session.get("fare_id", ""),
+            record_locator=session.get("record_locator", ""),
+            booking_status="CONFIRMED" if "record_locator" in session else "NEW",
+            booking_id=session.get("booking_id", ""),
+        ))
+
+    async def stats(self, request: Request) -> Response:
+        body = {"calls": self.calls, "errors": self.errors, "sessions": len(self.sessions)}
+        return Response(json.dumps(body), media_type="application/json")
+
+
+def create_app(simulator: YetiSimulator) -> Starlette:
+    return Starlette(routes=[
+        Route("/_stats", simulator.stats, methods=["GET"]),
+        Route("/{path:path}", simulator.handle, methods=["POST"]),
+    ])
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.1, help="base latency per call, seconds")
+    parser.add_argument("--jitter", type=float, default=0.05, help="mean of the exponential extra latency, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls that fail (0-1)")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status of simulated failures")
+    parser.add_argument("--flights", type=int, default=None,
+                        help="scale FlightAvailability to this many flights (default: as recorded)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    simulator = YetiSimulator(args.latency, args.jitter, args.error_rate, args.error_status, args.flights)
+    uvicorn.run(create_app(simulator), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
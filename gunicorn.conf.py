@@ -0,0 +1,7 @@
+"""Gunicorn hooks for running the API with several UvicornWorkers."""
+from src.modules.metrics import mark_worker_dead
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's in-flight gauges from the shared metrics directory
+    mark_worker_dead(worker.pid)
@@ -1,17 +1,116 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from src.config import settings
+from src.modules import metrics
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_async_engine(DATABASE_URL, echo=True)
 
-AsyncSessionLocal = sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
-)
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited (including connects)."""
+
+    def _do_get(self):
+        # logging_name survives Pool.recreate(), so it doubles as the metrics label
+        pool = self._orig_logging_name or "primary"
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            metrics.DB_POOL_CHECKOUT_TIMEOUTS.labels(pool=pool).inc()
+            raise
+        finally:
+            metrics.DB_POOL_CHECKOUT_WAIT.labels(pool=pool).observe(time.perf_counter() - start)
+        return connection
+
+
+class DatabasePoolManager:
+    """
+    The primary engine and an optional read replica, sized from settings.
+
+    Both pools record checkout wait and connections in use. Reads go to the
+    replica through `read_session_factory`, which falls back to the primary
+    when DATABASE_REPLICA_URL is empty.
+    """
+
+    def __init__(self, url: str, replica_url: Optional[str] = None):
+        self.engine = self._create_engine(url, "primary")
+        self.replica_engine = self._create_engine(replica_url, "replica") if replica_url else None
+        self.session_factory = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.read_session_factory = (
+            sessionmaker(self.replica_engine, class_=AsyncSession, expire_on_commit=False)
+            if self.replica_engine else self.session_factory
+        )
+
+    @staticmethod
+    def _connect_args(url: str) -> Dict[str, Any]:
+        if make_url(url).get_driver_name() != "asyncpg":
+            return {}
+        size = settings.DATABASE_STATEMENT_CACHE_SIZE
+        # SQLAlchemy's prepared statement cache and asyncpg's own; 0 disables
+        # both, as a transaction-pooling PgBouncer requires
+        return {"prepared_statement_cache_size": size, "statement_cache_size": size}
+
+    def _create_engine(self, url: str, name: str) -> AsyncEngine:
+        engine = create_async_engine(
+            url,
+            echo=settings.DATABASE_ECHO,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+            pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+            pool_logging_name=name,
+            connect_args=self._connect_args(url),
+        )
+        in_use = metrics.DB_POOL_CONNECTIONS_IN_USE.labels(pool=name)
+        event.listen(engine.sync_engine, "checkout", lambda *args: in_use.inc())
+        event.listen(engine.sync_engine, "checkin", lambda *args: in_use.dec())
+        return engine
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool occupancy for this process."""
+        def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+            pool = engine.pool
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            }
+
+        stats = {"primary": pool_stats(self.engine)}
+        if self.replica_engine:
+            stats["replica"] = pool_stats(self.replica_engine)
+        return stats
+
+    async def dispose(self) -> None:
+        await self.engine.dispose()
+        if self.replica_engine:
+            await self.replica_engine.dispose()
+
+
+db_manager = DatabasePoolManager(DATABASE_URL, settings.DATABASE_REPLICA_URL or None)
+
+engine = db_manager.engine
+
+AsyncSessionLocal = db_manager.session_factory
+ReadSessionLocal = db_manager.read_session_factory
 
 Base = declarative_base()
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+async def get_read_db():
+    async with ReadSessionLocal() as session:
+        yield session
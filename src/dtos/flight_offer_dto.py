@@ -0,0 +1,60 @@
+"""Compact typed flight/segment/fare model built from availability responses."""
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass(slots=True)
+class FareDTO:
+    """One bookable fare on a flight."""
+    fare_id: str
+    booking_class: Optional[str] = None
+    boarding_class: Optional[str] = None
+    fare_code: Optional[str] = None
+    currency: Optional[str] = None
+    adult_fare: Optional[float] = None
+    child_fare: Optional[float] = None
+    infant_fare: Optional[float] = None
+    total_adult_fare: Optional[float] = None
+    tax_amount: Optional[float] = None
+    seats_available: Optional[int] = None
+    refundable: Optional[bool] = None
+
+
+@dataclass(slots=True)
+class SegmentDTO:
+    """A single flown leg."""
+    airline: Optional[str]
+    flight_number: Optional[str]
+    origin: Optional[str]
+    destination: Optional[str]
+    departure_date: Optional[str]
+    departure_time: Optional[str]
+    arrival_time: Optional[str]
+    aircraft: Optional[str] = None
+
+
+@dataclass(slots=True)
+class FlightDTO:
+    """A flight option with its segments and the fares offered on it."""
+    flight_id: str
+    direction: str
+    segments: List[SegmentDTO] = field(default_factory=list)
+    fares: List[FareDTO] = field(default_factory=list)
+
+    @property
+    def lowest_fare(self) -> Optional[float]:
+        totals = [f.total_adult_fare for f in self.fares if f.total_adult_fare is not None]
+        return min(totals) if totals else None
+
+
+@dataclass(slots=True)
+class DateAvailabilityDTO:
+    """Flights departing on one date of a flexible-date search."""
+    date: str
+    flights: List[FlightDTO] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def lowest_fare(self) -> Optional[float]:
+        fares = [f.lowest_fare for f in self.flights if f.lowest_fare is not None]
+        return min(fares) if fares else None
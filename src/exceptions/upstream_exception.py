@@ -0,0 +1,34 @@
+"""Upstream (Yeti API) protection exceptions."""
+from src.exceptions.base_exception import BaseCustomException
+from src.exceptions.validation_exception import ServiceUnavailableException
+
+
+class CircuitOpenException(ServiceUnavailableException):
+    """Exception raised when a circuit breaker is rejecting calls to an operation."""
+    def __init__(self, operation: str, retry_after: float):
+        super().__init__(
+            message=f"Upstream {operation} is temporarily unavailable",
+            details={"operation": operation, "retry_after": round(retry_after, 1)}
+        )
+        self.error_code = "CIRCUIT_OPEN"
+
+
+class UpstreamOverloadedException(ServiceUnavailableException):
+    """Exception raised when the upstream concurrency limit and its queue are exhausted."""
+    def __init__(self, limiter: str, details: dict = None):
+        super().__init__(
+            message=f"Too many in-flight upstream requests ({limiter})",
+            details=details
+        )
+        self.error_code = "UPSTREAM_OVERLOADED"
+
+
+class UpstreamCallException(BaseCustomException):
+    """Exception raised for a shared upstream call that failed in another worker."""
+    def __init__(self, operation: str, message: str, status_code: int = 502, error_code: str = "UPSTREAM_ERROR"):
+        super().__init__(
+            message=message,
+            status_code=status_code,
+            error_code=error_code,
+            details={"operation": operation}
+        )
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from src.config import settings
+from src.services.flight_service_facade import flight_service_facade
+from src.logger import get_search_logger
+from src.middleware.rate_limiter import limiter
+from src.exceptions.base_exception import BaseCustomException
+from src.schemas.booking_save_schema import BookingSaveRequest
+from src.schemas.booking_job_schema import BookingJobResponse
+
+router = APIRouter(prefix="/flights/save/jobs", tags=["flights"])
+
+@router.post("", response_model=BookingJobResponse, response_model_exclude_none=True, status_code=202)
+@limiter.limit("10/minute")
+async def submit_booking(request: Request, response: Response, save_request: BookingSaveRequest):
+    """
+    Queue a BookingSave for the booking workers and return its job (202).
+    Poll GET /flights/save/jobs/{job_id}, optionally with `wait` to hold
+    the request until the job finishes.
+    """
+    search_id = save_request.search_id
+    logger = get_search_logger(search_id)
+
+    logger.info(f"Received async BookingSave request: {save_request}")
+    try:
+        job = await flight_service_facade.submit_booking(save_request)
+        response.headers["Location"] = f"{router.prefix}/{job.job_id}"
+        return job
+    except BaseCustomException:
+        raise
+    except Exception as e:
+        logger.error(f"Error queueing BookingSave request: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{job_id}", response_model=BookingJobResponse, response_model_exclude_none=True)
+@limiter.limit("120/minute")
+async def get_booking_job(
+    request: Request,
+    job_id: str,
+    wait: float = Query(0, ge=0, le=settings.BOOKING_JOB_MAX_WAIT, description="seconds to wait for the job to finish"),
+):
+    """
+    Booking job state: queued, running, succeeded (with pnr and raw_response),
+    failed (with error), or unknown when Yeti may have saved the booking
+    without us seeing the answer - check the itinerary before retrying.
+    """
+    job = await flight_service_facade.get_booking_job(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Booking job not found or expired")
+    return job
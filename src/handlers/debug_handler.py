@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from src.db import db_manager
+from src.modules.yeti_client import yeti_client
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+@router.get("/upstream")
+async def upstream_state():
+    """
+    Circuit breaker state per Yeti operation, the adaptive concurrency limiter,
+    and hedging counters with per-operation latency percentiles.
+    """
+    return {
+        **yeti_client.stats(),
+        "circuit_breakers": yeti_client.circuit_breakers.stats(),
+        "concurrency_limiter": yeti_client.concurrency_limiter.stats(),
+    }
+
+
+@router.get("/db")
+async def database_pools():
+    """Connection pool occupancy for this worker (primary and replica)."""
+    return db_manager.stats()
@@ -1,9 +1,16 @@
 import uuid
-from fastapi import APIRouter, HTTPException, Request
-from src.schemas.flight_schema import FlightAvailabilityRequest, FlightAvailabilityResponse
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from src.schemas.flight_schema import (
+    FlightAvailabilityRequest,
+    FlightAvailabilityResponse,
+    BatchAvailabilityRequest,
+    BatchAvailabilityResponse,
+)
 from src.services.flight_service_facade import flight_service_facade
 from src.logger import get_search_logger
 from src.middleware.rate_limiter import limiter
+from src.exceptions.base_exception import BaseCustomException
 
 from src.schemas.service_schema import ServiceResponse
 from src.schemas.flight_add_schema import FlightAddRequest, FlightAddResponse
@@ -13,27 +20,76 @@ from src.schemas.itinerary_schema import ItineraryRequest, ItineraryResponse
 
 router = APIRouter(prefix="/flights", tags=["flights"])
 
-@router.post("/availability", response_model=FlightAvailabilityResponse)
+def _wants_fresh(request: Request) -> bool:
+    """True when the client asked to bypass caches via Cache-Control."""
+    directives = {
+        d.strip().lower() for d in request.headers.get("cache-control", "").split(",")
+    }
+    return bool(directives & {"no-cache", "no-store", "max-age=0"})
+
+@router.post("/availability", response_model=FlightAvailabilityResponse, response_model_exclude_unset=True)
 @limiter.limit("20/minute")
-async def check_availability(http_request: Request, request: FlightAvailabilityRequest):
+async def check_availability(
+    request: Request,
+    availability_request: FlightAvailabilityRequest,
+    view: Literal["raw", "compact"] = "raw",
+    sort_by: Optional[Literal["price", "departure"]] = Query(
+        None, description="sort the compact flight lists; rejected (422) with view=raw unless the search is flexible-date"
+    )
+):
     """
     Check flight availability with rate limiting (20 requests/minute).
+    Pass view=compact for the typed flight/segment/fare list instead of the raw payload.
+    Set flex_days (+/- days) or depart_date_to for a flexible-date search; its
+    flights come back grouped by departure date under `dates`.
     """
     search_id = str(uuid.uuid4())
     logger = get_search_logger(search_id)
     
-    logger.info(f"Received flight availability request: {request}")
+    logger.info(f"Received flight availability request: {availability_request}")
     try:
-        response = await flight_service_facade.check_availability(request, search_id)
+        response = await flight_service_facade.check_availability(availability_request, search_id, view, sort_by)
         logger.info("Successfully processed flight availability request")
         return response
+    except BaseCustomException:
+        raise
     except Exception as e:
         logger.error(f"Error processing flight availability request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/availability/batch", response_model=BatchAvailabilityResponse, response_model_exclude_unset=True)
+@limiter.limit("10/minute")
+async def check_availability_batch(
+    request: Request,
+    batch_request: BatchAvailabilityRequest,
+    view: Literal["raw", "compact"] = "raw",
+    sort_by: Optional[Literal["price", "departure"]] = Query(
+        None, description="sort the compact flight lists; rejected (422) with view=raw unless the search is flexible-date"
+    )
+):
+    """
+    Check availability for up to BATCH_AVAILABILITY_MAX_ROUTES routes in one call
+    with rate limiting (10 requests/minute). All routes share one search_id and log
+    directory; each route's result carries its own error if it failed.
+    """
+    search_id = str(uuid.uuid4())
+    logger = get_search_logger(search_id)
+    
+    logger.info(f"Received batch availability request for {len(batch_request.requests)} routes")
+    try:
+        response = await flight_service_facade.check_availability_batch(batch_request.requests, search_id, view, sort_by)
+        failed = sum(1 for result in response.results if not result.success)
+        logger.info(f"Successfully processed batch availability request ({failed} routes failed)")
+        return response
+    except BaseCustomException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing batch availability request: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/init", response_model=ServiceResponse)
 @limiter.limit("30/minute")
-async def service_initialize(http_request: Request):
+async def service_initialize(request: Request):
     """
     Initialize service with rate limiting (30 requests/minute).
     """
@@ -45,80 +101,93 @@ async def service_initialize(http_request: Request):
         response_text = await flight_service_facade.initialize_service(search_id)
         logger.info("Successfully processed ServiceInitialize request")
         return ServiceResponse(search_id=search_id, raw_response=response_text)
+    except BaseCustomException:
+        raise
     except Exception as e:
         logger.error(f"Error processing ServiceInitialize request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/add", response_model=FlightAddResponse)
 @limiter.limit("30/minute")
-async def add_flight(http_request: Request, request: FlightAddRequest):
+async def add_flight(request: Request, flight_add_request: FlightAddRequest):
     """
     Add flight to booking with rate limiting (30 requests/minute).
     """
     # Use the search_id from the request to continue the session/log trail
-    search_id = request.search_id
+    search_id = flight_add_request.search_id
     logger = get_search_logger(search_id)
     
-    logger.info(f"Received FlightAdd request: {request}")
+    logger.info(f"Received FlightAdd request: {flight_add_request}")
     try:
-        response = await flight_service_facade.add_flight(request, search_id)
+        response = await flight_service_facade.add_flight(flight_add_request, search_id)
         logger.info("Successfully processed FlightAdd request")
         return response
+    except BaseCustomException:
+        raise
     except Exception as e:
         logger.error(f"Error processing FlightAdd request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/booking-session", response_model=BookingSessionResponse)
 @limiter.limit("50/minute")
-async def get_booking_session(http_request: Request, request: BookingSessionRequest):
+async def get_booking_session(request: Request, session_request: BookingSessionRequest):
     """
     Get booking session with rate limiting (50 requests/minute).
     """
-    search_id = request.search_id
+    search_id = session_request.search_id
     logger = get_search_logger(search_id)
     
-    logger.info(f"Received BookingGetSession request: {request}")
+    logger.info(f"Received BookingGetSession request: {session_request}")
     try:
-        response = await flight_service_facade.get_booking_session(request)
+        response = await flight_service_facade.get_booking_session(session_request)
         logger.info("Successfully processed BookingGetSession request")
         return response
+    except BaseCustomException:
+        raise
     except Exception as e:
         logger.error(f"Error processing BookingGetSession request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/save", response_model=BookingSaveResponse)
 @limiter.limit("10/minute")
-async def save_booking(http_request: Request, request: BookingSaveRequest):
+async def save_booking(request: Request, save_request: BookingSaveRequest):
     """
     Save booking with strict rate limiting (10 requests/minute).
     This is a critical operation with lower limits.
     """
-    search_id = request.search_id
+    search_id = save_request.search_id
     logger = get_search_logger(search_id)
     
-    logger.info(f"Received BookingSave request: {request}")
+    logger.info(f"Received BookingSave request: {save_request}")
     try:
-        response = await flight_service_facade.save_booking(request)
+        response = await flight_service_facade.save_booking(save_request)
         logger.info("Successfully processed BookingSave request")
         return response
+    except BaseCustomException:
+        raise
     except Exception as e:
         logger.error(f"Error processing BookingSave request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/itinerary", response_model=ItineraryResponse)
 @limiter.limit("50/minute")
-async def get_itinerary(http_request: Request, request: ItineraryRequest):
+async def get_itinerary(request: Request, itinerary_request: ItineraryRequest):
     """
     Get booking itinerary with rate limiting (50 requests/minute).
+    Itineraries are cached briefly per PNR; send `Cache-Control: no-cache`
+    (or `max-age=0`) to force a fresh lookup from Yeti.
     """
-    search_id = request.search_id
+    search_id = itinerary_request.search_id
     logger = get_search_logger(search_id)
+    force_refresh = _wants_fresh(request)
     
-    logger.info(f"Received BookingGetItinerary request: {request}")
+    logger.info(f"Received BookingGetItinerary request: {itinerary_request} force_refresh={force_refresh}")
     try:
-        response = await flight_service_facade.get_itinerary(request)
+        response = await flight_service_facade.get_itinerary(itinerary_request, force_refresh)
         logger.info("Successfully processed BookingGetItinerary request")
         return response
+    except BaseCustomException:
+        raise
     except Exception as e:
         logger.error(f"Error processing BookingGetItinerary request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
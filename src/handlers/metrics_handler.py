@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+from src.modules import metrics
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Prometheus exposition of request, Yeti upstream, XML parse and cache
+    metrics, aggregated across workers when PROMETHEUS_MULTIPROC_DIR is set.
+    """
+    body, content_type = metrics.render_latest()
+    return Response(content=body, media_type=content_type)
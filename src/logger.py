@@ -1,7 +1,13 @@
 import logging
 import sys
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from src.config import settings
+from src.modules.segment_store import SegmentStore, StoredRecord, get_segment_store
 
 # Ensure logs directory exists
 LOGS_DIR = "logs"
@@ -30,33 +36,210 @@ def setup_logging():
 
 logger = setup_logging()
 
-def get_search_logger(search_id: str):
+class SearchLogRouter(logging.Handler):
     """
-    Creates or retrieves a logger for a specific search_id.
-    Logs are saved to logs/{search_id}/app.log
+    Routes records to logs/{search_id}/app.log by the record's search_id.
+
+    Open files are kept in a bounded LRU: the least recently used file is
+    closed when the limit is reached, and files idle for longer than
+    `idle_timeout` seconds are closed as new records arrive.
     """
-    search_log_dir = os.path.join(LOGS_DIR, search_id)
-    if not os.path.exists(search_log_dir):
-        os.makedirs(search_log_dir)
-
-    log_file = os.path.join(search_log_dir, "app.log")
-    
-    # Use a unique name for this logger to avoid conflict with the main logger
-    logger_name = f"{settings.APP_NAME}.{search_id}"
-    search_logger = logging.getLogger(logger_name)
-    search_logger.setLevel(settings.LOG_LEVEL)
 
-    # Check if handler already exists to avoid duplication
-    if not any(isinstance(h, logging.FileHandler) for h in search_logger.handlers):
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(settings.LOG_LEVEL)
-        formatter = logging.Formatter(
+    def __init__(self, base_dir: str, max_open_files: int, idle_timeout: float):
+        super().__init__()
+        self.base_dir = base_dir
+        self.max_open_files = max_open_files
+        self.idle_timeout = idle_timeout
+        self._streams: "OrderedDict[str, list]" = OrderedDict()
+
+    def emit(self, record):
+        search_id = getattr(record, "search_id", None)
+        if not search_id:
+            return
+        try:
+            msg = self.format(record)
+            stream = self._get_stream(search_id)
+            stream.write(msg + "\n")
+            stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def _get_stream(self, search_id: str):
+        now = time.monotonic()
+        entry = self._streams.get(search_id)
+        if entry is not None:
+            entry[1] = now
+            self._streams.move_to_end(search_id)
+            return entry[0]
+
+        self._evict(now)
+        search_log_dir = os.path.join(self.base_dir, search_id)
+        os.makedirs(search_log_dir, exist_ok=True)
+        stream = open(os.path.join(search_log_dir, "app.log"), "a", encoding="utf-8")
+        self._streams[search_id] = [stream, now]
+        return stream
+
+    def _evict(self, now: float):
+        while self._streams:
+            search_id, (stream, last_used) = next(iter(self._streams.items()))
+            if len(self._streams) < self.max_open_files and now - last_used < self.idle_timeout:
+                break
+            stream.close()
+            del self._streams[search_id]
+
+    def open_files(self) -> int:
+        return len(self._streams)
+
+    def close(self):
+        self.acquire()
+        try:
+            for stream, _ in self._streams.values():
+                stream.close()
+            self._streams.clear()
+        finally:
+            self.release()
+        super().close()
+
+
+class SearchLogSegmentHandler(logging.Handler):
+    """
+    Buffers search log lines and appends them to the segmented audit store
+    as app.log chunks (sequence 0), one compressed member per flush.
+
+    Flushes after `capacity` lines, when the oldest buffered line is
+    `flush_interval` seconds old (checked as records arrive), on ERROR
+    and above, and on close. A flush only hands the chunks to a writer
+    thread, so the compression and index commit never run on the event
+    loop; up to `max_pending` flushes wait for it before chunks are dropped.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        flush_interval: float,
+        store: Optional[SegmentStore] = None,
+        max_pending: int = 100,
+    ):
+        super().__init__()
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._store = store
+        self._buffer: List[Tuple[str, str]] = []
+        self._first_at = 0.0
+        self._pending: "queue.Queue[Optional[List[StoredRecord]]]" = queue.Queue(maxsize=max_pending)
+        self._writer: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def emit(self, record):
+        search_id = getattr(record, "search_id", None)
+        if not search_id:
+            return
+        try:
+            if not self._buffer:
+                self._first_at = time.monotonic()
+            self._buffer.append((search_id, self.format(record)))
+            if (
+                len(self._buffer) >= self.capacity
+                or record.levelno >= logging.ERROR
+                or time.monotonic() - self._first_at >= self.flush_interval
+            ):
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if not self._buffer:
+                return
+            # One chunk per search, in first-seen order
+            chunks: Dict[str, List[str]] = {}
+            for search_id, line in self._buffer:
+                chunks.setdefault(search_id, []).append(line)
+            self._buffer = []
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="search-log-segments", daemon=True)
+                self._writer.start()
+            try:
+                self._pending.put_nowait([
+                    StoredRecord(search_id, 0, "app.log", "\n".join(lines) + "\n")
+                    for search_id, lines in chunks.items()
+                ])
+            except queue.Full:
+                self.dropped += len(chunks)
+        finally:
+            self.release()
+
+    def _run(self):
+        while True:
+            records = self._pending.get()
+            if records is None:
+                return
+            try:
+                if self._store is None:
+                    self._store = get_segment_store()
+                self._store.append(records)
+            except Exception as e:
+                # The console logger doesn't route back into this handler
+                logger.error(f"Search log segment append failed, dropped {len(records)} chunks: {e}")
+
+    def close(self, timeout: float = 5.0):
+        try:
+            self.flush()
+            if self._writer is not None:
+                self._pending.put(None)
+                self._writer.join(timeout)
+                self._writer = None
+        finally:
+            super().close()
+
+
+class _SearchLoggerNameFilter(logging.Filter):
+    """Keeps the historical '<APP_NAME>.<search_id>' logger name in formatted output."""
+
+    def filter(self, record):
+        search_id = getattr(record, "search_id", None)
+        if search_id:
+            record.name = f"{settings.APP_NAME}.{search_id}"
+        return True
+
+
+def _setup_search_logging():
+    search_logger = logging.getLogger(f"{settings.APP_NAME}.search")
+    search_logger.setLevel(settings.LOG_LEVEL)
+    if not any(isinstance(h, (SearchLogRouter, SearchLogSegmentHandler)) for h in search_logger.handlers):
+        backend = settings.SEARCH_LOG_BACKEND.lower()
+        if backend == "segments":
+            router = SearchLogSegmentHandler(
+                capacity=settings.SEARCH_LOG_SEGMENT_BUFFER,
+                flush_interval=settings.SEARCH_LOG_SEGMENT_FLUSH_INTERVAL,
+            )
+        elif backend == "files":
+            router = SearchLogRouter(
+                LOGS_DIR,
+                max_open_files=settings.SEARCH_LOG_MAX_OPEN_FILES,
+                idle_timeout=settings.SEARCH_LOG_IDLE_TIMEOUT,
+            )
+        else:
+            raise ValueError(f"Unknown SEARCH_LOG_BACKEND: {settings.SEARCH_LOG_BACKEND}")
+        router.setLevel(settings.LOG_LEVEL)
+        router.setFormatter(logging.Formatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        file_handler.setFormatter(formatter)
-        search_logger.addHandler(file_handler)
-    
-    # Also propagate to root logger if desired, or add console handler?
-    # Defaults propagate=True, so it will go up to APP_NAME logger and print to console.
-    
+        ))
+        search_logger.addHandler(router)
+        search_logger.addFilter(_SearchLoggerNameFilter())
+    # Propagates to the APP_NAME logger, so records still reach the console.
     return search_logger
+
+_search_logger = _setup_search_logging()
+
+def get_search_logger(search_id: str):
+    """
+    Returns a logger bound to a specific search_id.
+    Logs are saved to logs/{search_id}/app.log, or to the segmented audit
+    store with SEARCH_LOG_BACKEND=segments.
+
+    All searches share one logger and one routing handler, so memory and
+    open file descriptors stay flat however many searches are seen.
+    """
+    return logging.LoggerAdapter(_search_logger, {"search_id": search_id})
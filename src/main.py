@@ -1,14 +1,25 @@
+from urllib.parse import urlsplit
+
 from fastapi import FastAPI
 from slowapi.errors import RateLimitExceeded
 from src.config import settings
 from src.handlers.liveness_handler import router as liveness_router
 from src.handlers.flight_handler import router as flight_router
-from src.middleware.rate_limiter import limiter, rate_limit_exceeded_handler
+from src.handlers.debug_handler import router as debug_router
+from src.handlers.metrics_handler import router as metrics_router
+from src.handlers.booking_job_handler import router as booking_job_router
+from src.middleware.rate_limiter import limiter, rate_limit_exceeded_handler, storage_uri
 from src.middleware.error_handler import custom_exception_handler, general_exception_handler
 from src.middleware.logging_middleware import LoggingMiddleware
 from src.middleware.security_headers import SecurityHeadersMiddleware
 from src.middleware.cors_middleware import setup_cors
 from src.exceptions.base_exception import BaseCustomException
+from src.modules.yeti_client import yeti_client
+from src.modules.redis_client import RedisClient
+from src.modules.rabbitmq_client import RabbitMQClient
+from src.db import db_manager
+from src.modules.audit_writer import audit_writer
+from src.modules.search_history_writer import search_history_writer
 
 
 def create_app() -> FastAPI:
@@ -35,18 +46,36 @@ def create_app() -> FastAPI:
     # Include routers
     app.include_router(liveness_router)
     app.include_router(flight_router)
+    if settings.DEBUG_ENDPOINTS_ENABLED:
+        app.include_router(debug_router)
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router)
+    if settings.BOOKING_ASYNC_ENABLED:
+        app.include_router(booking_job_router)
 
     @app.on_event("startup")
     async def startup_event():
         from src.logger import logger
         logger.info("Starting YetiAir API with security features...")
-        logger.info(f"Rate limiting enabled: 100 requests/minute per IP")
+        logger.info(
+            f"Rate limiting enabled: {settings.RATE_LIMIT_DEFAULT} per IP by default "
+            f"({settings.RATE_LIMIT_STRATEGY}, {urlsplit(storage_uri).scheme} storage)"
+        )
         logger.info("Security headers enabled")
+        await audit_writer.start()
+        await yeti_client.start()
 
     @app.on_event("shutdown")
     async def shutdown_event():
         from src.logger import logger
         logger.info("Shutting down YetiAir API...")
+        await yeti_client.close()
+        await RedisClient().close()
+        # The audit writer may still publish its last batches
+        await audit_writer.stop()
+        await RabbitMQClient().close()
+        await search_history_writer.stop()
+        await db_manager.dispose()
 
     return app
 
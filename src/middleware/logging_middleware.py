@@ -1,41 +1,69 @@
 """Request/Response logging middleware."""
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from src.logger import logger
+from src.modules import metrics
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all requests and responses."""
-    
-    async def dispatch(self, request: Request, call_next):
+class LoggingMiddleware:
+    """
+    Middleware to log all requests and responses.
+
+    Plain ASGI middleware: the status is read from the http.response.start
+    message and the duration runs until the response body has been sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Log request and response details."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.time()
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
         
         # Log request
         logger.info(
-            f"Request: {request.method} {request.url.path}",
+            f"Request: {method} {path}",
             extra={
-                "method": request.method,
-                "path": request.url.path,
-                "client": request.client.host if request.client else None
+                "method": method,
+                "path": path,
+                "client": client[0] if client else None
             }
         )
         
+        # Stays 500 if the app raises before starting a response
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
         # Process request
-        response = await call_next(request)
-        
-        # Calculate duration
-        duration = time.time() - start_time
-        
-        # Log response
-        logger.info(
-            f"Response: {response.status_code} - Duration: {duration:.3f}s",
-            extra={
-                "status_code": response.status_code,
-                "duration": duration,
-                "path": request.url.path
-            }
-        )
-        
-        return response
+        metrics.HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.HTTP_REQUESTS_IN_FLIGHT.dec()
+            # Calculate duration
+            duration = time.time() - start_time
+            # Label by route template so path parameters don't explode cardinality
+            route = getattr(scope.get("route"), "path", "unmatched")
+            metrics.observe_request(method, route, status_code, duration)
+
+            # Log response, including requests that failed with an exception
+            logger.info(
+                f"Response: {status_code} - Duration: {duration:.3f}s",
+                extra={
+                    "status_code": status_code,
+                    "duration": duration,
+                    "path": path
+                }
+            )
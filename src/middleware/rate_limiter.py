@@ -1,10 +1,14 @@
 """Rate limiting middleware using SlowAPI."""
+from urllib.parse import urlsplit
+
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 
+from src.config import settings
+
 
 def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
     """Custom handler for rate limit exceeded errors."""
@@ -18,10 +22,35 @@ def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Res
     )
 
 
-# Initialize rate limiter
+def _storage_options(storage_uri: str) -> dict:
+    # slowapi checks limits synchronously, so each Redis round trip blocks the
+    # event loop: bound it tightly so a slow or unreachable server trips the
+    # in-memory fallback instead of stalling every request on this worker
+    if urlsplit(storage_uri).scheme.startswith(("redis", "rediss")):
+        return {
+            "socket_timeout": settings.RATE_LIMIT_STORAGE_TIMEOUT,
+            "socket_connect_timeout": settings.RATE_LIMIT_STORAGE_TIMEOUT,
+        }
+    return {}
+
+
+storage_uri = settings.RATE_LIMIT_STORAGE_URI or settings.REDIS_URL
+
+# Initialize rate limiter. Counters live in shared storage (Redis by default),
+# so every worker enforces the same limits; the moving-window and
+# sliding-window-counter strategies update them with one Lua script per hit.
+# slowapi has no async code path, so the limits library's asyncio storage
+# ("async+redis://") can't be used here; the blocking client is kept to one
+# round trip per check under RATE_LIMIT_STORAGE_TIMEOUT.
+# While the storage is unreachable each worker falls back to enforcing the
+# same per-route limits in memory, and switches back once it recovers.
 limiter = Limiter(
     key_func=get_remote_address,
-    default_limits=["100/minute"],
-    storage_uri="memory://",
-    strategy="fixed-window"
+    default_limits=[settings.RATE_LIMIT_DEFAULT],
+    storage_uri=storage_uri,
+    storage_options=_storage_options(storage_uri),
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    key_prefix=settings.RATE_LIMIT_KEY_PREFIX,
+    in_memory_fallback_enabled=True,
+    enabled=settings.RATE_LIMIT_ENABLED,
 )
@@ -0,0 +1,78 @@
+"""Add search history (searches, flight_offers)
+
+Revision ID: 3922bc84d124
+Revises: 1b426bdb24f2
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3922bc84d124'
+down_revision = '1b426bdb24f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'searches',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('search_id', sa.String(length=36), nullable=False),
+        sa.Column('origin', sa.String(length=3), nullable=False),
+        sa.Column('destination', sa.String(length=3), nullable=False),
+        sa.Column('depart_date', sa.Date(), nullable=True),
+        sa.Column('return_date', sa.Date(), nullable=True),
+        sa.Column('adults', sa.Integer(), nullable=False),
+        sa.Column('children', sa.Integer(), nullable=False),
+        sa.Column('infants', sa.Integer(), nullable=False),
+        sa.Column('offer_count', sa.Integer(), nullable=False),
+        sa.Column('searched_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_searches_search_id'), 'searches', ['search_id'], unique=False)
+    op.create_index('ix_searches_route_searched_at', 'searches', ['origin', 'destination', 'searched_at'], unique=False)
+
+    op.create_table(
+        'flight_offers',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('search_row_id', sa.BigInteger(), nullable=False),
+        sa.Column('direction', sa.String(length=8), nullable=False),
+        sa.Column('flight_id', sa.String(length=64), nullable=False),
+        sa.Column('fare_id', sa.String(length=64), nullable=False),
+        sa.Column('airline', sa.String(length=3), nullable=True),
+        sa.Column('flight_number', sa.String(length=10), nullable=True),
+        sa.Column('origin', sa.String(length=3), nullable=True),
+        sa.Column('destination', sa.String(length=3), nullable=True),
+        sa.Column('departure_date', sa.Date(), nullable=True),
+        sa.Column('departure_time', sa.String(length=4), nullable=True),
+        sa.Column('arrival_time', sa.String(length=4), nullable=True),
+        sa.Column('booking_class', sa.String(length=2), nullable=True),
+        sa.Column('fare_code', sa.String(length=20), nullable=True),
+        sa.Column('currency', sa.String(length=3), nullable=True),
+        sa.Column('adult_fare', sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column('total_adult_fare', sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column('tax_amount', sa.Numeric(precision=12, scale=2), nullable=True),
+        sa.Column('seats_available', sa.Integer(), nullable=True),
+        sa.Column('refundable', sa.Boolean(), nullable=True),
+        sa.Column('searched_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['search_row_id'], ['searches.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_flight_offers_search_row_id'), 'flight_offers', ['search_row_id'], unique=False)
+    op.create_index('ix_flight_offers_route_departure', 'flight_offers', ['origin', 'destination', 'departure_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_flight_offers_route_departure', table_name='flight_offers')
+    op.drop_index(op.f('ix_flight_offers_search_row_id'), table_name='flight_offers')
+    op.drop_table('flight_offers')
+    op.drop_index('ix_searches_route_searched_at', table_name='searches')
+    op.drop_index(op.f('ix_searches_search_id'), table_name='searches')
+    op.drop_table('searches')
@@ -1 +1,2 @@
 from .base_model import BaseModel
+from .search_model import Search, FlightOffer
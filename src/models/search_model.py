@@ -0,0 +1,58 @@
+from sqlalchemy import BigInteger, Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, String
+from src.models.base_model import BaseModel
+
+
+class Search(BaseModel):
+    """One availability result fetched from Yeti."""
+    __tablename__ = "searches"
+
+    # BIGSERIAL, and no extra index beside the primary key's: these tables take
+    # high-volume COPY batches
+    id = Column(BigInteger, primary_key=True)
+    # The API's search_id; a batch or flexible-date search has several rows
+    search_id = Column(String(36), nullable=False, index=True)
+    origin = Column(String(3), nullable=False)
+    destination = Column(String(3), nullable=False)
+    depart_date = Column(Date, nullable=True)
+    return_date = Column(Date, nullable=True)
+    adults = Column(Integer, nullable=False, default=1)
+    children = Column(Integer, nullable=False, default=0)
+    infants = Column(Integer, nullable=False, default=0)
+    offer_count = Column(Integer, nullable=False, default=0)
+    searched_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_searches_route_searched_at", "origin", "destination", "searched_at"),
+    )
+
+
+class FlightOffer(BaseModel):
+    """One fare on one flight in a search result."""
+    __tablename__ = "flight_offers"
+
+    id = Column(BigInteger, primary_key=True)
+    search_row_id = Column(BigInteger, ForeignKey("searches.id", ondelete="CASCADE"), nullable=False, index=True)
+    direction = Column(String(8), nullable=False)
+    flight_id = Column(String(64), nullable=False)
+    fare_id = Column(String(64), nullable=False)
+    airline = Column(String(3), nullable=True)
+    flight_number = Column(String(10), nullable=True)
+    origin = Column(String(3), nullable=True)
+    destination = Column(String(3), nullable=True)
+    departure_date = Column(Date, nullable=True)
+    departure_time = Column(String(4), nullable=True)
+    arrival_time = Column(String(4), nullable=True)
+    booking_class = Column(String(2), nullable=True)
+    fare_code = Column(String(20), nullable=True)
+    currency = Column(String(3), nullable=True)
+    adult_fare = Column(Numeric(12, 2), nullable=True)
+    total_adult_fare = Column(Numeric(12, 2), nullable=True)
+    tax_amount = Column(Numeric(12, 2), nullable=True)
+    seats_available = Column(Integer, nullable=True)
+    refundable = Column(Boolean, nullable=True)
+    # Copied from the search so price history needs no join
+    searched_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_flight_offers_route_departure", "origin", "destination", "departure_date"),
+    )
@@ -0,0 +1,327 @@
+import asyncio
+import gzip
+import json
+import os
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import aio_pika
+from pydantic import BaseModel
+
+from src.config import settings
+from src.logger import logger, LOGS_DIR
+from src.utils.xml_parser import unescape_xml
+from .rabbitmq_client import RabbitMQClient
+from .segment_store import SegmentStore, StoredRecord, audit_filename, get_segment_store
+from .session_store import LRUTTLCache
+
+
+def audit_text(content: Any) -> str:
+    """The text stored for a record's content."""
+    if isinstance(content, str):
+        return content
+    # Request envelopes arrive as the UTF-8 bytes that were sent
+    if isinstance(content, bytes):
+        return content.decode("utf-8", errors="replace")
+    if isinstance(content, BaseModel):
+        return content.model_dump_json(indent=2)
+    return str(content)
+
+
+@dataclass
+class AuditRecord:
+    """
+    One upstream RQ/RS payload or response dump for a search.
+
+    `content` may be a model or DTO as handed to `submit`; it is only turned
+    into text by the sinks, in their worker threads, so callers must not
+    mutate it afterwards.
+    """
+    search_id: str
+    sequence: int
+    filename: str
+    content: Any
+    # Stamped at submit and kept through the queue, so redelivered copies can be recognised
+    record_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    @property
+    def text(self) -> str:
+        return audit_text(self.content)
+
+    @property
+    def sequenced_filename(self) -> str:
+        return audit_filename(self.sequence, self.filename, self.record_id)
+
+
+class AuditSink(ABC):
+    """Destination for batches of audit records."""
+
+    @abstractmethod
+    async def write_batch(self, records: List[AuditRecord]) -> None:
+        """Persist a batch of records."""
+        pass
+
+    async def close(self) -> None:
+        """Release any resources held by the sink."""
+        pass
+
+
+class FileAuditSink(AuditSink):
+    """Writes each record to logs/{search_id}/{seq:02d}_{id}_{filename} (see audit_filename)."""
+
+    def __init__(self, base_dir: str = LOGS_DIR):
+        self.base_dir = base_dir
+
+    async def write_batch(self, records: List[AuditRecord]) -> None:
+        # Disk I/O and unescaping happen off the event loop
+        await asyncio.to_thread(self._write_batch, records)
+
+    def _write_batch(self, records: List[AuditRecord]) -> None:
+        created_dirs = set()
+        for record in records:
+            log_dir = os.path.join(self.base_dir, record.search_id)
+            if log_dir not in created_dirs:
+                os.makedirs(log_dir, exist_ok=True)
+                created_dirs.add(log_dir)
+
+            # Serialize and unescape XML for readability
+            content = record.text
+            try:
+                readable_content = unescape_xml(content)
+            except Exception:
+                readable_content = content
+
+            with open(os.path.join(log_dir, record.sequenced_filename), "w") as f:
+                f.write(readable_content)
+
+
+class SegmentAuditSink(AuditSink):
+    """Appends each batch to the segmented audit store as one compressed member."""
+
+    def __init__(self, store: Optional[SegmentStore] = None):
+        self.store = store or get_segment_store()
+
+    async def write_batch(self, records: List[AuditRecord]) -> None:
+        # Serialization, compression and disk I/O happen off the event loop
+        await asyncio.to_thread(self._write_batch, records)
+
+    def _write_batch(self, records: List[AuditRecord]) -> None:
+        self.store.append(
+            StoredRecord(r.search_id, r.sequence, r.filename, r.text, r.record_id) for r in records
+        )
+
+
+def encode_audit_batch(records: List[AuditRecord]) -> bytes:
+    """Gzipped JSON Lines, one object per record."""
+    lines = (
+        json.dumps({
+            "search_id": r.search_id,
+            "sequence": r.sequence,
+            "filename": r.filename,
+            "content": r.text,
+            "record_id": r.record_id,
+        })
+        for r in records
+    )
+    return gzip.compress("\n".join(lines).encode("utf-8"), compresslevel=6)
+
+
+def decode_audit_batch(body: bytes) -> List[AuditRecord]:
+    """Inverse of `encode_audit_batch`."""
+    records = []
+    for line in gzip.decompress(body).decode("utf-8").splitlines():
+        item = json.loads(line)
+        record = AuditRecord(item["search_id"], item["sequence"], item["filename"], item["content"])
+        if "record_id" in item:
+            record.record_id = item["record_id"]
+        records.append(record)
+    return records
+
+
+async def declare_audit_topology(channel: aio_pika.abc.AbstractChannel):
+    """
+    The audit exchange and the archive queue bound to it (both durable), so
+    batches published before the first archiver starts are kept.
+    """
+    exchange = await channel.declare_exchange(settings.AUDIT_EXCHANGE, aio_pika.ExchangeType.FANOUT, durable=True)
+    queue = await channel.declare_queue(settings.AUDIT_QUEUE_NAME, durable=True)
+    await queue.bind(exchange)
+    return exchange, queue
+
+
+class RabbitMQAuditSink(AuditSink):
+    """
+    Publishes each batch as one gzipped JSON Lines message to AUDIT_EXCHANGE
+    and waits for the broker's confirm. A batch the broker doesn't take is
+    written to `fallback` (local files by default) rather than lost.
+    """
+
+    def __init__(self, rabbitmq: Optional[RabbitMQClient] = None, fallback: Optional[AuditSink] = None):
+        self._rabbitmq = rabbitmq or RabbitMQClient()
+        self.fallback = fallback or FileAuditSink()
+        self._exchange = None
+        self.published = 0
+        self.fallen_back = 0
+
+    async def _get_exchange(self):
+        if self._exchange is None:
+            channel = await self._rabbitmq.get_channel()
+            self._exchange, _ = await declare_audit_topology(channel)
+        return self._exchange
+
+    async def write_batch(self, records: List[AuditRecord]) -> None:
+        # Serializing and compressing large availability responses is CPU work; keep it off the loop
+        body = await asyncio.to_thread(encode_audit_batch, records)
+        try:
+            exchange = await self._get_exchange()
+            await exchange.publish(
+                aio_pika.Message(
+                    body=body,
+                    content_type="application/x-ndjson",
+                    content_encoding="gzip",
+                    delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                    headers={"records": len(records), "published_at": datetime.now(timezone.utc).isoformat()},
+                ),
+                routing_key="",
+            )
+            self.published += len(records)
+        except Exception as e:
+            self._exchange = None
+            self.fallen_back += len(records)
+            logger.warning(f"Audit publish failed, writing {len(records)} records locally: {e}")
+            await self.fallback.write_batch(records)
+
+
+def create_audit_sink() -> AuditSink:
+    """Build the sink selected by AUDIT_SINK."""
+    sink = settings.AUDIT_SINK.lower()
+    if sink == "rabbitmq":
+        return RabbitMQAuditSink()
+    if sink == "segments":
+        return SegmentAuditSink()
+    if sink == "file":
+        return FileAuditSink()
+    raise ValueError(f"Unknown AUDIT_SINK: {settings.AUDIT_SINK}")
+
+
+class AuditWriter:
+    """
+    Bounded queue of audit records drained by a background task.
+
+    `submit` never blocks the event loop: records are numbered per search
+    and queued, and dropped (and counted) when the queue is full. The
+    drain task hands batches to the sink and flushes what is left on stop.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[AuditSink] = None,
+        maxsize: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.sink = sink or create_audit_sink()
+        self.maxsize = maxsize or settings.AUDIT_QUEUE_MAXSIZE
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Numbering is assigned at submit time so files keep request order
+        self._sequences = LRUTTLCache(settings.SESSION_STORE_MAX_ENTRIES, settings.SESSION_IDLE_TTL)
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def _next_sequence(self, search_id: str) -> int:
+        seq_num = self._sequences.get(search_id, 1)
+        self._sequences[search_id] = seq_num + 1
+        return seq_num
+
+    def _start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(f"Audit writer started (queue={self.maxsize}, batch={self.batch_size})")
+
+    async def start(self) -> None:
+        """Start the background drain task."""
+        if self._task is None or self._task.done():
+            self._start()
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """Flush queued records and stop the drain task."""
+        if self._task is None:
+            return
+        timeout = settings.AUDIT_FLUSH_TIMEOUT if timeout is None else timeout
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Audit writer flush timed out with {self._queue.qsize()} records pending")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.sink.close()
+        logger.info(f"Audit writer stopped: {self.stats()}")
+
+    def submit(self, search_id: str, filename: str, content: Any) -> bool:
+        """
+        Queue a record without blocking. Returns False if it was dropped.
+        `content` is text, bytes, or a model or DTO the sink serializes.
+        """
+        record = AuditRecord(search_id, self._next_sequence(search_id), filename, content)
+        self.submitted += 1
+
+        if self._task is None or self._task.done():
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # No event loop (scripts): nothing to block, write inline
+                asyncio.run(self._write([record]))
+                return True
+            # Started lazily for callers outside the app lifecycle
+            self._start()
+
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                logger.warning(f"Audit queue full, dropped {self.dropped} records so far")
+            return False
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: List[AuditRecord]) -> None:
+        try:
+            await self.sink.write_batch(batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Audit sink failed to write {len(batch)} records: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and counters for this process."""
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+audit_writer = AuditWriter()
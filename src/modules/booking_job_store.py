@@ -0,0 +1,96 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from src.config import settings
+from .redis_client import RedisClient
+
+TERMINAL_STATUSES = frozenset({"succeeded", "failed", "unknown"})
+
+
+class BookingJobStore:
+    """
+    Asynchronous BookingSave job state in Redis, shared by the API and the
+    booking workers.
+
+    Each job is a JSON document that expires BOOKING_JOB_TTL seconds after its
+    last update. Every update is also published on the job's channel so that
+    `wait` can return as soon as a worker finishes it.
+    """
+
+    KEY_PREFIX = "yetiair:booking-job:"
+
+    def __init__(self, redis_client: Optional[RedisClient] = None, ttl: Optional[int] = None):
+        self._redis = redis_client or RedisClient()
+        self.ttl = ttl or settings.BOOKING_JOB_TTL
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}{job_id}"
+
+    def _claim_key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}{job_id}:claim"
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}{job_id}:updates"
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat()
+
+    async def create(self, job_id: str, search_id: str) -> Dict[str, Any]:
+        now = self._now()
+        job = {
+            "job_id": job_id,
+            "search_id": search_id,
+            "status": "queued",
+            "created_at": now,
+            "updated_at": now,
+        }
+        client = await self._redis.get_client()
+        await client.set(self._key(job_id), json.dumps(job), ex=self.ttl)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        client = await self._redis.get_client()
+        payload = await client.get(self._key(job_id))
+        return json.loads(payload) if payload is not None else None
+
+    async def update(self, job_id: str, status: str, **fields: Any) -> Optional[Dict[str, Any]]:
+        """Set a job's status (and result fields). Only the claiming worker writes after `create`."""
+        job = await self.get(job_id)
+        if job is None:
+            return None
+        job.update(fields, status=status, updated_at=self._now())
+        client = await self._redis.get_client()
+        await client.set(self._key(job_id), json.dumps(job), ex=self.ttl)
+        await client.publish(self._channel(job_id), status)
+        return job
+
+    async def claim(self, job_id: str) -> bool:
+        """
+        Take a job for execution. False if it was claimed before, which for a
+        queued message means a worker died while running it.
+        """
+        client = await self._redis.get_client()
+        return bool(await client.set(self._claim_key(job_id), "1", nx=True, ex=self.ttl))
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """The job once it is finished, or as it stands after `timeout` seconds."""
+        client = await self._redis.get_client()
+        pubsub = client.pubsub()
+        # Subscribe before reading so an update between the two isn't missed
+        await pubsub.subscribe(self._channel(job_id))
+        try:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while True:
+                job = await self.get(job_id)
+                remaining = deadline - loop.time()
+                if job is None or job["status"] in TERMINAL_STATUSES or remaining <= 0:
+                    return job
+                # Re-read at least once a second in case a notification is lost
+                await pubsub.get_message(ignore_subscribe_messages=True, timeout=min(remaining, 1.0))
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
@@ -0,0 +1,163 @@
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from src.config import settings
+from src.logger import logger
+from src.exceptions.upstream_exception import CircuitOpenException
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def _any_exception(exc: BaseException) -> bool:
+    return isinstance(exc, Exception)
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker over a sliding window of recent calls.
+
+    The circuit opens when, over at least `min_calls` of the last `window`
+    calls, the failure rate reaches `failure_rate` or the share of calls
+    slower than `slow_call_seconds` reaches `slow_call_rate`. While open,
+    calls fail immediately. After `open_seconds` up to `half_open_calls`
+    trial calls are let through; if they all succeed quickly the circuit
+    closes, otherwise it opens again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: Optional[int] = None,
+        min_calls: Optional[int] = None,
+        failure_rate: Optional[float] = None,
+        slow_call_seconds: Optional[float] = None,
+        slow_call_rate: Optional[float] = None,
+        open_seconds: Optional[float] = None,
+        half_open_calls: Optional[int] = None,
+        is_failure: Callable[[BaseException], bool] = _any_exception,
+    ):
+        self.name = name
+        self.window = window or settings.CIRCUIT_BREAKER_WINDOW
+        self.min_calls = min_calls or settings.CIRCUIT_BREAKER_MIN_CALLS
+        self.failure_rate = failure_rate or settings.CIRCUIT_BREAKER_FAILURE_RATE
+        self.slow_call_seconds = slow_call_seconds or settings.CIRCUIT_BREAKER_SLOW_CALL_SECONDS
+        self.slow_call_rate = slow_call_rate or settings.CIRCUIT_BREAKER_SLOW_CALL_RATE
+        self.open_seconds = open_seconds or settings.CIRCUIT_BREAKER_OPEN_SECONDS
+        self.half_open_calls = half_open_calls or settings.CIRCUIT_BREAKER_HALF_OPEN_CALLS
+        self.is_failure = is_failure
+
+        self.state = CircuitState.CLOSED
+        # (failed, slow) per completed call
+        self._calls: Deque[Tuple[bool, bool]] = deque(maxlen=self.window)
+        self._opened_at = 0.0
+        self._trial_in_flight = 0
+        self._trial_successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def _retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def _transition(self, state: CircuitState) -> None:
+        if state == self.state:
+            return
+        logger.warning(f"Circuit breaker [{self.name}] {self.state.value} -> {state.value}")
+        self.state = state
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+        elif state == CircuitState.CLOSED:
+            self._calls.clear()
+        self._trial_in_flight = 0
+        self._trial_successes = 0
+
+    def raise_if_open(self) -> None:
+        """Fail fast while the circuit is open, without taking a trial slot."""
+        if self.state == CircuitState.OPEN and self._retry_after() > 0:
+            self.rejected += 1
+            raise CircuitOpenException(self.name, self._retry_after())
+
+    def _before_call(self) -> None:
+        self.raise_if_open()
+        if self.state == CircuitState.OPEN:
+            self._transition(CircuitState.HALF_OPEN)
+        if self.state == CircuitState.HALF_OPEN:
+            if self._trial_in_flight + self._trial_successes >= self.half_open_calls:
+                self.rejected += 1
+                raise CircuitOpenException(self.name, 0.0)
+            self._trial_in_flight += 1
+
+    def _after_call(self, failed: bool, duration: float) -> None:
+        slow = duration >= self.slow_call_seconds
+        if self.state == CircuitState.HALF_OPEN:
+            self._trial_in_flight = max(0, self._trial_in_flight - 1)
+            if failed or slow:
+                self._transition(CircuitState.OPEN)
+                return
+            self._trial_successes += 1
+            if self._trial_successes >= self.half_open_calls:
+                self._transition(CircuitState.CLOSED)
+            return
+
+        self._calls.append((failed, slow))
+        if self.state == CircuitState.CLOSED and len(self._calls) >= self.min_calls:
+            failures = sum(1 for f, _ in self._calls if f)
+            slow_calls = sum(1 for _, s in self._calls if s)
+            if (failures / len(self._calls) >= self.failure_rate
+                    or slow_calls / len(self._calls) >= self.slow_call_rate):
+                self._transition(CircuitState.OPEN)
+
+    @asynccontextmanager
+    async def call(self):
+        """Guard one upstream call; raises CircuitOpenException when rejected."""
+        self._before_call()
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            if isinstance(e, Exception):
+                self._after_call(self.is_failure(e), time.monotonic() - start)
+            elif self.state == CircuitState.HALF_OPEN:
+                # Cancelled: give the trial slot back without judging the upstream
+                self._trial_in_flight = max(0, self._trial_in_flight - 1)
+            raise
+        else:
+            self._after_call(False, time.monotonic() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current state and window counters."""
+        calls = len(self._calls)
+        return {
+            "state": self.state.value,
+            "window_calls": calls,
+            "failure_rate": round(sum(1 for f, _ in self._calls if f) / calls, 3) if calls else 0.0,
+            "slow_call_rate": round(sum(1 for _, s in self._calls if s) / calls, 3) if calls else 0.0,
+            "retry_after": round(self._retry_after(), 1) if self.state == CircuitState.OPEN else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreakerRegistry:
+    """One breaker per upstream operation, created on first use."""
+
+    def __init__(self, is_failure: Callable[[BaseException], bool] = _any_exception):
+        self.is_failure = is_failure
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, is_failure=self.is_failure)
+            self._breakers[name] = breaker
+        return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: breaker.stats() for name, breaker in self._breakers.items()}
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Deque, Dict, Optional
+
+from src.config import settings
+from src.exceptions.upstream_exception import UpstreamOverloadedException
+
+
+def _any_exception(exc: BaseException) -> bool:
+    return isinstance(exc, Exception)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Caps in-flight upstream calls with an AIMD-adjusted limit.
+
+    Each call that succeeds within `latency_target` seconds while the limit
+    is being used raises the limit by 1/limit (about +1 per round of calls);
+    a failure (as judged by `is_failure`, so errors that say nothing about
+    upstream load can be ignored) or a slower call multiplies it by
+    `backoff`. Callers over the
+    limit wait in a FIFO queue of at most `max_queue` entries for up to
+    `queue_timeout` seconds, and are rejected with UpstreamOverloadedException
+    beyond that, so a slow upstream produces fast 503s instead of a growing
+    pile of waiting coroutines.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: Optional[int] = None,
+        min_limit: Optional[int] = None,
+        max_limit: Optional[int] = None,
+        latency_target: Optional[float] = None,
+        backoff: Optional[float] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        is_failure: Callable[[BaseException], bool] = _any_exception,
+    ):
+        self.name = name
+        self.min_limit = min_limit or settings.YETI_CONCURRENCY_MIN
+        self.max_limit = max_limit or settings.YETI_CONCURRENCY_MAX
+        self.latency_target = latency_target or settings.YETI_CONCURRENCY_LATENCY_TARGET
+        self.backoff = backoff or settings.YETI_CONCURRENCY_BACKOFF
+        self.max_queue = settings.YETI_CONCURRENCY_MAX_QUEUE if max_queue is None else max_queue
+        self.queue_timeout = queue_timeout or settings.YETI_CONCURRENCY_QUEUE_TIMEOUT
+        self.is_failure = is_failure
+        self._limit = float(initial_limit or settings.YETI_CONCURRENCY_INITIAL)
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    def _reject(self, reason: str):
+        self.rejected += 1
+        return UpstreamOverloadedException(self.name, details={
+            "reason": reason,
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+        })
+
+    async def _acquire(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject("queue_timeout")
+        except BaseException:
+            # Cancelled after being handed a slot: pass it on
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def _adjust(self, failed: bool, latency: float, in_flight: int) -> None:
+        if failed or latency > self.latency_target:
+            self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        elif in_flight * 2 >= self.limit:
+            # Only grow while the limit is actually being used
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Hold one upstream slot for the duration of the block."""
+        await self._acquire()
+        in_flight = self._in_flight
+        start = time.monotonic()
+        failed = False
+        cancelled = False
+        try:
+            yield
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        except BaseException as e:
+            failed = self.is_failure(e)
+            raise
+        finally:
+            if not cancelled:
+                self.completed += 1
+                self._adjust(failed, time.monotonic() - start, in_flight)
+            self._release_slot()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limit, occupancy and counters."""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,38 @@
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from src.config import settings
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per operation."""
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window or settings.YETI_LATENCY_WINDOW
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, operation: str, seconds: float) -> None:
+        samples = self._samples.get(operation)
+        if samples is None:
+            samples = self._samples[operation] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(self, operation: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """The q-quantile (0-1) of recent latencies, or None with too few samples."""
+        samples = self._samples.get(operation)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            operation: {
+                "samples": len(samples),
+                "p50": round(self.percentile(operation, 0.5), 4),
+                "p95": round(self.percentile(operation, 0.95), 4),
+                "p99": round(self.percentile(operation, 0.99), 4),
+            }
+            for operation, samples in self._samples.items()
+            if samples
+        }
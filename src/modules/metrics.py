@@ -0,0 +1,124 @@
+"""
+Prometheus metrics for the API, the Yeti upstream, parsing and caches.
+
+With PROMETHEUS_MULTIPROC_DIR set (before the app starts), every worker
+writes its samples to files in that directory and /metrics aggregates all
+of them, so one scrape sees the whole server rather than the worker that
+happened to answer it.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+UPSTREAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "yetiair_http_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "yetiair_http_requests_in_flight",
+    "API requests currently being handled",
+    multiprocess_mode="livesum",
+)
+YETI_REQUEST_DURATION = Histogram(
+    "yetiair_yeti_request_duration_seconds",
+    "Yeti SOAP call latency by operation and HTTP status ('error' for transport failures)",
+    ["operation", "status"],
+    buckets=UPSTREAM_BUCKETS,
+)
+YETI_RESPONSE_BYTES = Histogram(
+    "yetiair_yeti_response_bytes",
+    "Yeti SOAP response body size",
+    ["operation"],
+    buckets=SIZE_BUCKETS,
+)
+YETI_REQUESTS_IN_FLIGHT = Gauge(
+    "yetiair_yeti_requests_in_flight",
+    "Yeti SOAP calls currently on the wire",
+    ["operation"],
+    multiprocess_mode="livesum",
+)
+XML_PARSE_DURATION = Histogram(
+    "yetiair_xml_parse_duration_seconds",
+    "Time spent parsing Yeti XML responses",
+    ["parser"],
+    buckets=PARSE_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "yetiair_cache_lookups_total",
+    "Cache lookups by cache and result (hit, stale_hit, miss)",
+    ["cache", "result"],
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "yetiair_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool (including new connects)",
+    ["pool"],
+    buckets=PARSE_BUCKETS + (2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_CONNECTIONS_IN_USE = Gauge(
+    "yetiair_db_pool_connections_in_use",
+    "Database connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "yetiair_db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DATABASE_POOL_TIMEOUT",
+    ["pool"],
+)
+
+
+def observe_request(method: str, route: str, status: int, duration: float) -> None:
+    HTTP_REQUEST_DURATION.labels(method=method, route=route, status=str(status)).observe(duration)
+
+
+def observe_yeti_call(operation: str, status: str, duration: float, response_bytes: int = None) -> None:
+    YETI_REQUEST_DURATION.labels(operation=operation, status=status).observe(duration)
+    if response_bytes is not None:
+        YETI_RESPONSE_BYTES.labels(operation=operation).observe(response_bytes)
+
+
+def record_cache_lookup(cache: str, result: str) -> None:
+    CACHE_LOOKUPS.labels(cache=cache, result=result).inc()
+
+
+@contextmanager
+def time_parse(parser: str):
+    """Time one XML parse, recorded whether or not it succeeds."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        XML_PARSE_DURATION.labels(parser=parser).observe(time.perf_counter() - start)
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Exposition-format body and content type for /metrics."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges; call from the process manager's exit hook."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
@@ -17,6 +17,7 @@ class RabbitMQClient(metaclass=Singleton):
         if self._connection:
             await self._connection.close()
             self._connection = None
+            self._channel = None
             
     async def get_channel(self):
         if not self._channel:
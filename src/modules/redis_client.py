@@ -9,11 +9,15 @@ class RedisClient(metaclass=Singleton):
 
     async def connect(self):
         if not self._client:
-            self._client = redis.from_url(self._url)
+            self._client = redis.from_url(
+                self._url,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            )
 
     async def close(self):
         if self._client:
-            await self._client.close()
+            await self._client.aclose()
             self._client = None
             
     async def get_client(self):
@@ -0,0 +1,38 @@
+import random
+from typing import Optional
+
+import httpx
+
+from src.config import settings
+
+# Gateway-type answers: the request most likely never reached Yeti's backend
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: attempt n waits a random time in
+    [0, min(max_delay, base_delay * 2**n)], so retries from many callers
+    after the same blip do not arrive in lockstep.
+    """
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+    ):
+        self.max_attempts = max_attempts or settings.YETI_RETRY_MAX_ATTEMPTS
+        self.base_delay = settings.YETI_RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = settings.YETI_RETRY_MAX_DELAY if max_delay is None else max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after the given (0-based) failed attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    @staticmethod
+    def is_retryable(exc: BaseException) -> bool:
+        """Dropped connections, timeouts and gateway errors; never our own 503s or 4xx."""
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(exc, httpx.TransportError)
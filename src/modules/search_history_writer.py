@@ -0,0 +1,239 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.db import AsyncSessionLocal
+from src.logger import logger
+from src.models.search_model import FlightOffer, Search
+from src.repositories.search_history_repository import SearchHistoryRepository
+from src.utils.flight_normalizer import normalize_availability
+
+
+@dataclass
+class SearchRecord:
+    """A parsed availability result waiting to be written."""
+    search_id: str
+    origin: str
+    destination: str
+    depart_date: Optional[str]
+    return_date: Optional[str]
+    adults: int
+    children: int
+    infants: int
+    data: Any
+    searched_at: datetime
+
+
+def _date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value.replace('-', '')[:8], "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def _decimal(value: Optional[float]) -> Optional[Decimal]:
+    return None if value is None else Decimal(str(value))
+
+
+def _text(value: Any, column) -> Optional[str]:
+    # Cut to the column width: COPY fails the whole batch on one oversized value
+    if value is None:
+        return None if column.nullable else ""
+    return str(value)[:column.type.length]
+
+
+_SEARCH = Search.__table__.c
+_OFFER = FlightOffer.__table__.c
+
+
+def search_rows(record: SearchRecord) -> Tuple[Tuple[Any, ...], List[Tuple[Any, ...]]]:
+    """
+    The search row and one row per (flight, fare), in the column order of
+    SearchHistoryRepository minus the ids it assigns, with text fitted to
+    the column widths.
+    """
+    now = datetime.utcnow()
+    offers = []
+    for flight in normalize_availability(record.data):
+        first = flight.segments[0] if flight.segments else None
+        last = flight.segments[-1] if flight.segments else None
+        for fare in flight.fares:
+            offers.append((
+                now, now,
+                _text(flight.direction, _OFFER.direction),
+                _text(flight.flight_id, _OFFER.flight_id),
+                _text(fare.fare_id, _OFFER.fare_id),
+                _text(first.airline if first else None, _OFFER.airline),
+                _text(first.flight_number if first else None, _OFFER.flight_number),
+                _text(first.origin if first else None, _OFFER.origin),
+                _text(last.destination if last else None, _OFFER.destination),
+                _date(first.departure_date) if first else None,
+                _text(first.departure_time if first else None, _OFFER.departure_time),
+                _text(last.arrival_time if last else None, _OFFER.arrival_time),
+                _text(fare.booking_class, _OFFER.booking_class),
+                _text(fare.fare_code, _OFFER.fare_code),
+                _text(fare.currency, _OFFER.currency),
+                _decimal(fare.adult_fare), _decimal(fare.total_adult_fare), _decimal(fare.tax_amount),
+                fare.seats_available, fare.refundable, record.searched_at,
+            ))
+    search = (
+        now, now,
+        _text(record.search_id, _SEARCH.search_id),
+        _text(record.origin, _SEARCH.origin),
+        _text(record.destination, _SEARCH.destination),
+        _date(record.depart_date), _date(record.return_date),
+        record.adults, record.children, record.infants, len(offers), record.searched_at,
+    )
+    return search, offers
+
+
+class SearchHistoryWriter:
+    """
+    Persists availability results off the request path.
+
+    `submit` queues a parsed result without blocking (dropping it when the
+    queue is full). A background task collects up to `batch_size` results,
+    or whatever arrived within `flush_interval` seconds of the first one,
+    and writes them with one COPY per table in a single transaction. If
+    that fails, the results are retried one per transaction so a single
+    bad row only loses its own result.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self.maxsize = maxsize or settings.SEARCH_HISTORY_QUEUE_MAXSIZE
+        self.batch_size = batch_size or settings.SEARCH_HISTORY_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.SEARCH_HISTORY_FLUSH_INTERVAL
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.submitted = 0
+        self.written_searches = 0
+        self.written_offers = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def _start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info(
+            f"Search history writer started (queue={self.maxsize}, batch={self.batch_size}, "
+            f"interval={self.flush_interval}s)"
+        )
+
+    async def start(self) -> None:
+        """Start the background drain task."""
+        if self._task is None or self._task.done():
+            self._start()
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """Flush queued results and stop the drain task."""
+        if self._task is None:
+            return
+        timeout = settings.SEARCH_HISTORY_FLUSH_TIMEOUT if timeout is None else timeout
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Search history flush timed out with {self._queue.qsize()} results pending")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info(f"Search history writer stopped: {self.stats()}")
+
+    def submit(self, search_id: str, request, data: Any) -> bool:
+        """Queue a parsed availability result. Returns False if it was dropped."""
+        record = SearchRecord(
+            search_id=search_id,
+            origin=request.origin,
+            destination=request.destination,
+            depart_date=request.depart_date,
+            return_date=request.return_date,
+            adults=request.adults,
+            children=request.children,
+            infants=request.infants,
+            data=data,
+            searched_at=datetime.utcnow(),
+        )
+        self.submitted += 1
+        if self._task is None or self._task.done():
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                logger.warning(f"Search history queue full, dropped {self.dropped} results so far")
+            return False
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            try:
+                while len(batch) < self.batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: List[SearchRecord]) -> None:
+        try:
+            await self._copy(batch)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                self.failed += 1
+                logger.error(f"Search history failed to write 1 result: {e}")
+                return
+            logger.warning(f"Search history batch of {len(batch)} failed, retrying one by one: {e}")
+
+        failed = 0
+        for record in batch:
+            try:
+                await self._copy([record])
+            except Exception as e:
+                failed += 1
+                logger.error(f"Search history failed to write search {record.search_id}: {e}")
+        self.failed += failed
+
+    async def _copy(self, batch: List[SearchRecord]) -> None:
+        rows = [search_rows(record) for record in batch]
+        async with AsyncSessionLocal() as session:
+            searches, offers = await SearchHistoryRepository(session).copy_searches(rows)
+            await session.commit()
+        self.written_searches += searches
+        self.written_offers += offers
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and counters for this process."""
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "submitted": self.submitted,
+            "written_searches": self.written_searches,
+            "written_offers": self.written_offers,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+search_history_writer = SearchHistoryWriter()
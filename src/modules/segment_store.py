@@ -0,0 +1,298 @@
+"""
+Append-only, compressed audit store: one file per rolling segment instead
+of one per RQ/RS, with a SQLite index from search_id to the segment
+offsets that hold its records.
+
+    {dir}/segments/{created}-{pid}-{id}.seg   gzip members, one per appended batch
+    {dir}/index.sqlite3                       (search_id, segment, offset, length)
+
+Each batch is an independent gzip member of JSON Lines, so a lookup reads
+and decompresses only the members indexed for the search. Every process
+writes its own segments, so API workers and archivers can share a store.
+
+    python -m src.modules.segment_store get <search_id> [--out DIR]
+    python -m src.modules.segment_store stats
+    python -m src.modules.segment_store prune --days 30
+"""
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from src.config import settings
+from src.utils.xml_parser import unescape_xml
+
+
+class StoredRecord(NamedTuple):
+    search_id: str
+    sequence: int
+    filename: str
+    content: str
+    # Unique per audit record; empty for search log chunks and older segments
+    record_id: str = ""
+
+
+def _segment_pid(name: str) -> Optional[int]:
+    """The writer's pid from a `{created}-{pid}-{id}.seg` name."""
+    parts = name.split("-")
+    if len(parts) != 3 or not parts[1].isdigit():
+        return None
+    return int(parts[1])
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by another user
+        return True
+    return True
+
+
+class SegmentStore:
+    """Appends record batches to rolling segments and looks them up by search_id."""
+
+    def __init__(self, base_dir: str, max_segment_bytes: Optional[int] = None):
+        self.base_dir = base_dir
+        self.segments_dir = os.path.join(base_dir, "segments")
+        self.max_segment_bytes = max_segment_bytes or settings.AUDIT_SEGMENT_MAX_BYTES
+        os.makedirs(self.segments_dir, exist_ok=True)
+        # Appends come from the audit writer's threads and from logging calls
+        self._lock = threading.Lock()
+        self._index = sqlite3.connect(os.path.join(base_dir, "index.sqlite3"), check_same_thread=False)
+        # WAL lets several processes append while others read
+        self._index.execute("PRAGMA journal_mode=WAL")
+        self._index.execute("PRAGMA synchronous=NORMAL")
+        self._index.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "search_id TEXT NOT NULL, segment TEXT NOT NULL, "
+            "offset INTEGER NOT NULL, length INTEGER NOT NULL)"
+        )
+        self._index.execute("CREATE INDEX IF NOT EXISTS ix_records_search_id ON records (search_id)")
+        self._index.commit()
+        self._segment_name: Optional[str] = None
+        self._segment = None
+
+    def _roll(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+        created = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        self._segment_name = f"{created}-{os.getpid()}-{uuid.uuid4().hex[:8]}.seg"
+        self._segment = open(os.path.join(self.segments_dir, self._segment_name), "ab")
+
+    def append(self, records: Iterable[StoredRecord]) -> int:
+        """Write records as one compressed member and index it; returns the record count."""
+        records = list(records)
+        if not records:
+            return 0
+        lines = "\n".join(json.dumps(record._asdict()) for record in records)
+        member = gzip.compress(lines.encode("utf-8"), compresslevel=6)
+        with self._lock:
+            if self._segment is None or self._segment.tell() >= self.max_segment_bytes:
+                self._roll()
+            offset = self._segment.tell()
+            self._segment.write(member)
+            # The member is on disk before the index points at it
+            self._segment.flush()
+            search_ids = {record.search_id for record in records}
+            self._index.executemany(
+                "INSERT INTO records (search_id, segment, offset, length) VALUES (?, ?, ?, ?)",
+                [(search_id, self._segment_name, offset, len(member)) for search_id in search_ids],
+            )
+            self._index.commit()
+        return len(records)
+
+    def read(self, search_id: str) -> List[StoredRecord]:
+        """All records for a search, in the order they were appended."""
+        with self._lock:
+            rows = self._index.execute(
+                "SELECT segment, offset, length FROM records WHERE search_id = ? ORDER BY rowid",
+                (search_id,),
+            ).fetchall()
+        records = []
+        seen = set()
+        handles: Dict[str, object] = {}
+        try:
+            for segment, offset, length in rows:
+                if segment not in handles:
+                    path = os.path.join(self.segments_dir, segment)
+                    if not os.path.exists(path):
+                        # Pruned since the query ran
+                        continue
+                    handles[segment] = open(path, "rb")
+                f = handles[segment]
+                f.seek(offset)
+                for line in gzip.decompress(f.read(length)).decode("utf-8").splitlines():
+                    record = StoredRecord(**json.loads(line))
+                    if record.search_id != search_id:
+                        continue
+                    # A redelivered batch appends the same records again
+                    if record.record_id:
+                        if record.record_id in seen:
+                            continue
+                        seen.add(record.record_id)
+                    records.append(record)
+        finally:
+            for f in handles.values():
+                f.close()
+        return records
+
+    def stats(self) -> Dict[str, int]:
+        names = [n for n in os.listdir(self.segments_dir) if n.endswith(".seg")]
+        with self._lock:
+            searches, members = self._index.execute(
+                "SELECT COUNT(DISTINCT search_id), COUNT(DISTINCT segment || ':' || offset) FROM records"
+            ).fetchone()
+        return {
+            "segments": len(names),
+            "segment_bytes": sum(os.path.getsize(os.path.join(self.segments_dir, n)) for n in names),
+            "searches": searches,
+            "batches": members,
+        }
+
+    def _open_segments(self, mtimes: Dict[str, float]) -> set:
+        """
+        Segments a live process may still append to: the last one each
+        running pid wrote. Other processes sharing the store don't share
+        our lock, so a quiet worker's open segment can be older than the
+        cutoff.
+        """
+        newest: Dict[int, str] = {}
+        for name, mtime in mtimes.items():
+            pid = _segment_pid(name)
+            if pid is not None and (pid not in newest or mtime > mtimes[newest[pid]]):
+                newest[pid] = name
+        open_segments = {name for pid, name in newest.items() if _pid_alive(pid)}
+        open_segments.add(self._segment_name)
+        return open_segments
+
+    def prune(self, older_than_seconds: float) -> int:
+        """
+        Delete segments last written before the cutoff, and their index
+        rows, except ones a running process may still append to; returns
+        how many.
+        """
+        cutoff = time.time() - older_than_seconds
+        removed = 0
+        with self._lock:
+            mtimes = {
+                name: os.path.getmtime(os.path.join(self.segments_dir, name))
+                for name in os.listdir(self.segments_dir)
+                if name.endswith(".seg")
+            }
+            open_segments = self._open_segments(mtimes)
+            for name, mtime in mtimes.items():
+                if name in open_segments or mtime >= cutoff:
+                    continue
+                path = os.path.join(self.segments_dir, name)
+                self._index.execute("DELETE FROM records WHERE segment = ?", (name,))
+                self._index.commit()
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            self._index.close()
+
+
+_stores: Dict[str, SegmentStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_segment_store(base_dir: Optional[str] = None) -> SegmentStore:
+    """The process-wide store for a directory (default AUDIT_SEGMENT_DIR)."""
+    base_dir = os.path.abspath(base_dir or settings.AUDIT_SEGMENT_DIR)
+    with _stores_lock:
+        if base_dir not in _stores:
+            _stores[base_dir] = SegmentStore(base_dir)
+        return _stores[base_dir]
+
+
+def audit_filename(sequence: int, filename: str, record_id: str = "") -> str:
+    """
+    {seq:02d}_{id}_{filename} for an audit record. Each worker numbers a
+    search from 01, so the record id prefix keeps files from workers that
+    served the same search apart; a redelivered record keeps its name.
+    """
+    if not record_id:
+        return f"{sequence:02d}_{filename}"
+    return f"{sequence:02d}_{record_id[:8]}_{filename}"
+
+
+def _filename(record: StoredRecord) -> str:
+    # Search log chunks (sequence 0) all belong to one app.log
+    if record.sequence == 0:
+        return record.filename
+    return audit_filename(record.sequence, record.filename, record.record_id)
+
+
+def _write_out(records: List[StoredRecord], out_dir: str) -> None:
+    """Recreate the logs/{search_id}/ layout for the records of one search."""
+    for record in records:
+        log_dir = os.path.join(out_dir, record.search_id)
+        os.makedirs(log_dir, exist_ok=True)
+        if record.sequence == 0:
+            with open(os.path.join(log_dir, record.filename), "a", encoding="utf-8") as f:
+                f.write(record.content)
+        else:
+            # Same unescaping the file sink applies to RQ/RS payloads
+            with open(os.path.join(log_dir, _filename(record)), "w", encoding="utf-8") as f:
+                f.write(unescape_xml(record.content))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read and maintain the segmented audit store")
+    parser.add_argument("--dir", default=settings.AUDIT_SEGMENT_DIR, help="store directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    get = commands.add_parser("get", help="print (or extract with --out) every record for a search")
+    get.add_argument("search_id")
+    get.add_argument("--out", metavar="DIR", help="write the records as DIR/{search_id}/ files instead")
+    commands.add_parser("stats", help="segment, search and batch counts")
+    prune = commands.add_parser("prune", help="delete segments older than --days")
+    prune.add_argument("--days", type=float, required=True)
+    args = parser.parse_args()
+
+    store = SegmentStore(args.dir)
+    try:
+        if args.command == "get":
+            records = store.read(args.search_id)
+            if not records:
+                print(f"No records for {args.search_id}", file=sys.stderr)
+                sys.exit(1)
+            if args.out:
+                _write_out(records, args.out)
+                print(f"Wrote {len(records)} records to {os.path.join(args.out, args.search_id)}")
+            else:
+                for record in records:
+                    if record.sequence:
+                        print(f"==> {_filename(record)} <==")
+                        print(unescape_xml(record.content))
+                log = "".join(record.content for record in records if record.sequence == 0)
+                if log:
+                    print("==> app.log <==")
+                    print(log, end="")
+        elif args.command == "stats":
+            print(json.dumps(store.stats(), indent=2))
+        elif args.command == "prune":
+            print(f"Removed {store.prune(args.days * 86400)} segments")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+import httpx
+
+from src.config import settings
+from .redis_client import RedisClient
+
+
+def cookie_fields(cookies: httpx.Cookies) -> dict:
+    """One JSON hash field per cookie, keyed by what identifies it in a jar."""
+    return {
+        f"{c.domain}|{c.path}|{c.name}": json.dumps(
+            {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+        )
+        for c in cookies.jar
+    }
+
+
+def cookies_from_fields(values) -> httpx.Cookies:
+    """Rebuild an httpx cookie jar from `cookie_fields` values."""
+    cookies = httpx.Cookies()
+    for value in values:
+        c = json.loads(value)
+        cookies.set(c["name"], c["value"], domain=c["domain"], path=c["path"])
+    return cookies
+
+
+class LRUTTLCache:
+    """Size-bounded mapping whose entries expire after `ttl` seconds without access."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        value, expires_at = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        # Touch: sliding idle expiry and LRU position
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SessionStore(ABC):
+    """Stores Yeti session cookies per search_id with idle expiry."""
+
+    @abstractmethod
+    async def get_cookies(self, search_id: str) -> Optional[httpx.Cookies]:
+        """Return the cookies for a search, refreshing its idle timer."""
+        pass
+
+    @abstractmethod
+    async def set_cookies(self, search_id: str, cookies: httpx.Cookies) -> None:
+        """Replace the cookies stored for a search."""
+        pass
+
+    @abstractmethod
+    async def delete(self, search_id: str) -> None:
+        """Forget a search's session."""
+        pass
+
+    async def merge_cookies(self, search_id: str, cookies: httpx.Cookies) -> None:
+        """Merge newly received cookies into the search's stored jar."""
+        existing = await self.get_cookies(search_id)
+        if existing is not None:
+            existing.update(cookies)
+            cookies = existing
+        await self.set_cookies(search_id, cookies)
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local LRU+TTL store. Pins a search to one worker."""
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        self._cache = LRUTTLCache(
+            maxsize or settings.SESSION_STORE_MAX_ENTRIES,
+            ttl or settings.SESSION_IDLE_TTL,
+        )
+
+    async def get_cookies(self, search_id: str) -> Optional[httpx.Cookies]:
+        return self._cache.get(search_id)
+
+    async def set_cookies(self, search_id: str, cookies: httpx.Cookies) -> None:
+        self._cache[search_id] = cookies
+
+    async def delete(self, search_id: str) -> None:
+        self._cache.pop(search_id)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Shared store so any worker or instance can continue a search.
+
+    A search's jar is a hash with one field per cookie, so concurrent
+    responses for the same search merge their cookies with HSET instead
+    of overwriting each other's read-modify-write.
+    """
+
+    KEY_PREFIX = "yetiair:session:"
+
+    def __init__(self, redis_client: Optional[RedisClient] = None, ttl: Optional[int] = None):
+        self._redis = redis_client or RedisClient()
+        self.ttl = ttl or settings.SESSION_IDLE_TTL
+
+    def _key(self, search_id: str) -> str:
+        return f"{self.KEY_PREFIX}{search_id}:jar"
+
+    async def get_cookies(self, search_id: str) -> Optional[httpx.Cookies]:
+        client = await self._redis.get_client()
+        key = self._key(search_id)
+        # Read and slide the idle expiry in one round trip
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hvals(key)
+            pipe.expire(key, self.ttl)
+            values, _ = await pipe.execute()
+        if not values:
+            return None
+        return cookies_from_fields(values)
+
+    async def set_cookies(self, search_id: str, cookies: httpx.Cookies) -> None:
+        await self._write(search_id, cookie_fields(cookies), replace=True)
+
+    async def merge_cookies(self, search_id: str, cookies: httpx.Cookies) -> None:
+        await self._write(search_id, cookie_fields(cookies), replace=False)
+
+    async def _write(self, search_id: str, fields: dict, replace: bool) -> None:
+        client = await self._redis.get_client()
+        key = self._key(search_id)
+        async with client.pipeline(transaction=True) as pipe:
+            if replace:
+                pipe.delete(key)
+            if fields:
+                pipe.hset(key, mapping=fields)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def delete(self, search_id: str) -> None:
+        client = await self._redis.get_client()
+        await client.delete(self._key(search_id))
+
+
+def create_session_store() -> SessionStore:
+    """Build the session store selected by SESSION_STORE_BACKEND."""
+    backend = settings.SESSION_STORE_BACKEND.lower()
+    if backend == "redis":
+        return RedisSessionStore()
+    if backend == "memory":
+        return InMemorySessionStore()
+    raise ValueError(f"Unknown SESSION_STORE_BACKEND: {settings.SESSION_STORE_BACKEND}")
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.config import settings
+from src.exceptions.base_exception import BaseCustomException
+from src.exceptions.upstream_exception import UpstreamCallException
+from src.logger import logger
+from .redis_client import RedisClient
+
+# Release the leader lock only if we still own it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class _LeaderCancelled(Exception):
+    """Set on the shared future when the leading caller is cancelled."""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+
+    Within a worker, callers for a key already in flight await the leader's
+    future. With `distributed=True` the leader is also elected across
+    workers through a Redis SET NX lock, and its JSON-serializable result is
+    published to followers in other workers over pub/sub.
+
+    If the leading caller is cancelled, its followers don't inherit the
+    cancellation: one of them runs `fn` again and the rest join it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        distributed: Optional[bool] = None,
+        redis_client: Optional[RedisClient] = None,
+    ):
+        self.name = name
+        self.distributed = settings.SINGLE_FLIGHT_DISTRIBUTED if distributed is None else distributed
+        self._redis = redis_client or RedisClient()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `fn` once for all concurrent callers of `key` and share its result."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            logger.debug(f"SingleFlight[{self.name}] joined in-flight call for key={key}")
+            try:
+                # Shield so one cancelled waiter doesn't cancel the shared call
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # The leader's caller went away, but ours still wants the result
+                self.coalesced -= 1
+                logger.debug(f"SingleFlight[{self.name}] leader cancelled, retrying key={key}")
+                return await self.do(key, fn)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            if self.distributed:
+                result = await self._do_distributed(key, fn)
+            else:
+                self.executions += 1
+                result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._inflight[key]
+            # Mark retrieved so an unobserved failure doesn't log "exception never retrieved"
+            if future.done():
+                future.exception()
+
+    def _redis_keys(self, key: str):
+        base = f"yetiair:singleflight:{self.name}:{key}"
+        return f"{base}:lock", f"{base}:result", f"{base}:channel"
+
+    async def _do_distributed(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key, result_key, channel = self._redis_keys(key)
+        token = uuid.uuid4().hex
+        try:
+            client = await self._redis.get_client()
+            is_leader = await client.set(
+                lock_key, token, nx=True, px=int(settings.SINGLE_FLIGHT_LOCK_TTL * 1000)
+            )
+        except Exception as e:
+            logger.warning(f"SingleFlight[{self.name}] Redis unavailable, coalescing locally only: {e}")
+            self.executions += 1
+            return await fn()
+
+        if is_leader:
+            return await self._lead(client, fn, lock_key, token, result_key, channel)
+
+        shared = await self._follow(client, result_key, channel)
+        if shared is None or shared.get("cancelled"):
+            # Leader vanished, was cancelled or was too slow; do the work ourselves rather than fail
+            logger.warning(f"SingleFlight[{self.name}] no result from remote leader for key={key}")
+            self.executions += 1
+            return await fn()
+
+        self.coalesced += 1
+        if "error" in shared:
+            raise UpstreamCallException(
+                self.name,
+                shared["error"],
+                status_code=shared.get("status_code", 502),
+                error_code=shared.get("error_code", "UPSTREAM_ERROR"),
+            )
+        return shared["result"]
+
+    async def _lead(self, client, fn, lock_key: str, token: str, result_key: str, channel: str) -> Any:
+        self.executions += 1
+        message = {"cancelled": True}
+        try:
+            result = await fn()
+            message = {"result": result}
+            return result
+        except BaseCustomException as e:
+            # Followers re-raise it with the same status the leader's caller gets
+            message = {"error": e.message, "status_code": e.status_code, "error_code": e.error_code}
+            raise
+        except Exception as e:
+            message = {"error": str(e)}
+            raise
+        finally:
+            try:
+                payload = json.dumps(message)
+                # Kept briefly for followers that subscribe after the publish
+                await client.set(result_key, payload, ex=settings.SINGLE_FLIGHT_RESULT_TTL)
+                await client.publish(channel, payload)
+                await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except Exception as e:
+                logger.warning(f"SingleFlight[{self.name}] failed to publish result: {e}")
+
+    async def _follow(self, client, result_key: str, channel: str) -> Optional[Dict[str, Any]]:
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(channel)
+            # The leader may have finished between our lock attempt and subscribing
+            existing = await client.get(result_key)
+            if existing is not None:
+                return json.loads(existing)
+
+            deadline = time.monotonic() + settings.SINGLE_FLIGHT_LOCK_TTL
+            while time.monotonic() < deadline:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=min(1.0, deadline - time.monotonic()),
+                )
+                if message and message.get("type") == "message":
+                    return json.loads(message["data"])
+            return None
+        except Exception as e:
+            logger.warning(f"SingleFlight[{self.name}] failed waiting for remote leader: {e}")
+            return None
+        finally:
+            try:
+                await pubsub.unsubscribe(channel)
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Execution/coalescing counters for this process."""
+        return {
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
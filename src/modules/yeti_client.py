@@ -1,8 +1,37 @@
-import os
+import asyncio
+import time
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Optional
 import httpx
 from src.config import settings
 from src.logger import logger, get_search_logger
-from src.utils.xml_parser import unescape_xml, parse_yeti_xml_response
+from src.utils.xml_parser import parse_yeti_xml_response
+from src.utils import soap_builder
+from .session_store import create_session_store
+from .audit_writer import audit_writer
+from . import metrics
+from .circuit_breaker import CircuitBreakerRegistry
+from .concurrency_limiter import AdaptiveConcurrencyLimiter
+from .latency_tracker import LatencyTracker
+from .retry_policy import RetryPolicy
+
+
+def _is_upstream_failure(exc: BaseException) -> bool:
+    """Transport errors and 5xx count against the circuit; 4xx are our fault, not Yeti's."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.HTTPError)
+
+
+class _RejectAllCookiesPolicy(DefaultCookiePolicy):
+    """Keeps the shared client's own jar empty so sessions never leak between searches."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
 
 class YetiClient:
     def __init__(self):
@@ -10,8 +39,164 @@ class YetiClient:
         self.agency_code = settings.YETI_AGENCY_CODE
         self.password = settings.YETI_PASSWORD
         self.headers = {'Content-Type': 'text/xml'}
-        self.session_store = {}
-        self.sequence_store = {}
+        self.session_store = create_session_store()
+        self._client: Optional[httpx.AsyncClient] = None
+        self.circuit_breakers = CircuitBreakerRegistry(is_failure=_is_upstream_failure)
+        self.concurrency_limiter = AdaptiveConcurrencyLimiter("yeti", is_failure=_is_upstream_failure)
+        self.retry_policy = RetryPolicy()
+        self.latency = LatencyTracker()
+        self.hedged = 0
+        self.hedges_won = 0
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.YETI_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.YETI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.YETI_HTTP_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(
+            settings.YETI_HTTP_TIMEOUT,
+            connect=settings.YETI_HTTP_CONNECT_TIMEOUT,
+        )
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=timeout,
+            cookies=CookieJar(policy=_RejectAllCookiesPolicy()),
+        )
+
+    async def start(self):
+        """Open the shared connection pool. Called from the FastAPI startup hook."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+            logger.info(
+                f"Yeti HTTP pool started (max_connections={settings.YETI_HTTP_MAX_CONNECTIONS}, "
+                f"max_keepalive={settings.YETI_HTTP_MAX_KEEPALIVE_CONNECTIONS}, "
+                f"keepalive_expiry={settings.YETI_HTTP_KEEPALIVE_EXPIRY}s)"
+            )
+
+    async def close(self):
+        """Close the shared connection pool. Called from the FastAPI shutdown hook."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Yeti HTTP pool closed")
+
+    async def get_client(self) -> httpx.AsyncClient:
+        # Start lazily for callers outside the app lifecycle (scripts, workers)
+        if self._client is None or self._client.is_closed:
+            await self.start()
+        return self._client
+
+    async def _request_headers(self, search_id: str) -> dict:
+        """Headers for one request, carrying the cookies stored for this search."""
+        cookies = await self.session_store.get_cookies(search_id)
+        if not cookies:
+            return self.headers
+        cookie_header = "; ".join(f"{cookie.name}={cookie.value}" for cookie in cookies.jar)
+        return {**self.headers, 'Cookie': cookie_header}
+
+    async def _store_cookies(self, search_id: str, response: httpx.Response):
+        if response.cookies:
+            await self.session_store.merge_cookies(search_id, response.cookies)
+
+    async def _post(self, operation: str, search_id: str, payload: bytes) -> httpx.Response:
+        """
+        POST a SOAP envelope over the shared pool with the search's session cookies.
+
+        The operation's circuit breaker and the adaptive concurrency limiter
+        reject with a 503 (ServiceUnavailableException) instead of letting
+        calls queue up behind a slow upstream.
+        """
+        breaker = self.circuit_breakers.get(operation)
+        breaker.raise_if_open()
+        client = await self.get_client()
+        headers = await self._request_headers(search_id)
+        async with self.concurrency_limiter.acquire():
+            async with breaker.call():
+                start = time.monotonic()
+                with metrics.YETI_REQUESTS_IN_FLIGHT.labels(operation=operation).track_inprogress():
+                    try:
+                        response = await client.post(self.url, headers=headers, content=payload)
+                    except Exception:
+                        metrics.observe_yeti_call(operation, "error", time.monotonic() - start)
+                        raise
+                elapsed = time.monotonic() - start
+                metrics.observe_yeti_call(operation, str(response.status_code), elapsed, len(response.content))
+                response.raise_for_status()
+                self.latency.record(operation, elapsed)
+        await self._store_cookies(search_id, response)
+        return response
+
+    async def _post_idempotent(self, operation: str, search_id: str, payload: bytes) -> httpx.Response:
+        """
+        `_post` with retries (exponential backoff, full jitter) and, when
+        YETI_HEDGING_ENABLED, a hedged second request. Only for operations
+        that are safe to send twice: never FlightAdd or BookingSave.
+        """
+        search_logger = get_search_logger(search_id)
+        for attempt in range(self.retry_policy.max_attempts):
+            try:
+                if settings.YETI_HEDGING_ENABLED:
+                    return await self._post_hedged(operation, search_id, payload)
+                return await self._post(operation, search_id, payload)
+            except Exception as e:
+                if attempt + 1 >= self.retry_policy.max_attempts or not self.retry_policy.is_retryable(e):
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                search_logger.warning(
+                    f"{operation} attempt {attempt + 1} failed ({e!r}); retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def _post_hedged(self, operation: str, search_id: str, payload: bytes) -> httpx.Response:
+        """
+        Send the request and, if it is still running after the operation's
+        observed p95 latency, send it again and take whichever answers first.
+        """
+        hedge_after = self.latency.percentile(
+            operation, settings.YETI_HEDGE_PERCENTILE, settings.YETI_HEDGE_MIN_SAMPLES
+        )
+        first = asyncio.ensure_future(self._post(operation, search_id, payload))
+        if hedge_after is None:
+            # Not enough samples yet to know what "slow" is
+            return await first
+
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            limiter = self.concurrency_limiter
+            # Hedge only with spare upstream capacity, so hedges can't feed an overload
+            if done or limiter.stats()["in_flight"] >= limiter.limit:
+                return await first
+
+            get_search_logger(search_id).info(f"Hedging {operation} after {hedge_after:.3f}s")
+            self.hedged += 1
+            tasks.append(asyncio.ensure_future(self._post(operation, search_id, payload)))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.hedges_won += 1
+                        return task.result()
+            # Both attempts failed; surface the original one's error
+            return first.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Mark a losing attempt's error as retrieved
+                    task.exception()
+
+    def stats(self) -> dict:
+        """Retry/hedging counters and per-operation latency percentiles."""
+        return {
+            "hedged": self.hedged,
+            "hedges_won": self.hedges_won,
+            "latency": self.latency.stats(),
+        }
 
     def _format_date(self, date_str: str) -> str:
         """Helper to format date for Yeti API (YYYYMMDD). Returns empty string if invalid/none."""
@@ -20,294 +205,152 @@ class YetiClient:
         # Remove hyphens if present (e.g., 2026-02-20 -> 20260220)
         return date_str.replace('-', '')
 
-    def log_to_file(self, search_id: str, filename: str, content: str):
-        # Ensure directory exists (though logger usually does this)
-        log_dir = f"logs/{search_id}"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-            
-        # Get and increment sequence number for this search_id
-        seq_num = self.sequence_store.get(search_id, 1)
-        self.sequence_store[search_id] = seq_num + 1
-        
-        # Prefix filename with sequence number
-        full_filename = f"{seq_num:02d}_{filename}"
-            
-        file_path = os.path.join(log_dir, full_filename)
-        # Unescape XML for readability
-        try:
-            readable_content = unescape_xml(content)
-        except Exception:
-            readable_content = content
-            
-        with open(file_path, "w") as f:
-            f.write(readable_content)
+    def log_to_file(self, search_id: str, filename: str, content: Any):
+        """Queue an RQ/RS or response dump for the background audit writer."""
+        audit_writer.submit(search_id, filename, content)
 
     async def get_flight_availability(self, request_data, search_id: str):
         search_logger = get_search_logger(search_id)
         
-        payload = f"""<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:tem="http://tempuri.org/">
-   <soapenv:Header/>
-   <soapenv:Body>
-      <tem:FlightAvailability>
-         <tem:strAgencyCode>{self.agency_code}</tem:strAgencyCode>
-         <tem:strPassword>{self.password}</tem:strPassword>
-         <tem:strOrigin>{request_data.origin}</tem:strOrigin>
-         <tem:strDestination>{request_data.destination}</tem:strDestination>
-         <tem:strDepartFrom>{self._format_date(request_data.depart_date)}</tem:strDepartFrom>
-         <tem:strDepartTo>{self._format_date(request_data.depart_date)}</tem:strDepartTo>
-         <tem:strReturnFrom>{self._format_date(request_data.return_date)}</tem:strReturnFrom>
-         <tem:strReturnTo>{self._format_date(request_data.return_date)}</tem:strReturnTo>
-         <tem:iAdult>{request_data.adults}</tem:iAdult>
-         <tem:iChild>{request_data.children}</tem:iChild>
-         <tem:iInfant>{request_data.infants}</tem:iInfant>
-         <tem:iOther>{request_data.others}</tem:iOther>
-         <tem:nationality>{request_data.nationality}</tem:nationality>
-         <tem:strBookingClass></tem:strBookingClass>
-         <tem:strBoardingClass></tem:strBoardingClass>
-         <tem:strPromoCode></tem:strPromoCode>
-         <tem:strLanguageCode>EN</tem:strLanguageCode>
-      </tem:FlightAvailability>
-   </soapenv:Body>
-</soapenv:Envelope>"""
-        
-        # Load cookies if exist (though availability usually doesn't need prev session, but good for consistency)
-        cookies = self.session_store.get(search_id)
+        depart_from = self._format_date(request_data.depart_date)
+        # strDepartTo is only widened for native date-range searches
+        depart_to = self._format_date(getattr(request_data, 'depart_date_to', None)) or depart_from
+        payload = soap_builder.flight_availability(
+            agency_code=self.agency_code,
+            password=self.password,
+            origin=request_data.origin,
+            destination=request_data.destination,
+            depart_from=depart_from,
+            depart_to=depart_to,
+            return_from=self._format_date(request_data.return_date),
+            return_to=self._format_date(request_data.return_date),
+            adults=request_data.adults,
+            children=request_data.children,
+            infants=request_data.infants,
+            others=request_data.others,
+            nationality=request_data.nationality,
+        )
 
-        async with httpx.AsyncClient(cookies=cookies) as client:
-            try:
-                search_logger.info(f"Sending FlightAvailability request to {self.url} for origin={request_data.origin} destination={request_data.destination} date={request_data.depart_date}")
-                self.log_to_file(search_id, "FlightAvailability_RQ.xml", payload)
-                
-                response = await client.post(self.url, headers=self.headers, content=payload, timeout=30.0)
-                response.raise_for_status()
-                
-                # Update cookies
-                if response.cookies:
-                    self.session_store[search_id] = response.cookies
-
-                search_logger.info(f"Received response from Yeti API: status={response.status_code}")
-                self.log_to_file(search_id, "FlightAvailability_RS.xml", response.text)
-                return response.text
-            except httpx.HTTPError as e:
-                search_logger.error(f"Yeti API error: {e}")
-                raise Exception(f"Yeti API error: {e}")
+        try:
+            search_logger.info(f"Sending FlightAvailability request to {self.url} for origin={request_data.origin} destination={request_data.destination} date={request_data.depart_date}")
+            self.log_to_file(search_id, "FlightAvailability_RQ.xml", payload)
+            
+            response = await self._post_idempotent("FlightAvailability", search_id, payload)
+
+            search_logger.info(f"Received response from Yeti API: status={response.status_code}")
+            self.log_to_file(search_id, "FlightAvailability_RS.xml", response.text)
+            return response.text
+        except httpx.HTTPError as e:
+            search_logger.error(f"Yeti API error: {e}")
+            raise Exception(f"Yeti API error: {e}")
 
     async def service_initialize(self, search_id: str):
         search_logger = get_search_logger(search_id)
         
-        payload = f"""<soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope" xmlns:tem="http://tempuri.org/">
-   <soap:Header/>
-   <soap:Body>
-      <tem:ServiceInitialize>
-         <tem:strAgencyCode>{self.agency_code}</tem:strAgencyCode>
-         <tem:strUserName>{settings.YETI_USERNAME}</tem:strUserName>
-         <tem:strPassword>{self.password}</tem:strPassword>
-         <tem:strLanguageCode>EN</tem:strLanguageCode>
-      </tem:ServiceInitialize>
-   </soap:Body>
-</soap:Envelope>"""
-        
-        # New session logic could be enforced here by ignoring previous cookies, but let's be safe
-        cookies = self.session_store.get(search_id)
-        
-        async with httpx.AsyncClient(cookies=cookies) as client:
-            try:
-                search_logger.info(f"Sending ServiceInitialize request to {self.url}")
-                self.log_to_file(search_id, "ServiceInitialize_RQ.xml", payload)
-                
-                response = await client.post(self.url, headers=self.headers, content=payload, timeout=30.0)
-                response.raise_for_status()
-                
-                # IMPORTANT: Save the session cookies
-                if response.cookies:
-                    self.session_store[search_id] = response.cookies
-                    search_logger.info(f"Session cookies saved for search_id={search_id}")
-
-                search_logger.info(f"Received response from Yeti API ServiceInitialize: status={response.status_code}")
-                self.log_to_file(search_id, "ServiceInitialize_RS.xml", response.text)
-                return response.text
-            except httpx.HTTPError as e:
-                search_logger.error(f"Yeti API error in ServiceInitialize: {e}")
-                raise Exception(f"Yeti API error in ServiceInitialize: {e}")
+        payload = soap_builder.service_initialize(
+            agency_code=self.agency_code,
+            username=settings.YETI_USERNAME,
+            password=self.password,
+        )
+
+        try:
+            search_logger.info(f"Sending ServiceInitialize request to {self.url}")
+            self.log_to_file(search_id, "ServiceInitialize_RQ.xml", payload)
+            
+            response = await self._post("ServiceInitialize", search_id, payload)
+            
+            # IMPORTANT: _post keeps the session cookies for the following steps
+            if response.cookies:
+                search_logger.info(f"Session cookies saved for search_id={search_id}")
+
+            search_logger.info(f"Received response from Yeti API ServiceInitialize: status={response.status_code}")
+            self.log_to_file(search_id, "ServiceInitialize_RS.xml", response.text)
+            return response.text
+        except httpx.HTTPError as e:
+            search_logger.error(f"Yeti API error in ServiceInitialize: {e}")
+            raise Exception(f"Yeti API error in ServiceInitialize: {e}")
 
     async def flight_add(self, request_data, search_id: str):
         search_logger = get_search_logger(search_id)
         
-        inner_xml = f"""<Booking>
-        	<Header>
-        		<adult>{request_data.adults}</adult>
-        		<child>{request_data.children}</child>
-        		<infant>{request_data.infants}</infant>
-    		</Header>
-    		<FlightSegment>
-    			<flight_id>{request_data.flight_id}</flight_id>
-    			<fare_id>{request_data.fare_id or ''}</fare_id>
-    			<origin_rcd>{request_data.origin}</origin_rcd>
-    			<destination_rcd>{request_data.destination}</destination_rcd>
-    		</FlightSegment>
-		</Booking>"""
-        
-        payload = f"""<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:tem="http://tempuri.org/">
-   <soapenv:Header/>
-   <soapenv:Body>
-      <tem:FlightAdd>
-         <tem:strXml>
-         <![CDATA[
-         {inner_xml}
-		]]>
-         </tem:strXml>
-      </tem:FlightAdd>
-   </soapenv:Body>
-</soapenv:Envelope>"""
-
-        cookies = self.session_store.get(search_id)
-        if not cookies:
+        payload = soap_builder.flight_add(
+            adults=request_data.adults,
+            children=request_data.children,
+            infants=request_data.infants,
+            flight_id=request_data.flight_id,
+            fare_id=request_data.fare_id,
+            origin=request_data.origin,
+            destination=request_data.destination,
+        )
+
+        if not await self.session_store.get_cookies(search_id):
              search_logger.warning(f"No cookies found for search_id={search_id} in FlightAdd. Session might be invalid.")
 
-        async with httpx.AsyncClient(cookies=cookies) as client:
-            try:
-                search_logger.info(f"Sending FlightAdd request to {self.url} for search_id={search_id} flight_id={request_data.flight_id}")
-                self.log_to_file(search_id, "FlightAdd_RQ.xml", payload)
-                
-                response = await client.post(self.url, headers=self.headers, content=payload, timeout=30.0)
-                response.raise_for_status()
-                
-                if response.cookies:
-                    self.session_store[search_id] = response.cookies
+        try:
+            search_logger.info(f"Sending FlightAdd request to {self.url} for search_id={search_id} flight_id={request_data.flight_id}")
+            self.log_to_file(search_id, "FlightAdd_RQ.xml", payload)
+            
+            response = await self._post("FlightAdd", search_id, payload)
 
-                search_logger.info(f"Received response from Yeti API FlightAdd: status={response.status_code}")
-                self.log_to_file(search_id, "FlightAdd_RS.xml", response.text)
-                return response.text
-            except httpx.HTTPError as e:
-                search_logger.error(f"Yeti API error in FlightAdd: {e}")
-                raise Exception(f"Yeti API error in FlightAdd: {e}")
+            search_logger.info(f"Received response from Yeti API FlightAdd: status={response.status_code}")
+            self.log_to_file(search_id, "FlightAdd_RS.xml", response.text)
+            return response.text
+        except httpx.HTTPError as e:
+            search_logger.error(f"Yeti API error in FlightAdd: {e}")
+            raise Exception(f"Yeti API error in FlightAdd: {e}")
 
     async def booking_get_session(self, search_id: str):
         search_logger = get_search_logger(search_id)
         
-        payload = """<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:tem="http://tempuri.org/">
-   <soapenv:Header/>
-   <soapenv:Body>
-      <tem:BookingGetSession/>
-   </soapenv:Body>
-</soapenv:Envelope>"""
-
-        cookies = self.session_store.get(search_id)
+        payload = soap_builder.booking_get_session()
 
-        async with httpx.AsyncClient(cookies=cookies) as client:
-            try:
-                search_logger.info(f"Sending BookingGetSession request to {self.url} for search_id={search_id}")
-                self.log_to_file(search_id, "BookingGetSession_RQ.xml", payload)
-                
-                response = await client.post(self.url, headers=self.headers, content=payload, timeout=30.0)
-                response.raise_for_status()
-                
-                if response.cookies:
-                    self.session_store[search_id] = response.cookies
+        try:
+            search_logger.info(f"Sending BookingGetSession request to {self.url} for search_id={search_id}")
+            self.log_to_file(search_id, "BookingGetSession_RQ.xml", payload)
+            
+            response = await self._post_idempotent("BookingGetSession", search_id, payload)
 
-                search_logger.info(f"Received response from Yeti API BookingGetSession: status={response.status_code}")
-                self.log_to_file(search_id, "BookingGetSession_RS.xml", response.text)
-                return response.text
-            except httpx.HTTPError as e:
-                search_logger.error(f"Yeti API error in BookingGetSession: {e}")
-                raise Exception(f"Yeti API error in BookingGetSession: {e}")
+            search_logger.info(f"Received response from Yeti API BookingGetSession: status={response.status_code}")
+            self.log_to_file(search_id, "BookingGetSession_RS.xml", response.text)
+            return response.text
+        except httpx.HTTPError as e:
+            search_logger.error(f"Yeti API error in BookingGetSession: {e}")
+            raise Exception(f"Yeti API error in BookingGetSession: {e}")
 
     async def booking_save(self, request_data, search_id: str):
         search_logger = get_search_logger(search_id)
         
-        passengers_xml = ""
-        for p in request_data.passengers:
-            passengers_xml += f"""
-                <Passenger>
-                    <passenger_id>{p.passenger_id}</passenger_id>
-                    <passenger_type_rcd>{p.passenger_type_rcd}</passenger_type_rcd>
-                    <lastname>{p.lastname}</lastname>
-                    <firstname>{p.firstname}</firstname>
-                    <gender_type_rcd>{p.gender_type_rcd}</gender_type_rcd>
-                    <nationality_rcd>{p.nationality_rcd}</nationality_rcd>
-                    <date_of_birth>{p.date_of_birth}</date_of_birth>
-                </Passenger>"""
-
-        inner_xml = f"""<Booking>
-                <BookingHeader>
-                    <contact_name>{request_data.booking_header.contact_name}</contact_name>
-                    <contact_email>{request_data.booking_header.contact_email}</contact_email>
-                    <phone_mobile>{request_data.booking_header.phone_mobile}</phone_mobile>
-                    <phone_home>{request_data.booking_header.phone_home or ''}</phone_home>
-                    <phone_business>{request_data.booking_header.phone_business or ''}</phone_business>
-                </BookingHeader>
-                {passengers_xml}
-                <Payment>
-                    <form_of_payment_rcd>{request_data.payment.form_of_payment_rcd}</form_of_payment_rcd>
-                    <currency_rcd>{request_data.payment.currency_rcd}</currency_rcd>
-                    <payment_amount>{request_data.payment.payment_amount}</payment_amount>
-                </Payment>
-            </Booking>"""
-        
-        payload = f"""<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:tem="http://tempuri.org/">
-   <soapenv:Header/>
-   <soapenv:Body>
-      <tem:BookingSave>
-         <tem:strXml>
-            <![CDATA[
-            {inner_xml}
-            ]]>
-         </tem:strXml>
-      </tem:BookingSave>
-   </soapenv:Body>
-</soapenv:Envelope>"""
-
-        cookies = self.session_store.get(search_id)
-
-        async with httpx.AsyncClient(cookies=cookies) as client:
-            try:
-                search_logger.info(f"Sending BookingSave request to {self.url} for search_id={search_id}")
-                self.log_to_file(search_id, "BookingSave_RQ.xml", payload)
-                
-                response = await client.post(self.url, headers=self.headers, content=payload, timeout=30.0)
-                response.raise_for_status()
-                
-                if response.cookies:
-                    self.session_store[search_id] = response.cookies
+        payload = soap_builder.booking_save(request_data)
+
+        try:
+            search_logger.info(f"Sending BookingSave request to {self.url} for search_id={search_id}")
+            self.log_to_file(search_id, "BookingSave_RQ.xml", payload)
+            
+            response = await self._post("BookingSave", search_id, payload)
 
-                search_logger.info(f"Received response from Yeti API BookingSave: status={response.status_code}")
-                self.log_to_file(search_id, "BookingSave_RS.xml", response.text)
-                return response.text
-            except httpx.HTTPError as e:
-                search_logger.error(f"Yeti API error in BookingSave: {e}")
-                raise Exception(f"Yeti API error in BookingSave: {e}")
+            search_logger.info(f"Received response from Yeti API BookingSave: status={response.status_code}")
+            self.log_to_file(search_id, "BookingSave_RS.xml", response.text)
+            return response.text
+        except httpx.HTTPError as e:
+            search_logger.error(f"Yeti API error in BookingSave: {e}")
+            raise Exception(f"Yeti API error in BookingSave: {e}")
 
     async def booking_get_itinerary(self, pnr: str, search_id: str):
         search_logger = get_search_logger(search_id)
         
-        payload = f"""<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:tem="http://tempuri.org/">
-   <soapenv:Header/>
-   <soapenv:Body>
-      <tem:BookingGetItinerary>
-         <tem:strRecordLocator>{pnr}</tem:strRecordLocator>
-      </tem:BookingGetItinerary>
-   </soapenv:Body>
-</soapenv:Envelope>"""
-
-        cookies = self.session_store.get(search_id)
-
-        async with httpx.AsyncClient(cookies=cookies) as client:
-            try:
-                search_logger.info(f"Sending BookingGetItinerary request to {self.url} for search_id={search_id} pnr={pnr}")
-                self.log_to_file(search_id, "BookingGetItinerary_RQ.xml", payload)
-                
-                response = await client.post(self.url, headers=self.headers, content=payload, timeout=30.0)
-                response.raise_for_status()
+        payload = soap_builder.booking_get_itinerary(pnr=pnr)
 
-                if response.cookies:
-                    self.session_store[search_id] = response.cookies
+        try:
+            search_logger.info(f"Sending BookingGetItinerary request to {self.url} for search_id={search_id} pnr={pnr}")
+            self.log_to_file(search_id, "BookingGetItinerary_RQ.xml", payload)
+            
+            response = await self._post_idempotent("BookingGetItinerary", search_id, payload)
 
-                search_logger.info(f"Received response from Yeti API BookingGetItinerary: status={response.status_code}")
-                self.log_to_file(search_id, "BookingGetItinerary_RS.xml", response.text)
-                return response.text
-            except httpx.HTTPError as e:
-                search_logger.error(f"Yeti API error in BookingGetItinerary: {e}")
-                raise Exception(f"Yeti API error in BookingGetItinerary: {e}")
+            search_logger.info(f"Received response from Yeti API BookingGetItinerary: status={response.status_code}")
+            self.log_to_file(search_id, "BookingGetItinerary_RS.xml", response.text)
+            return response.text
+        except httpx.HTTPError as e:
+            search_logger.error(f"Yeti API error in BookingGetItinerary: {e}")
+            raise Exception(f"Yeti API error in BookingGetItinerary: {e}")
 
 yeti_client = YetiClient()
@@ -1,45 +1,195 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+from sqlalchemy import delete, insert, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Type, TypeVar, Generic, List, Optional
+from typing import Any, AsyncIterator, Dict, Type, TypeVar, Generic, List, Optional, Sequence, Tuple
 from src.models.base_model import BaseModel
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
+# Keyset cursor: the last id, or (last order_by value, last id) when ordering by another column
+Cursor = Any
+
 class BaseRepository(Generic[ModelType]):
-    def __init__(self, model: Type[ModelType], session: AsyncSession):
+    """
+    CRUD for one model on an AsyncSession.
+
+    Writes commit immediately by default. Inside `unit_of_work()` they only
+    flush, and the whole block commits (or rolls back) once at the end.
+
+    Reads (get, get_all, get_page) go to `read_session` when one is given,
+    e.g. from ReadSessionLocal, except inside a unit of work, where they must
+    see its own writes.
+    """
+
+    def __init__(
+        self,
+        model: Type[ModelType],
+        session: AsyncSession,
+        autocommit: bool = True,
+        read_session: Optional[AsyncSession] = None,
+    ):
         self.model = model
         self.session = session
+        self.autocommit = autocommit
+        self.read_session = read_session
+
+    @property
+    def _reader(self) -> AsyncSession:
+        if self.read_session is None or not self.autocommit:
+            return self.session
+        return self.read_session
+
+    async def _commit(self) -> None:
+        if self.autocommit:
+            await self.session.commit()
+        else:
+            await self.session.flush()
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator["BaseRepository[ModelType]"]:
+        """Batch every write in the block into one transaction."""
+        previous, self.autocommit = self.autocommit, False
+        try:
+            yield self
+            await self.session.commit()
+        except BaseException:
+            await self.session.rollback()
+            raise
+        finally:
+            self.autocommit = previous
 
     async def get(self, id: int) -> Optional[ModelType]:
         query = select(self.model).where(self.model.id == id)
-        result = await self.session.execute(query)
+        result = await self._reader.execute(query)
         return result.scalars().first()
 
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        # OFFSET scans the skipped rows; use get_page on large tables
         query = select(self.model).offset(skip).limit(limit)
-        result = await self.session.execute(query)
+        result = await self._reader.execute(query)
         return result.scalars().all()
 
+    async def get_page(
+        self,
+        *where,
+        after: Cursor = None,
+        limit: int = 100,
+        order_by=None,
+        descending: bool = False,
+    ) -> Tuple[List[ModelType], Cursor]:
+        """
+        Keyset pagination: the rows after `after` and the cursor for the next
+        page (None when this is the last one).
+
+        Ordered by id, or by (order_by, id) so the cursor stays unique; an
+        index on the same columns keeps every page an index range scan.
+        """
+        id_column = self.model.id
+        if order_by is None:
+            key = id_column
+            ordering = [id_column.desc() if descending else id_column]
+        else:
+            key = tuple_(order_by, id_column)
+            ordering = [order_by.desc(), id_column.desc()] if descending else [order_by, id_column]
+
+        query = select(self.model).where(*where).order_by(*ordering).limit(limit)
+        if after is not None:
+            bound = tuple_(*after) if order_by is not None else after
+            query = query.where(key < bound if descending else key > bound)
+
+        items = (await self._reader.execute(query)).scalars().all()
+        if len(items) < limit:
+            return items, None
+        last = items[-1]
+        cursor = last.id if order_by is None else (getattr(last, order_by.key), last.id)
+        return items, cursor
+
+    async def iter_batches(self, *where, batch_size: int = 1000, **page_options) -> AsyncIterator[List[ModelType]]:
+        """Walk every matching row in keyset pages of `batch_size`."""
+        cursor = None
+        while True:
+            items, cursor = await self.get_page(*where, after=cursor, limit=batch_size, **page_options)
+            if items:
+                yield items
+            if cursor is None:
+                return
+
     async def create(self, **kwargs) -> ModelType:
         item = self.model(**kwargs)
         self.session.add(item)
-        await self.session.commit()
+        await self._commit()
         await self.session.refresh(item)
         return item
 
+    async def create_many(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """Insert rows (dicts of column values) in one executemany; returns the count."""
+        if not rows:
+            return 0
+        await self.session.execute(insert(self.model), list(rows))
+        await self._commit()
+        return len(rows)
+
+    async def upsert_many(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+    ) -> int:
+        """
+        INSERT ... ON CONFLICT (conflict_columns) DO UPDATE for many rows.
+
+        `update_columns` defaults to every supplied column outside the conflict
+        target; with an empty list, conflicting rows are left as they are.
+        conflict_columns must match a unique index.
+        """
+        if not rows:
+            return 0
+        statement = pg_insert(self.model)
+        if update_columns is None:
+            update_columns = [c for c in rows[0] if c not in conflict_columns and c != "id"]
+        if update_columns:
+            values = {c: statement.excluded[c] for c in update_columns}
+            if "updated_at" not in values:
+                values["updated_at"] = datetime.utcnow()
+            statement = statement.on_conflict_do_update(index_elements=list(conflict_columns), set_=values)
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=list(conflict_columns))
+        await self.session.execute(statement, list(rows))
+        await self._commit()
+        return len(rows)
+
     async def update(self, id: int, **kwargs) -> Optional[ModelType]:
-        item = await self.get(id)
-        if item:
-            for key, value in kwargs.items():
-                setattr(item, key, value)
-            await self.session.commit()
-            await self.session.refresh(item)
+        query = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**kwargs)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        item = (await self.session.execute(query)).scalars().first()
+        await self._commit()
         return item
 
+    async def update_where(self, *where, **values) -> int:
+        """UPDATE every row matching `where` in one statement; returns the row count."""
+        if not where:
+            raise ValueError("update_where needs at least one condition")
+        query = update(self.model).where(*where).values(**values).execution_options(synchronize_session=False)
+        result = await self.session.execute(query)
+        await self._commit()
+        return result.rowcount
+
     async def delete(self, id: int) -> bool:
-        item = await self.get(id)
-        if item:
-            await self.session.delete(item)
-            await self.session.commit()
-            return True
-        return False
+        return await self.delete_where(self.model.id == id) > 0
+
+    async def delete_where(self, *where) -> int:
+        """DELETE every row matching `where` in one statement; returns the row count."""
+        if not where:
+            raise ValueError("delete_where needs at least one condition")
+        query = delete(self.model).where(*where).execution_options(synchronize_session=False)
+        result = await self.session.execute(query)
+        await self._commit()
+        return result.rowcount
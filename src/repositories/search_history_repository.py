@@ -0,0 +1,61 @@
+from typing import Any, List, Sequence, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.search_model import Search, FlightOffer
+from src.repositories.repository import BaseRepository
+
+SEARCH_COLUMNS = (
+    "id", "created_at", "updated_at", "search_id", "origin", "destination", "depart_date",
+    "return_date", "adults", "children", "infants", "offer_count", "searched_at",
+)
+OFFER_COLUMNS = (
+    "search_row_id", "created_at", "updated_at", "direction", "flight_id", "fare_id", "airline",
+    "flight_number", "origin", "destination", "departure_date", "departure_time", "arrival_time",
+    "booking_class", "fare_code", "currency", "adult_fare", "total_adult_fare", "tax_amount",
+    "seats_available", "refundable", "searched_at",
+)
+
+# (search row without its leading id, offer rows without their leading search_row_id)
+SearchRows = Tuple[Tuple[Any, ...], List[Tuple[Any, ...]]]
+
+
+class SearchHistoryRepository(BaseRepository[Search]):
+    """
+    Bulk writes of searches and their flight offers with COPY.
+
+    Rows are tuples in SEARCH_COLUMNS / OFFER_COLUMNS order; search ids are
+    reserved from the sequence up front so the offers can reference them.
+    Runs inside the session's transaction; the caller commits.
+    """
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(Search, session)
+
+    async def _reserve_ids(self, count: int) -> List[int]:
+        result = await self.session.execute(
+            text("SELECT nextval(pg_get_serial_sequence('searches', 'id')) FROM generate_series(1, :n)"),
+            {"n": count},
+        )
+        return [row[0] for row in result]
+
+    async def _copy(self, table: str, columns: Sequence[str], records: List[Tuple[Any, ...]]) -> None:
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        # asyncpg's binary COPY on the connection (and transaction) the session holds
+        await raw.driver_connection.copy_records_to_table(table, records=records, columns=list(columns))
+
+    async def copy_searches(self, searches: List[SearchRows]) -> Tuple[int, int]:
+        """COPY searches and their offers; returns (searches, offers) written."""
+        if not searches:
+            return 0, 0
+        ids = await self._reserve_ids(len(searches))
+        search_records = []
+        offer_records = []
+        for row_id, (search_row, offers) in zip(ids, searches):
+            search_records.append((row_id, *search_row))
+            offer_records.extend((row_id, *offer) for offer in offers)
+
+        await self._copy(Search.__tablename__, SEARCH_COLUMNS, search_records)
+        if offer_records:
+            await self._copy(FlightOffer.__tablename__, OFFER_COLUMNS, offer_records)
+        return len(search_records), len(offer_records)
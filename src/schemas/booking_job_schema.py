@@ -0,0 +1,16 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+# queued -> running -> succeeded | failed | unknown (Yeti may or may not have saved it)
+BookingJobStatus = Literal["queued", "running", "succeeded", "failed", "unknown"]
+
+class BookingJobResponse(BaseModel):
+    job_id: str
+    search_id: str
+    status: BookingJobStatus
+    created_at: datetime
+    updated_at: datetime
+    pnr: Optional[str] = None
+    raw_response: Optional[str] = None
+    error: Optional[str] = None
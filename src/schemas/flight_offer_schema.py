@@ -0,0 +1,50 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+
+
+class FareSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    fare_id: str
+    booking_class: Optional[str] = None
+    boarding_class: Optional[str] = None
+    fare_code: Optional[str] = None
+    currency: Optional[str] = None
+    adult_fare: Optional[float] = None
+    child_fare: Optional[float] = None
+    infant_fare: Optional[float] = None
+    total_adult_fare: Optional[float] = None
+    tax_amount: Optional[float] = None
+    seats_available: Optional[int] = None
+    refundable: Optional[bool] = None
+
+
+class SegmentSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    airline: Optional[str] = None
+    flight_number: Optional[str] = None
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    departure_date: Optional[str] = None
+    departure_time: Optional[str] = None
+    arrival_time: Optional[str] = None
+    aircraft: Optional[str] = None
+
+
+class FlightSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    flight_id: str
+    direction: str
+    segments: List[SegmentSchema]
+    fares: List[FareSchema]
+
+
+class DateAvailabilitySchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    date: str
+    lowest_fare: Optional[float] = None
+    flights: List[FlightSchema]
+    error: Optional[str] = None
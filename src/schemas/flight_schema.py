@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
+from src.schemas.flight_offer_schema import DateAvailabilitySchema, FlightSchema
 
 class FlightAvailabilityRequest(BaseModel):
     origin: str
@@ -11,7 +12,38 @@ class FlightAvailabilityRequest(BaseModel):
     infants: int = 0
     others: int = 0
     nationality: str = "NP"
+    # Flexible-date search: +/- flex_days around depart_date, or depart_date..depart_date_to
+    flex_days: int = Field(0, ge=0, le=7)
+    depart_date_to: Optional[str] = None
+
+    @property
+    def is_flexible(self) -> bool:
+        # "string" is the Swagger UI placeholder, treated as unset like elsewhere
+        has_range_end = bool(self.depart_date_to) and self.depart_date_to.lower() != "string"
+        return self.flex_days > 0 or has_range_end
 
 class FlightAvailabilityResponse(BaseModel):
     search_id: str
     data: Optional[dict] = None
+    # Populated instead of `data` for the compact view
+    flights: Optional[List[FlightSchema]] = None
+    # Populated for flexible-date searches, one entry per departure date
+    dates: Optional[List[DateAvailabilitySchema]] = None
+
+class BatchAvailabilityRequest(BaseModel):
+    requests: List[FlightAvailabilityRequest] = Field(..., min_length=1)
+
+class RouteAvailabilityResult(BaseModel):
+    """Outcome for one route of a batch; `error` is set when it failed."""
+    origin: str
+    destination: str
+    depart_date: str
+    success: bool
+    data: Optional[dict] = None
+    flights: Optional[List[FlightSchema]] = None
+    dates: Optional[List[DateAvailabilitySchema]] = None
+    error: Optional[str] = None
+
+class BatchAvailabilityResponse(BaseModel):
+    search_id: str
+    results: List[RouteAvailabilityResult]
@@ -0,0 +1,64 @@
+"""Service for asynchronous BookingSave jobs."""
+import uuid
+from typing import Any, Dict, Optional
+
+import aio_pika
+
+from src.config import settings
+from src.exceptions.validation_exception import ServiceUnavailableException
+from src.logger import get_search_logger
+from src.modules.booking_job_store import BookingJobStore
+from src.modules.rabbitmq_client import RabbitMQClient
+from src.schemas.booking_save_schema import BookingSaveRequest
+
+
+async def declare_booking_queue(channel: aio_pika.abc.AbstractChannel) -> aio_pika.abc.AbstractQueue:
+    """The durable work queue shared by the API (publisher) and the booking workers."""
+    return await channel.declare_queue(settings.BOOKING_QUEUE_NAME, durable=True)
+
+
+class BookingJobService:
+    """
+    Queues validated BookingSave requests for the booking workers and reads
+    back their state.
+
+    A job is recorded as queued before it is published; publishing waits for
+    the broker's confirm, so an accepted job survives a broker restart.
+    """
+
+    def __init__(self, store: Optional[BookingJobStore] = None, rabbitmq: Optional[RabbitMQClient] = None):
+        self._store = store or BookingJobStore()
+        self._rabbitmq = rabbitmq or RabbitMQClient()
+        self._queue_declared = False
+
+    async def submit(self, request: BookingSaveRequest) -> Dict[str, Any]:
+        """Record and enqueue a booking; returns the queued job."""
+        job_id = str(uuid.uuid4())
+        job = await self._store.create(job_id, request.search_id)
+        try:
+            channel = await self._rabbitmq.get_channel()
+            if not self._queue_declared:
+                await declare_booking_queue(channel)
+                self._queue_declared = True
+            await channel.default_exchange.publish(
+                aio_pika.Message(
+                    body=request.model_dump_json().encode(),
+                    message_id=job_id,
+                    content_type="application/json",
+                    delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                ),
+                routing_key=settings.BOOKING_QUEUE_NAME,
+            )
+        except Exception as e:
+            get_search_logger(request.search_id).error(f"Could not queue booking job {job_id}: {e}")
+            await self._store.update(job_id, "failed", error="Booking queue unavailable; the booking was not sent")
+            raise ServiceUnavailableException("Booking queue is unavailable", details={"job_id": job_id})
+
+        get_search_logger(request.search_id).info(f"Queued booking job {job_id}")
+        return job
+
+    async def get(self, job_id: str, wait: float = 0) -> Optional[Dict[str, Any]]:
+        """A job's state, waiting up to `wait` seconds for it to finish."""
+        if wait > 0:
+            return await self._store.wait(job_id, min(wait, settings.BOOKING_JOB_MAX_WAIT))
+        return await self._store.get(job_id)
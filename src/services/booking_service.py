@@ -1,15 +1,30 @@
 """Service for booking operations."""
+import asyncio
+import time
+from typing import Optional, Set
+
 from src.dtos.booking_dto import BookingSessionDTO, BookingSaveDTO, ItineraryDTO
 from src.dtos.flight_dto import ServiceResponseDTO
+from src.logger import get_search_logger
 from src.modules.yeti_client import yeti_client
+from src.modules.single_flight import SingleFlight
 from src.schemas.booking_session_schema import BookingSessionRequest
 from src.schemas.booking_save_schema import BookingSaveRequest
 from src.schemas.itinerary_schema import ItineraryRequest
+from src.services.caches.itinerary_cache import ItineraryCache, normalize_pnr
+from src.utils.xml_parser import extract_record_locator
 
 
 class BookingService:
     """Handles booking-related operations with single responsibility."""
     
+    def __init__(self, itinerary_cache: Optional[ItineraryCache] = None):
+        self._itinerary_cache = itinerary_cache
+        # Itinerary lookups are read-only, so concurrent polls for one PNR within one
+        # Yeti session can share a call (see _flight_key)
+        self._itinerary_flight = SingleFlight("itinerary")
+        self._warm_tasks: Set[asyncio.Task] = set()
+    
     async def get_session(self, request: BookingSessionRequest) -> ServiceResponseDTO:
         """Get booking session."""
         raw_response = await yeti_client.booking_get_session(request.search_id)
@@ -20,22 +35,69 @@ class BookingService:
         )
     
     async def save_booking(self, request: BookingSaveRequest) -> ServiceResponseDTO:
-        """Save booking."""
+        """Save booking, then invalidate and re-warm the cached itinerary for its PNR."""
         raw_response = await yeti_client.booking_save(request, request.search_id)
+
+        pnr = extract_record_locator(raw_response)
+        if pnr and self._itinerary_cache:
+            await self._itinerary_cache.invalidate(pnr)
+            self._schedule_warm(pnr, request.search_id)
         
         return ServiceResponseDTO(
             search_id=request.search_id,
             raw_response=raw_response
         )
     
-    async def get_itinerary(self, request: ItineraryRequest) -> ServiceResponseDTO:
-        """Get booking itinerary."""
-        raw_response = await yeti_client.booking_get_itinerary(
-            request.pnr, 
-            request.search_id
-        )
+    async def get_itinerary(self, request: ItineraryRequest, force_refresh: bool = False) -> ServiceResponseDTO:
+        """
+        Get booking itinerary, from the cache unless `force_refresh` is set.
+        A forced refresh still updates the cache for other readers.
+        """
+        pnr = normalize_pnr(request.pnr)
+        raw_response = None
+        if self._itinerary_cache and not force_refresh:
+            raw_response = await self._itinerary_cache.get(pnr)
+            if raw_response is not None:
+                get_search_logger(request.search_id).info(f"Serving itinerary for pnr={pnr} from cache")
+
+        if raw_response is None:
+            raw_response = await self._itinerary_flight.do(
+                self._flight_key(pnr, request.search_id),
+                lambda: self._fetch_itinerary(pnr, request.search_id)
+            )
         
         return ServiceResponseDTO(
             search_id=request.search_id,
             raw_response=raw_response
         )
+
+    @staticmethod
+    def _flight_key(pnr: str, search_id: str) -> str:
+        # The call carries the search's session cookies and is audited under its
+        # search_id, so callers from another session must not share it
+        return f"{search_id}:{pnr}"
+
+    async def _fetch_itinerary(self, pnr: str, search_id: str) -> str:
+        """Call BookingGetItinerary and cache the answer if it is this PNR's booking."""
+        fetched_at = time.time()
+        raw_response = await yeti_client.booking_get_itinerary(pnr, search_id)
+        # Error payloads carry no record locator and must not be cached
+        if self._itinerary_cache and extract_record_locator(raw_response) == pnr:
+            await self._itinerary_cache.set(pnr, raw_response, fetched_at)
+        return raw_response
+
+    def _schedule_warm(self, pnr: str, search_id: str) -> None:
+        task = asyncio.create_task(self._warm(pnr, search_id))
+        # Hold a reference until done so the task isn't garbage collected mid-flight
+        self._warm_tasks.add(task)
+        task.add_done_callback(self._warm_tasks.discard)
+
+    async def _warm(self, pnr: str, search_id: str) -> None:
+        """Fetch the fresh itinerary after a save so the first post-booking poll is a hit."""
+        try:
+            await self._itinerary_flight.do(
+                self._flight_key(pnr, search_id),
+                lambda: self._fetch_itinerary(pnr, search_id)
+            )
+        except Exception as e:
+            get_search_logger(search_id).warning(f"Itinerary cache warm-up failed for pnr={pnr}: {e}")
@@ -0,0 +1 @@
+"""Response caches implementation."""
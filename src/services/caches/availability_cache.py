@@ -0,0 +1,136 @@
+"""Redis-backed availability cache with stale-while-revalidate."""
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from src.config import settings
+from src.logger import logger
+from src.modules import metrics
+from src.modules.redis_client import RedisClient
+from src.utils.cache_keys import availability_key
+
+
+@dataclass
+class CachedAvailability:
+    """A cached parsed availability result."""
+    data: Dict[str, Any]
+    age: float
+    is_stale: bool
+
+
+class AvailabilityCache:
+    """
+    Caches parsed FlightAvailability results keyed on the normalized request.
+
+    Entries are fresh for `ttl` seconds and may then be served stale for a
+    further `stale_ttl` seconds while a single caller refreshes them.
+    Redis failures are logged and treated as misses.
+    """
+
+    KEY_PREFIX = "yetiair:availability:"
+    LOCK_PREFIX = "yetiair:availability:refresh:"
+
+    def __init__(
+        self,
+        redis_client: Optional[RedisClient] = None,
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+    ):
+        self._redis = redis_client or RedisClient()
+        self.ttl = settings.AVAILABILITY_CACHE_TTL if ttl is None else ttl
+        self.stale_ttl = settings.AVAILABILITY_CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _key(self, request) -> str:
+        return f"{self.KEY_PREFIX}{availability_key(request)}"
+
+    async def get(self, request) -> Optional[CachedAvailability]:
+        """Return the cached result for this request, or None on a miss."""
+        try:
+            client = await self._redis.get_client()
+            raw = await client.get(self._key(request))
+        except Exception as e:
+            self.errors += 1
+            self._record_lookup("miss")
+            logger.warning(f"Availability cache read failed: {e}")
+            return None
+
+        if raw is None:
+            self._record_lookup("miss")
+            return None
+
+        try:
+            entry = json.loads(raw)
+            age = time.time() - entry["stored_at"]
+            data = entry["data"]
+        except (ValueError, TypeError, KeyError) as e:
+            # A corrupt or foreign entry is overwritten by the next fetch
+            self.errors += 1
+            self._record_lookup("miss")
+            logger.warning(f"Availability cache entry unreadable, treating as a miss: {e}")
+            return None
+
+        if age > self.ttl + self.stale_ttl:
+            self._record_lookup("miss")
+            return None
+
+        is_stale = age > self.ttl
+        self._record_lookup("stale_hit" if is_stale else "hit")
+        return CachedAvailability(data=data, age=age, is_stale=is_stale)
+
+    def _record_lookup(self, result: str) -> None:
+        if result == "hit":
+            self.hits += 1
+        elif result == "stale_hit":
+            self.stale_hits += 1
+        else:
+            self.misses += 1
+        metrics.record_cache_lookup("availability", result)
+
+    async def set(self, request, data: Dict[str, Any]) -> None:
+        """Store a parsed result for the fresh and stale windows combined."""
+        payload = json.dumps({"stored_at": time.time(), "data": data}, separators=(",", ":"))
+        try:
+            client = await self._redis.get_client()
+            await client.set(self._key(request), payload, ex=self.ttl + self.stale_ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Availability cache write failed: {e}")
+
+    def _lock_key(self, request) -> str:
+        return f"{self.LOCK_PREFIX}{availability_key(request)}"
+
+    async def acquire_refresh(self, request) -> bool:
+        """Claim the right to refresh a stale entry so only one worker revalidates it."""
+        try:
+            client = await self._redis.get_client()
+            return bool(await client.set(self._lock_key(request), "1", nx=True, ex=max(self.ttl, 1)))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Availability cache refresh lock failed: {e}")
+            return False
+
+    async def release_refresh(self, request) -> None:
+        """Drop the refresh claim once the refresh is done, so a failed one can be retried."""
+        try:
+            client = await self._redis.get_client()
+            await client.delete(self._lock_key(request))
+        except Exception as e:
+            # The claim still expires on its own after `ttl`
+            self.errors += 1
+            logger.warning(f"Availability cache refresh unlock failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,131 @@
+"""Redis-backed BookingGetItinerary cache keyed by PNR."""
+import json
+import time
+from typing import Any, Dict, Optional
+
+from redis.exceptions import WatchError
+
+from src.config import settings
+from src.logger import logger
+from src.modules import metrics
+from src.modules.redis_client import RedisClient
+
+
+def normalize_pnr(pnr: str) -> str:
+    return pnr.strip().upper()
+
+
+class ItineraryCache:
+    """
+    Caches raw itinerary responses per PNR for a short `ttl`.
+
+    `invalidate` deletes the entry and leaves a tombstone with the time of
+    the change, so an itinerary fetch that started before a booking was
+    modified cannot put the old itinerary back afterwards. Redis failures
+    are logged and treated as misses.
+    """
+
+    KEY_PREFIX = "yetiair:itinerary:"
+
+    def __init__(self, redis_client: Optional[RedisClient] = None, ttl: Optional[int] = None):
+        self._redis = redis_client or RedisClient()
+        self.ttl = ttl or settings.ITINERARY_CACHE_TTL
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def _keys(self, pnr: str):
+        base = f"{self.KEY_PREFIX}{normalize_pnr(pnr)}"
+        return base, f"{base}:invalidated_at"
+
+    async def get(self, pnr: str) -> Optional[str]:
+        """Return the cached raw itinerary for a PNR, or None on a miss."""
+        entry_key, _ = self._keys(pnr)
+        try:
+            client = await self._redis.get_client()
+            raw = await client.get(entry_key)
+        except Exception as e:
+            self.errors += 1
+            self._record_lookup("miss")
+            logger.warning(f"Itinerary cache read failed: {e}")
+            return None
+
+        if raw is None:
+            self._record_lookup("miss")
+            return None
+
+        try:
+            raw_response = json.loads(raw)["raw_response"]
+        except (ValueError, TypeError, KeyError) as e:
+            # A corrupt or old-format entry; drop it so the next fetch replaces it
+            self.errors += 1
+            self._record_lookup("miss")
+            logger.warning(f"Itinerary cache entry unreadable, treating as a miss: {e}")
+            try:
+                await client.delete(entry_key)
+            except Exception:
+                pass
+            return None
+
+        self._record_lookup("hit")
+        return raw_response
+
+    def _record_lookup(self, result: str) -> None:
+        if result == "hit":
+            self.hits += 1
+        else:
+            self.misses += 1
+        metrics.record_cache_lookup("itinerary", result)
+
+    async def set(self, pnr: str, raw_response: str, fetched_at: float) -> None:
+        """
+        Store an itinerary fetched at `fetched_at` (time.time() when the
+        upstream call started), unless the booking changed after that.
+        The tombstone is WATCHed, so an invalidation that lands between the
+        check and the write aborts the write.
+        """
+        entry_key, tombstone_key = self._keys(pnr)
+        payload = json.dumps({"fetched_at": fetched_at, "raw_response": raw_response})
+        try:
+            client = await self._redis.get_client()
+            async with client.pipeline(transaction=True) as pipe:
+                await pipe.watch(tombstone_key)
+                invalidated_at = await pipe.get(tombstone_key)
+                if invalidated_at is not None and float(invalidated_at) >= fetched_at:
+                    return
+                pipe.multi()
+                pipe.set(entry_key, payload, ex=self.ttl)
+                await pipe.execute()
+        except WatchError:
+            # Invalidated while we were writing; the fetched itinerary may be stale
+            return
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Itinerary cache write failed: {e}")
+
+    async def invalidate(self, pnr: str) -> None:
+        """Drop a PNR's itinerary after its booking was modified."""
+        entry_key, tombstone_key = self._keys(pnr)
+        self.invalidations += 1
+        try:
+            client = await self._redis.get_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.delete(entry_key)
+                # Outlives any fetch that could still be in flight
+                pipe.set(tombstone_key, repr(time.time()), ex=int(max(self.ttl, settings.YETI_HTTP_TIMEOUT) * 2))
+                await pipe.execute()
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Itinerary cache invalidation failed for {pnr}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,144 @@
+"""Service for flexible-date (date range) availability searches."""
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from src.config import settings
+from src.dtos.flight_offer_dto import DateAvailabilityDTO, FlightDTO
+from src.exceptions.validation_exception import ValidationException
+from src.logger import get_search_logger
+from src.schemas.flight_schema import FlightAvailabilityRequest
+from src.services.flight_availability_service import FlightAvailabilityService, is_parse_failure
+from src.utils.flight_normalizer import normalize_availability
+
+DATE_FORMAT = "%Y%m%d"
+
+
+def _parse_date(value: str, field: str) -> date:
+    try:
+        return datetime.strptime(value.replace('-', ''), DATE_FORMAT).date()
+    except (AttributeError, ValueError):
+        raise ValidationException(f"{field} must be a date in YYYYMMDD format", details={field: value})
+
+
+def date_window(request: FlightAvailabilityRequest) -> List[date]:
+    """Departure dates covered by a flexible request, in order."""
+    center = _parse_date(request.depart_date, "depart_date")
+    if request.flex_days:
+        start = center - timedelta(days=request.flex_days)
+        end = center + timedelta(days=request.flex_days)
+    else:
+        start = center
+        end = _parse_date(request.depart_date_to, "depart_date_to")
+    if end < start:
+        raise ValidationException("depart_date_to must not be before depart_date")
+
+    days = (end - start).days + 1
+    if days > settings.FLEX_SEARCH_MAX_DAYS:
+        raise ValidationException(
+            f"Date range covers {days} days; at most {settings.FLEX_SEARCH_MAX_DAYS} are allowed"
+        )
+    return [start + timedelta(days=i) for i in range(days)]
+
+
+class FlexibleAvailabilityService:
+    """
+    Answers a date-range search and groups the flights by departure date.
+
+    When Yeti honours strDepartFrom/strDepartTo the whole range is one
+    upstream call; otherwise each day is searched separately, at most
+    `concurrency` at a time. Either way the calls go through the regular
+    availability service, so they are cached and coalesced like any other
+    search.
+    """
+
+    def __init__(
+        self,
+        availability_service: FlightAvailabilityService,
+        supports_range: Optional[bool] = None,
+        concurrency: Optional[int] = None
+    ):
+        self._availability_service = availability_service
+        self._supports_range = settings.YETI_SUPPORTS_DATE_RANGE if supports_range is None else supports_range
+        self._concurrency = concurrency or settings.FLEX_SEARCH_CONCURRENCY
+
+    async def search(self, request: FlightAvailabilityRequest, search_id: str) -> List[DateAvailabilityDTO]:
+        """Search every departure date in the request's window."""
+        days = date_window(request)
+        get_search_logger(search_id).info(
+            f"Flexible availability search {days[0]:%Y%m%d}..{days[-1]:%Y%m%d} "
+            f"({len(days)} days, {'native range' if self._supports_range else 'per-day fan-out'})"
+        )
+        if self._supports_range:
+            return await self._search_range(request, days, search_id)
+        return await self._search_per_day(request, days, search_id)
+
+    def _day_request(self, request: FlightAvailabilityRequest, start: date, end: Optional[date] = None):
+        return request.model_copy(update={
+            "depart_date": start.strftime(DATE_FORMAT),
+            "depart_date_to": end.strftime(DATE_FORMAT) if end else None,
+            "flex_days": 0,
+        })
+
+    async def _search_range(
+        self,
+        request: FlightAvailabilityRequest,
+        days: List[date],
+        search_id: str
+    ) -> List[DateAvailabilityDTO]:
+        dto = await self._availability_service.check_availability(
+            self._day_request(request, days[0], days[-1]), search_id
+        )
+        if is_parse_failure(dto.data):
+            raise Exception(f"Unparseable availability response: {dto.data['error']}")
+
+        by_date: Dict[str, DateAvailabilityDTO] = {
+            day.strftime(DATE_FORMAT): DateAvailabilityDTO(date=day.strftime(DATE_FORMAT)) for day in days
+        }
+        for flight in normalize_availability(dto.data):
+            flight_date = self._departure_date(flight) or days[0].strftime(DATE_FORMAT)
+            by_date.setdefault(flight_date, DateAvailabilityDTO(date=flight_date)).flights.append(flight)
+        return [by_date[key] for key in sorted(by_date)]
+
+    async def _search_per_day(
+        self,
+        request: FlightAvailabilityRequest,
+        days: List[date],
+        search_id: str
+    ) -> List[DateAvailabilityDTO]:
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def search_day(day: date):
+            async with semaphore:
+                return await self._availability_service.check_availability(
+                    self._day_request(request, day), search_id
+                )
+
+        results = await asyncio.gather(*(search_day(day) for day in days), return_exceptions=True)
+
+        # Let cancellation through; a failed day is reported on its own entry
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+        if all(isinstance(result, Exception) for result in results):
+            raise results[0]
+
+        search_logger = get_search_logger(search_id)
+        grouped = []
+        for day, result in zip(days, results):
+            entry = DateAvailabilityDTO(date=day.strftime(DATE_FORMAT))
+            if isinstance(result, Exception):
+                search_logger.warning(f"Availability for {entry.date} failed: {result}")
+                entry.error = str(result)
+            elif is_parse_failure(result.data):
+                entry.error = result.data["error"]
+            else:
+                entry.flights = normalize_availability(result.data)
+            grouped.append(entry)
+        return grouped
+
+    @staticmethod
+    def _departure_date(flight: FlightDTO) -> Optional[str]:
+        if not flight.segments or not flight.segments[0].departure_date:
+            return None
+        return flight.segments[0].departure_date.replace('-', '')[:8]
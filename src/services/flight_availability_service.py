@@ -1,41 +1,114 @@
 """Service for flight availability operations."""
+import asyncio
+from typing import Any, Dict, Optional, Set
+
 from src.dtos.flight_dto import FlightAvailabilityDTO, ServiceResponseDTO
+from src.logger import get_search_logger
 from src.modules.yeti_client import yeti_client
+from src.modules.single_flight import SingleFlight
+from src.modules.search_history_writer import SearchHistoryWriter
 from src.services.interfaces.response_parser import IResponseParser
 from src.services.interfaces.response_logger import IResponseLogger
+from src.services.caches.availability_cache import AvailabilityCache
 from src.schemas.flight_schema import FlightAvailabilityRequest
+from src.utils.cache_keys import availability_key
+
+
+def is_parse_failure(data: Any) -> bool:
+    """Parse failures come back from the parsers as {"raw_response", "error"}."""
+    return isinstance(data, dict) and "raw_response" in data and "error" in data
 
 
 class FlightAvailabilityService:
     """Handles flight availability checks with single responsibility."""
-    
-    def __init__(self, parser: IResponseParser, logger: IResponseLogger):
+
+    def __init__(
+        self,
+        parser: IResponseParser,
+        logger: IResponseLogger,
+        cache: Optional[AvailabilityCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        history: Optional[SearchHistoryWriter] = None
+    ):
         self._parser = parser
         self._logger = logger
-    
+        self._cache = cache
+        self._history = history
+        self._single_flight = single_flight or SingleFlight("availability")
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
     async def check_availability(
-        self, 
-        request: FlightAvailabilityRequest, 
+        self,
+        request: FlightAvailabilityRequest,
         search_id: str
     ) -> ServiceResponseDTO:
-        """Check flight availability."""
-        # Get raw response from external service
-        raw_response = await yeti_client.get_flight_availability(request, search_id)
-        
-        # Parse response
-        parsed_data = self._parser.parse(raw_response)
-        
+        """Check flight availability, serving from cache when possible."""
+        cached = await self._cache.get(request) if self._cache else None
+
+        if cached is not None:
+            get_search_logger(search_id).info(
+                f"Serving flight availability from cache (age={cached.age:.1f}s, stale={cached.is_stale})"
+            )
+            if cached.is_stale:
+                self._schedule_refresh(request, search_id)
+            parsed_data = cached.data
+        else:
+            parsed_data = await self._fetch(request, search_id)
+
         # Create DTO
         response_dto = ServiceResponseDTO(
             search_id=search_id,
             data=parsed_data
         )
-        
+
         # Log response
         self._logger.log_response(
-            search_id, 
+            search_id,
             "FlightAvailability_Response.json",
             response_dto
         )
-        
+
         return response_dto
+
+    async def _fetch(self, request: FlightAvailabilityRequest, search_id: str) -> Dict[str, Any]:
+        """Fetch through single-flight so identical concurrent searches share one upstream call."""
+        return await self._single_flight.do(
+            availability_key(request),
+            lambda: self._fetch_upstream(request, search_id)
+        )
+
+    async def _fetch_upstream(self, request: FlightAvailabilityRequest, search_id: str) -> Dict[str, Any]:
+        """Call the external service, parse, and populate the cache."""
+        # Get raw response from external service
+        raw_response = await yeti_client.get_flight_availability(request, search_id)
+
+        # Parse response
+        parsed_data = self._parser.parse(raw_response)
+
+        # Parse failures must not be cached or recorded
+        if not is_parse_failure(parsed_data):
+            if self._cache:
+                await self._cache.set(request, parsed_data)
+            if self._history:
+                self._history.submit(search_id, request, parsed_data)
+
+        return parsed_data
+
+    def _schedule_refresh(self, request: FlightAvailabilityRequest, search_id: str) -> None:
+        task = asyncio.create_task(self._refresh(request, search_id))
+        # Hold a reference until done so the task isn't garbage collected mid-flight
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, request: FlightAvailabilityRequest, search_id: str) -> None:
+        """Revalidate a stale entry in the background."""
+        search_logger = get_search_logger(search_id)
+        if not await self._cache.acquire_refresh(request):
+            return
+        try:
+            await self._fetch(request, search_id)
+            search_logger.info("Refreshed stale availability cache entry")
+        except Exception as e:
+            search_logger.warning(f"Background availability refresh failed: {e}")
+        finally:
+            await self._cache.release_refresh(request)
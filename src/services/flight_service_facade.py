@@ -1,17 +1,38 @@
 """Facade for flight services - provides unified interface."""
+import asyncio
+from typing import List, Optional
+
 from src.services.flight_availability_service import FlightAvailabilityService
+from src.services.flexible_availability_service import FlexibleAvailabilityService
 from src.services.flight_add_service import FlightAddService
 from src.services.booking_service import BookingService
+from src.services.booking_job_service import BookingJobService
 from src.services.service_initialization_service import ServiceInitializationService
 from src.services.parsers.xml_response_parser import XmlResponseParser
-from src.services.loggers.file_response_logger import FileResponseLogger
+from src.services.parsers.streaming_xml_response_parser import StreamingXmlResponseParser
+from src.services.loggers.audit_response_logger import AuditResponseLogger
+from src.services.caches.availability_cache import AvailabilityCache
+from src.services.caches.itinerary_cache import ItineraryCache
+from src.modules.search_history_writer import search_history_writer
+from src.config import settings
+from src.exceptions.base_exception import BaseCustomException
+from src.exceptions.validation_exception import ValidationException
+from src.logger import get_search_logger
 
-from src.schemas.flight_schema import FlightAvailabilityRequest, FlightAvailabilityResponse
+from src.schemas.flight_schema import (
+    FlightAvailabilityRequest,
+    FlightAvailabilityResponse,
+    BatchAvailabilityResponse,
+    RouteAvailabilityResult,
+)
 from src.schemas.flight_add_schema import FlightAddRequest, FlightAddResponse
 from src.schemas.booking_session_schema import BookingSessionRequest, BookingSessionResponse
 from src.schemas.booking_save_schema import BookingSaveRequest, BookingSaveResponse
+from src.schemas.booking_job_schema import BookingJobResponse
 from src.schemas.itinerary_schema import ItineraryRequest, ItineraryResponse
 from src.schemas.service_schema import ServiceResponse
+from src.schemas.flight_offer_schema import DateAvailabilitySchema, FlightSchema
+from src.utils.flight_normalizer import normalize_availability, sort_flights
 
 
 class FlightServiceFacade:
@@ -22,23 +43,122 @@ class FlightServiceFacade:
     
     def __init__(self):
         # Initialize dependencies
-        parser = XmlResponseParser()
-        logger = FileResponseLogger()
+        if settings.RESPONSE_PARSER == "streaming":
+            parser = StreamingXmlResponseParser()
+        else:
+            parser = XmlResponseParser()
+        logger = AuditResponseLogger()
+        availability_cache = AvailabilityCache() if settings.AVAILABILITY_CACHE_ENABLED else None
+        itinerary_cache = ItineraryCache() if settings.ITINERARY_CACHE_ENABLED else None
+
+        history = search_history_writer if settings.SEARCH_HISTORY_ENABLED else None
         
         # Initialize specialized services
-        self._availability_service = FlightAvailabilityService(parser, logger)
+        self._availability_service = FlightAvailabilityService(
+            parser, logger, availability_cache, history=history
+        )
+        self._flexible_availability_service = FlexibleAvailabilityService(self._availability_service)
         self._flight_add_service = FlightAddService(parser, logger)
-        self._booking_service = BookingService()
+        self._booking_service = BookingService(itinerary_cache)
+        self._booking_job_service = BookingJobService()
         self._init_service = ServiceInitializationService()
     
     async def check_availability(
         self, 
         request: FlightAvailabilityRequest, 
-        search_id: str
+        search_id: str,
+        view: str = "raw",
+        sort_by: Optional[str] = None
     ) -> FlightAvailabilityResponse:
-        """Check flight availability."""
+        """
+        Check flight availability, optionally as the compact typed view.
+        Flexible-date requests always return the compact view grouped by date.
+        """
+        if request.is_flexible:
+            return await self._check_flexible_availability(request, search_id, sort_by)
+        self._validate_sort(view, sort_by)
+
         dto = await self._availability_service.check_availability(request, search_id)
-        return FlightAvailabilityResponse(search_id=dto.search_id, data=dto.data)
+        if view != "compact":
+            return FlightAvailabilityResponse(search_id=dto.search_id, data=dto.data)
+
+        flights = normalize_availability(dto.data)
+        if sort_by:
+            flights = sort_flights(flights, sort_by)
+        return FlightAvailabilityResponse(
+            search_id=dto.search_id,
+            flights=[FlightSchema.model_validate(flight) for flight in flights]
+        )
+    
+    @staticmethod
+    def _validate_sort(view: str, sort_by: Optional[str]) -> None:
+        # The raw payload is passed through untouched, so there is nothing to sort
+        if sort_by and view != "compact":
+            raise ValidationException(
+                "sort_by requires view=compact",
+                details={"view": view, "sort_by": sort_by}
+            )
+
+    async def _check_flexible_availability(
+        self,
+        request: FlightAvailabilityRequest,
+        search_id: str,
+        sort_by: Optional[str] = None
+    ) -> FlightAvailabilityResponse:
+        dates = await self._flexible_availability_service.search(request, search_id)
+        if sort_by:
+            for entry in dates:
+                entry.flights = sort_flights(entry.flights, sort_by)
+        return FlightAvailabilityResponse(
+            search_id=search_id,
+            dates=[DateAvailabilitySchema.model_validate(entry) for entry in dates]
+        )
+    
+    async def check_availability_batch(
+        self,
+        requests: List[FlightAvailabilityRequest],
+        search_id: str,
+        view: str = "raw",
+        sort_by: Optional[str] = None
+    ) -> BatchAvailabilityResponse:
+        """
+        Check availability for several routes under one search_id, at most
+        BATCH_AVAILABILITY_CONCURRENCY at a time. A failed route is reported
+        in its own result rather than failing the batch.
+        """
+        if len(requests) > settings.BATCH_AVAILABILITY_MAX_ROUTES:
+            raise ValidationException(
+                f"Batch has {len(requests)} routes; at most {settings.BATCH_AVAILABILITY_MAX_ROUTES} are allowed"
+            )
+
+        # Reject up front rather than failing each route on its own
+        if not all(request.is_flexible for request in requests):
+            self._validate_sort(view, sort_by)
+
+        search_logger = get_search_logger(search_id)
+        semaphore = asyncio.Semaphore(settings.BATCH_AVAILABILITY_CONCURRENCY)
+
+        async def check_route(request: FlightAvailabilityRequest) -> RouteAvailabilityResult:
+            route = {
+                "origin": request.origin,
+                "destination": request.destination,
+                "depart_date": request.depart_date,
+            }
+            try:
+                async with semaphore:
+                    response = await self.check_availability(request, search_id, view, sort_by)
+            except Exception as e:
+                error = e.message if isinstance(e, BaseCustomException) else str(e)
+                search_logger.warning(f"Batch route {request.origin}-{request.destination} failed: {error}")
+                return RouteAvailabilityResult(**route, success=False, error=error)
+            return RouteAvailabilityResult(
+                **route,
+                success=True,
+                **response.model_dump(exclude={"search_id"}, exclude_unset=True)
+            )
+
+        results = await asyncio.gather(*(check_route(request) for request in requests))
+        return BatchAvailabilityResponse(search_id=search_id, results=list(results))
     
     async def initialize_service(self, search_id: str) -> str:
         """Initialize service."""
@@ -72,9 +192,23 @@ class FlightServiceFacade:
             raw_response=dto.raw_response
         )
     
-    async def get_itinerary(self, request: ItineraryRequest) -> ItineraryResponse:
-        """Get booking itinerary."""
-        dto = await self._booking_service.get_itinerary(request)
+    async def submit_booking(self, request: BookingSaveRequest) -> BookingJobResponse:
+        """Queue a booking for the booking workers."""
+        job = await self._booking_job_service.submit(request)
+        return BookingJobResponse(**job)
+    
+    async def get_booking_job(self, job_id: str, wait: float = 0) -> Optional[BookingJobResponse]:
+        """Asynchronous booking state, waiting up to `wait` seconds for it to finish."""
+        job = await self._booking_job_service.get(job_id, wait)
+        return BookingJobResponse(**job) if job else None
+    
+    async def get_itinerary(
+        self,
+        request: ItineraryRequest,
+        force_refresh: bool = False
+    ) -> ItineraryResponse:
+        """Get booking itinerary; `force_refresh` bypasses the itinerary cache."""
+        dto = await self._booking_service.get_itinerary(request, force_refresh)
         return ItineraryResponse(
             search_id=dto.search_id, 
             raw_response=dto.raw_response
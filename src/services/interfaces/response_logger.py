@@ -8,5 +8,5 @@ class IResponseLogger(ABC):
     
     @abstractmethod
     def log_response(self, search_id: str, filename: str, content: Any) -> None:
-        """Log response to file."""
+        """Log a service response."""
         pass
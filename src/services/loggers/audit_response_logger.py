@@ -0,0 +1,16 @@
+"""Audit-sink response logger implementation."""
+from typing import Any
+from src.services.interfaces.response_logger import IResponseLogger
+from src.modules.yeti_client import yeti_client
+
+
+class AuditResponseLogger(IResponseLogger):
+    """Logger that queues responses for the audit writer; AUDIT_SINK decides where they end up."""
+    
+    def log_response(self, search_id: str, filename: str, content: Any) -> None:
+        """Queue response via yeti_client; the audit writer serializes it off the loop."""
+        try:
+            yeti_client.log_to_file(search_id, filename, content)
+        except Exception:
+            # Silently fail if logging fails
+            pass
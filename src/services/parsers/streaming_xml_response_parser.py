@@ -0,0 +1,26 @@
+"""Streaming XML response parser implementation."""
+from typing import Any, Dict, Iterable, Iterator, Tuple
+from src.modules import metrics
+from src.services.interfaces.response_parser import IResponseParser
+from src.utils.streaming_xml_parser import (
+    DEFAULT_RECORD_TAGS,
+    iter_yeti_records,
+    parse_yeti_xml_response_streaming,
+)
+
+
+class StreamingXmlResponseParser(IResponseParser):
+    """Single-pass expat parser for Yeti responses; same output as XmlResponseParser."""
+
+    def parse(self, raw_response: str) -> Dict[str, Any]:
+        """Parse XML response to dictionary."""
+        with metrics.time_parse("streaming"):
+            return parse_yeti_xml_response_streaming(raw_response)
+
+    def iter_records(
+        self,
+        raw_response: str,
+        record_tags: Iterable[str] = DEFAULT_RECORD_TAGS
+    ) -> Iterator[Tuple[str, Any]]:
+        """Yield flight/fare records incrementally as (tag, record) pairs."""
+        return iter_yeti_records(raw_response, record_tags)
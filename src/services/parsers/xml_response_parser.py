@@ -1,5 +1,6 @@
 """XML response parser implementation."""
 from typing import Dict, Any
+from src.modules import metrics
 from src.services.interfaces.response_parser import IResponseParser
 from src.utils.xml_parser import parse_yeti_xml_response
 
@@ -9,4 +10,5 @@ class XmlResponseParser(IResponseParser):
     
     def parse(self, raw_response: str) -> Dict[str, Any]:
         """Parse XML response to dictionary."""
-        return parse_yeti_xml_response(raw_response)
+        with metrics.time_parse("tree"):
+            return parse_yeti_xml_response(raw_response)
@@ -0,0 +1,129 @@
+import httpx
+import pytest
+
+from src.exceptions.upstream_exception import CircuitOpenException
+from src.modules import circuit_breaker as circuit_breaker_module
+from src.modules.circuit_breaker import CircuitBreaker, CircuitState
+from src.modules.yeti_client import _is_upstream_failure
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", clock)
+    return clock
+
+
+def make_breaker(**kwargs):
+    options = dict(
+        window=4, min_calls=4, failure_rate=0.5, slow_call_seconds=5.0,
+        slow_call_rate=1.0, open_seconds=30.0, half_open_calls=2,
+    )
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+async def succeed(breaker):
+    async with breaker.call():
+        pass
+
+
+async def fail(breaker, exc=None):
+    with pytest.raises(Exception):
+        async with breaker.call():
+            raise exc or httpx.ConnectError("down")
+
+
+@pytest.mark.asyncio
+async def test_opens_at_failure_rate_after_min_calls(clock):
+    breaker = make_breaker()
+    await succeed(breaker)
+    await fail(breaker)
+    await succeed(breaker)
+    assert breaker.state == CircuitState.CLOSED
+    await fail(breaker)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.times_opened == 1
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_rejects_until_open_seconds_pass(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        await fail(breaker)
+    with pytest.raises(CircuitOpenException) as exc_info:
+        breaker.raise_if_open()
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.details["retry_after"] == 30.0
+    with pytest.raises(CircuitOpenException):
+        await succeed(breaker)
+    assert breaker.rejected == 2
+
+    clock.now += 30.0
+    await succeed(breaker)
+    assert breaker.state == CircuitState.HALF_OPEN
+
+
+@pytest.mark.asyncio
+async def test_half_open_closes_after_successful_trials(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        await fail(breaker)
+    clock.now += 30.0
+    await succeed(breaker)
+    await succeed(breaker)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+@pytest.mark.asyncio
+async def test_half_open_failure_reopens(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        await fail(breaker)
+    clock.now += 30.0
+    await fail(breaker)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.times_opened == 2
+
+
+@pytest.mark.asyncio
+async def test_half_open_limits_trial_calls(clock):
+    breaker = make_breaker(half_open_calls=1)
+    for _ in range(4):
+        await fail(breaker)
+    clock.now += 30.0
+    async with breaker.call():
+        # The only trial slot is taken
+        with pytest.raises(CircuitOpenException):
+            await succeed(breaker)
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_open_the_circuit(clock):
+    breaker = make_breaker(slow_call_rate=0.5)
+    for _ in range(4):
+        async with breaker.call():
+            clock.now += 6.0
+    assert breaker.state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_count_as_failures(clock):
+    breaker = make_breaker(is_failure=_is_upstream_failure)
+    request = httpx.Request("POST", "http://yeti.test/")
+    bad_request = httpx.HTTPStatusError(
+        "400", request=request, response=httpx.Response(400, request=request)
+    )
+    for _ in range(4):
+        await fail(breaker, bad_request)
+    assert breaker.state == CircuitState.CLOSED
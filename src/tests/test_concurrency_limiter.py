@@ -0,0 +1,95 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.exceptions.upstream_exception import CircuitOpenException, UpstreamOverloadedException
+from src.modules.concurrency_limiter import AdaptiveConcurrencyLimiter
+from src.modules.yeti_client import _is_upstream_failure
+
+
+def make_limiter(**kwargs):
+    options = dict(
+        initial_limit=10, min_limit=2, max_limit=20, latency_target=1.0,
+        backoff=0.5, max_queue=2, queue_timeout=0.05,
+    )
+    options.update(kwargs)
+    return AdaptiveConcurrencyLimiter("test", **options)
+
+
+def test_fast_success_grows_limit_additively_while_in_use():
+    limiter = make_limiter()
+    limiter._adjust(failed=False, latency=0.1, in_flight=5)
+    assert limiter._limit == pytest.approx(10.1)
+
+
+def test_idle_limit_does_not_grow():
+    limiter = make_limiter()
+    limiter._adjust(failed=False, latency=0.1, in_flight=1)
+    assert limiter._limit == 10
+
+
+def test_failure_and_slow_calls_back_off_multiplicatively():
+    limiter = make_limiter()
+    limiter._adjust(failed=True, latency=0.1, in_flight=5)
+    assert limiter._limit == 5
+    limiter._adjust(failed=False, latency=2.0, in_flight=5)
+    assert limiter._limit == 2.5
+
+
+def test_limit_stays_within_bounds():
+    limiter = make_limiter(initial_limit=20)
+    limiter._adjust(failed=False, latency=0.1, in_flight=20)
+    assert limiter._limit == 20
+    for _ in range(10):
+        limiter._adjust(failed=True, latency=0.1, in_flight=1)
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_only_upstream_failures_shrink_the_limit():
+    limiter = make_limiter(is_failure=_is_upstream_failure)
+    request = httpx.Request("POST", "http://yeti.test/")
+
+    def status_error(code):
+        return httpx.HTTPStatusError(str(code), request=request, response=httpx.Response(code, request=request))
+
+    for exc in (status_error(400), CircuitOpenException("FlightAvailability", 10.0)):
+        with pytest.raises(type(exc)):
+            async with limiter.acquire():
+                raise exc
+    assert limiter._limit == 10
+
+    with pytest.raises(httpx.HTTPStatusError):
+        async with limiter.acquire():
+            raise status_error(503)
+    assert limiter._limit == 5
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full_or_times_out():
+    limiter = make_limiter(initial_limit=2, min_limit=1, max_queue=1)
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.acquire():
+            await release.wait()
+
+    holders = [asyncio.create_task(hold()) for _ in range(2)]
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    with pytest.raises(UpstreamOverloadedException) as exc_info:
+        async with limiter.acquire():
+            pass
+    assert exc_info.value.details["reason"] == "queue_full"
+
+    with pytest.raises(UpstreamOverloadedException) as exc_info:
+        await waiter
+    assert exc_info.value.details["reason"] == "queue_timeout"
+
+    release.set()
+    await asyncio.gather(*holders)
+    assert limiter.stats()["in_flight"] == 0
+    assert limiter.rejected == 2
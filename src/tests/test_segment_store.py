@@ -0,0 +1,107 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.modules.segment_store import SegmentStore, StoredRecord
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SegmentStore(str(tmp_path), max_segment_bytes=1 << 20)
+    yield store
+    store.close()
+
+
+def test_append_and_read_round_trip(store):
+    store.append([
+        StoredRecord("s1", 1, "FlightAvailability_RQ.xml", "<rq>&amp;</rq>", "r1"),
+        StoredRecord("s2", 1, "FlightAvailability_RQ.xml", "<other/>", "r2"),
+        StoredRecord("s1", 2, "FlightAvailability_RS.xml", "<rs/>", "r3"),
+    ])
+    store.append([StoredRecord("s1", 0, "app.log", "line 1\n")])
+
+    assert store.read("s1") == [
+        StoredRecord("s1", 1, "FlightAvailability_RQ.xml", "<rq>&amp;</rq>", "r1"),
+        StoredRecord("s1", 2, "FlightAvailability_RS.xml", "<rs/>", "r3"),
+        StoredRecord("s1", 0, "app.log", "line 1\n", ""),
+    ]
+    assert [r.content for r in store.read("s2")] == ["<other/>"]
+    assert store.read("missing") == []
+    assert store.stats()["searches"] == 2
+    assert store.stats()["batches"] == 2
+
+
+def test_redelivered_records_are_read_once(store):
+    batch = [StoredRecord("s1", 1, "RQ.xml", "<rq/>", "r1")]
+    store.append(batch)
+    store.append(batch)
+    # Another process numbers its records from 1 too; that is a different record
+    store.append([StoredRecord("s1", 1, "RQ.xml", "<rq2/>", "r2")])
+    assert [r.content for r in store.read("s1")] == ["<rq/>", "<rq2/>"]
+
+
+def test_segments_roll_and_are_readable_across_them(tmp_path):
+    store = SegmentStore(str(tmp_path), max_segment_bytes=1)
+    try:
+        for i in range(3):
+            store.append([StoredRecord("s1", i + 1, "RQ.xml", f"<rq{i}/>", f"r{i}")])
+        assert store.stats()["segments"] == 3
+        assert [r.content for r in store.read("s1")] == ["<rq0/>", "<rq1/>", "<rq2/>"]
+    finally:
+        store.close()
+
+
+def test_prune_removes_old_segments_and_their_index_rows(tmp_path):
+    store = SegmentStore(str(tmp_path), max_segment_bytes=1)
+    try:
+        store.append([StoredRecord("old", 1, "RQ.xml", "<old/>", "r1")])
+        store.append([StoredRecord("new", 1, "RQ.xml", "<new/>", "r2")])
+        old_segment, new_segment = sorted(
+            os.listdir(store.segments_dir), key=lambda n: os.path.getmtime(os.path.join(store.segments_dir, n))
+        )
+        week_ago = time.time() - 7 * 86400
+        os.utime(os.path.join(store.segments_dir, old_segment), (week_ago, week_ago))
+
+        assert store.prune(86400) == 1
+        assert store.read("old") == []
+        assert [r.content for r in store.read("new")] == ["<new/>"]
+        assert os.listdir(store.segments_dir) == [new_segment]
+    finally:
+        store.close()
+
+
+def test_prune_keeps_segments_running_processes_may_append_to(tmp_path):
+    store = SegmentStore(str(tmp_path), max_segment_bytes=1 << 20)
+    worker = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    try:
+        store.append([StoredRecord("s1", 1, "RQ.xml", "<rq/>", "r1")])
+        own_segment = store._segment_name
+        names = [
+            f"20260101T000000-{worker.pid}-aaaaaaaa.seg",  # rolled by the worker
+            f"20260102T000000-{worker.pid}-bbbbbbbb.seg",  # the worker's open segment
+            f"20260102T000000-{exited.pid}-cccccccc.seg",
+        ]
+        for name in names:
+            open(os.path.join(store.segments_dir, name), "wb").close()
+        week_ago = time.time() - 7 * 86400
+        for age, name in enumerate(names + [own_segment]):
+            os.utime(os.path.join(store.segments_dir, name), (week_ago + age, week_ago + age))
+
+        assert store.prune(86400) == 2
+        assert sorted(os.listdir(store.segments_dir)) == sorted([own_segment, names[1]])
+        assert [r.content for r in store.read("s1")] == ["<rq/>"]
+    finally:
+        worker.kill()
+        worker.wait()
+        store.close()
+
+
+def test_reads_records_written_without_an_id(store):
+    # Segments written before records carried an id
+    store.append([StoredRecord("s1", 1, "RQ.xml", "<rq/>")])
+    assert store.read("s1") == [StoredRecord("s1", 1, "RQ.xml", "<rq/>", "")]
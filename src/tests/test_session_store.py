@@ -0,0 +1,197 @@
+import asyncio
+
+import fakeredis
+import httpx
+import pytest
+
+from src.modules import session_store as session_store_module
+from src.modules.session_store import (
+    InMemorySessionStore,
+    LRUTTLCache,
+    RedisSessionStore,
+    cookie_fields,
+    cookies_from_fields,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedisClient:
+    """Stands in for RedisClient, which is a singleton bound to REDIS_URL."""
+
+    def __init__(self):
+        self.client = fakeredis.aioredis.FakeRedis()
+
+    async def get_client(self):
+        return self.client
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(session_store_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def redis_store():
+    return RedisSessionStore(FakeRedisClient(), ttl=60)
+
+
+def jar(*cookies) -> httpx.Cookies:
+    """Build a jar from (name, value, domain, path) tuples."""
+    result = httpx.Cookies()
+    for name, value, domain, path in cookies:
+        result.set(name, value, domain=domain, path=path)
+    return result
+
+
+def as_tuples(cookies: httpx.Cookies) -> set:
+    return {(c.name, c.value, c.domain, c.path) for c in cookies.jar}
+
+
+SESSION = ("ASP.NET_SessionId", "s1", "yeti.test", "/")
+SESSION_ON_API = ("ASP.NET_SessionId", "s2", "api.yeti.test", "/booking")
+ROUTE = ("route", "r1", "yeti.test", "/")
+
+
+def test_cookie_fields_round_trip_domain_and_path():
+    cookies = jar(SESSION, SESSION_ON_API, ROUTE)
+
+    fields = cookie_fields(cookies)
+
+    assert set(fields) == {
+        "yeti.test|/|ASP.NET_SessionId",
+        "api.yeti.test|/booking|ASP.NET_SessionId",
+        "yeti.test|/|route",
+    }
+    assert as_tuples(cookies_from_fields(fields.values())) == {SESSION, SESSION_ON_API, ROUTE}
+
+
+def test_cookie_fields_of_empty_jar():
+    assert cookie_fields(httpx.Cookies()) == {}
+    assert as_tuples(cookies_from_fields([])) == set()
+
+
+def test_lru_evicts_least_recently_used(clock):
+    cache = LRUTTLCache(maxsize=2, ttl=60)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache["c"] = 3
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_entries_expire_after_idle_ttl(clock):
+    cache = LRUTTLCache(maxsize=10, ttl=60)
+    cache["a"] = 1
+    cache["b"] = 2
+
+    clock.now += 50
+    assert cache.get("a") == 1  # Touch slides "a"'s expiry
+    clock.now += 50
+
+    assert cache.get("a") == 1
+    assert cache.get("b", "gone") == "gone"
+    assert len(cache) == 1
+
+
+def test_lru_pop(clock):
+    cache = LRUTTLCache(maxsize=10, ttl=60)
+    cache["a"] = 1
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "missing") == "missing"
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_merges_cookies(clock):
+    store = InMemorySessionStore(maxsize=10, ttl=60)
+    await store.merge_cookies("search", jar(SESSION))
+    await store.merge_cookies("search", jar(ROUTE, ("ASP.NET_SessionId", "s3", "yeti.test", "/")))
+
+    cookies = await store.get_cookies("search")
+
+    assert as_tuples(cookies) == {("ASP.NET_SessionId", "s3", "yeti.test", "/"), ROUTE}
+
+
+@pytest.mark.asyncio
+async def test_redis_store_round_trips_domain_and_path(redis_store):
+    await redis_store.set_cookies("search", jar(SESSION, SESSION_ON_API))
+
+    cookies = await redis_store.get_cookies("search")
+
+    assert as_tuples(cookies) == {SESSION, SESSION_ON_API}
+
+
+@pytest.mark.asyncio
+async def test_redis_merge_updates_fields_and_keeps_the_rest(redis_store):
+    await redis_store.set_cookies("search", jar(SESSION, ROUTE))
+
+    await redis_store.merge_cookies("search", jar(("ASP.NET_SessionId", "s3", "yeti.test", "/"), SESSION_ON_API))
+
+    cookies = await redis_store.get_cookies("search")
+    assert as_tuples(cookies) == {("ASP.NET_SessionId", "s3", "yeti.test", "/"), SESSION_ON_API, ROUTE}
+
+
+@pytest.mark.asyncio
+async def test_redis_concurrent_merges_do_not_lose_cookies(redis_store):
+    await asyncio.gather(
+        redis_store.merge_cookies("search", jar(SESSION)),
+        redis_store.merge_cookies("search", jar(ROUTE)),
+        redis_store.merge_cookies("search", jar(SESSION_ON_API)),
+    )
+
+    assert as_tuples(await redis_store.get_cookies("search")) == {SESSION, SESSION_ON_API, ROUTE}
+
+
+@pytest.mark.asyncio
+async def test_redis_set_replaces_the_jar(redis_store):
+    await redis_store.set_cookies("search", jar(SESSION, ROUTE))
+
+    await redis_store.set_cookies("search", jar(SESSION_ON_API))
+
+    assert as_tuples(await redis_store.get_cookies("search")) == {SESSION_ON_API}
+
+
+@pytest.mark.asyncio
+async def test_redis_writes_and_reads_slide_the_idle_ttl(redis_store):
+    client = await redis_store._redis.get_client()
+    key = redis_store._key("search")
+
+    await redis_store.merge_cookies("search", jar(SESSION))
+    assert 0 < await client.ttl(key) <= 60
+
+    await client.expire(key, 5)
+    await redis_store.get_cookies("search")
+    assert await client.ttl(key) > 5
+
+
+@pytest.mark.asyncio
+async def test_redis_missing_and_deleted_sessions(redis_store):
+    assert await redis_store.get_cookies("search") is None
+
+    await redis_store.set_cookies("search", jar(SESSION))
+    await redis_store.delete("search")
+
+    assert await redis_store.get_cookies("search") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_set_with_empty_jar_clears_the_session(redis_store):
+    await redis_store.set_cookies("search", jar(SESSION))
+
+    await redis_store.set_cookies("search", httpx.Cookies())
+
+    assert await redis_store.get_cookies("search") is None
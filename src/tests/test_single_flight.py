@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from src.exceptions.upstream_exception import UpstreamCallException
+from src.modules.single_flight import SingleFlight
+
+
+class HeldLockRedis:
+    """Redis stand-in whose leader lock is always held by another worker."""
+
+    async def get_client(self):
+        return self
+
+    async def set(self, *args, **kwargs):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight("test", distributed=False)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+    assert results == ["result"] * 5
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+
+@pytest.mark.asyncio
+async def test_leader_error_is_shared_with_followers():
+    flight = SingleFlight("test", distributed=False)
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream said no")
+
+    results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, ValueError) and str(r) == "upstream said no" for r in results)
+    assert flight.executions == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_over_to_a_follower():
+    flight = SingleFlight("test", distributed=False)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    leader = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(flight.do("key", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await asyncio.gather(*followers) == [2, 2, 2]
+    assert leader.cancelled()
+    assert calls == 2
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_follower_leaves_the_call_running():
+    flight = SingleFlight("test", distributed=False)
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    leader = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    follower.cancel()
+
+    assert await leader == "result"
+    assert follower.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_remote_leader_error_is_raised_as_upstream_exception():
+    flight = SingleFlight("test", distributed=True, redis_client=HeldLockRedis())
+
+    async def follow(client, result_key, channel):
+        return {"error": "Yeti API error", "status_code": 503, "error_code": "CIRCUIT_OPEN"}
+
+    flight._follow = follow
+
+    async def fetch():
+        raise AssertionError("followers must not call upstream")
+
+    with pytest.raises(UpstreamCallException) as exc_info:
+        await flight.do("key", fetch)
+    assert exc_info.value.message == "Yeti API error"
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.error_code == "CIRCUIT_OPEN"
+    assert exc_info.value.details == {"operation": "test"}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_remote_leader_makes_follower_run_the_call():
+    flight = SingleFlight("test", distributed=True, redis_client=HeldLockRedis())
+
+    async def follow(client, result_key, channel):
+        return {"cancelled": True}
+
+    flight._follow = follow
+
+    async def fetch():
+        return "result"
+
+    assert await flight.do("key", fetch) == "result"
+    assert flight.executions == 1
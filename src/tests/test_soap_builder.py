@@ -0,0 +1,64 @@
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
+
+from src.utils import soap_builder
+
+TEM = "{http://tempuri.org/}"
+NASTY = "Tom & Jerry <Ltd> ]]><x/>"
+
+
+def inner_booking(envelope: bytes) -> ET.Element:
+    """Parse the envelope, then the CDATA-wrapped booking XML inside strXml."""
+    root = ET.fromstring(envelope)
+    str_xml = root.find(f".//{TEM}strXml")
+    return ET.fromstring(str_xml.text)
+
+
+def test_escape_xml():
+    assert soap_builder.escape_xml("a & b < c > d") == "a &amp; b &lt; c &gt; d"
+    assert soap_builder.escape_xml("]]>") == "]]&gt;"
+    assert soap_builder.escape_xml("KTM") == "KTM"
+    assert soap_builder.escape_xml(None) == ""
+    assert soap_builder.escape_xml(12) == "12"
+    assert soap_builder.escape_xml("a\x00b\x1fc") == "abc"
+
+
+def test_flight_add_keeps_cdata_intact():
+    envelope = soap_builder.flight_add(
+        adults=1, children=0, infants=0, flight_id=NASTY, fare_id="F&1",
+        origin="KTM", destination="PKR",
+    )
+    assert envelope.count(b"]]>") == 1
+    booking = inner_booking(envelope)
+    assert booking.findtext("FlightSegment/flight_id") == NASTY
+    assert booking.findtext("FlightSegment/fare_id") == "F&1"
+    assert booking.findtext("Header/adult") == "1"
+
+
+def test_booking_save_escapes_every_field():
+    passenger = SimpleNamespace(
+        passenger_id="1", passenger_type_rcd="ADULT", lastname="O'Neil & <Sons>",
+        firstname=NASTY, gender_type_rcd="M", nationality_rcd="NP", date_of_birth="19900101",
+    )
+    request = SimpleNamespace(
+        booking_header=SimpleNamespace(
+            contact_name=NASTY, contact_email="a&b@example.com",
+            phone_mobile="+977", phone_home=None, phone_business="",
+        ),
+        passengers=[passenger, passenger],
+        payment=SimpleNamespace(form_of_payment_rcd="CASH", currency_rcd="NPR", payment_amount=1500.5),
+    )
+    envelope = soap_builder.booking_save(request)
+    assert envelope.count(b"]]>") == 1
+    booking = inner_booking(envelope)
+    assert booking.findtext("BookingHeader/contact_name") == NASTY
+    assert booking.findtext("BookingHeader/contact_email") == "a&b@example.com"
+    assert booking.findtext("BookingHeader/phone_home") == ""
+    names = [(p.findtext("firstname"), p.findtext("lastname")) for p in booking.findall("Passenger")]
+    assert names == [(NASTY, "O'Neil & <Sons>")] * 2
+    assert booking.findtext("Payment/payment_amount") == "1500.5"
+
+
+def test_itinerary_escapes_outside_cdata():
+    root = ET.fromstring(soap_builder.booking_get_itinerary(pnr="AB<&"))
+    assert root.findtext(f".//{TEM}strRecordLocator") == "AB<&"
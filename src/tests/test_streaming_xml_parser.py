@@ -0,0 +1,98 @@
+import os
+from string import Template
+
+import pytest
+
+from benchmarks.fixtures import FIXTURES_DIR, availability_fixtures, load_fixture
+from src.utils.streaming_xml_parser import (
+    _DictBuilder,
+    _parse_result,
+    iter_yeti_records,
+    parse_yeti_xml_response_streaming,
+)
+from src.utils.xml_parser import parse_yeti_xml_response
+
+# Values for the simulator's $placeholders, with characters that need escaping
+PLACEHOLDERS = {
+    "record_locator": "ABC123",
+    "booking_status": "CONFIRMED",
+    "booking_id": "5F0C2A9E-3B61-4D8A-9E27-6C1B0F4A7D35",
+    "flight_id": "{6513270E-269E-0D37-F2A7-4DE452E6B438}",
+    "fare_id": "F&amp;amp;1",
+    "message": "Session expired",
+}
+
+ENVELOPE = """<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+  <soap:Body>
+    <BookingGetItineraryResponse xmlns="http://tempuri.org/">
+      <BookingGetItineraryResult>{result}</BookingGetItineraryResult>
+    </BookingGetItineraryResponse>
+  </soap:Body>
+</soap:Envelope>"""
+
+BOOKING = "&lt;Booking&gt;&lt;BookingHeader&gt;&lt;record_locator&gt;ABC123&lt;/record_locator&gt;&lt;/BookingHeader&gt;&lt;/Booking&gt;"
+
+
+def recorded(name: str) -> str:
+    return Template(load_fixture(name)).substitute(PLACEHOLDERS)
+
+
+def assert_parity(xml: str):
+    tree = parse_yeti_xml_response(xml)
+    assert parse_yeti_xml_response_streaming(xml) == tree
+    return tree
+
+
+@pytest.mark.parametrize("name", sorted(f for f in os.listdir(FIXTURES_DIR) if f.endswith(".xml")))
+def test_parity_on_recorded_fixtures(name):
+    assert_parity(recorded(name))
+
+
+@pytest.mark.parametrize("size", ["small", "medium"])
+def test_parity_on_scaled_availability(size):
+    parsed = assert_parity(availability_fixtures()[size])
+    assert parsed["Availability"]["AvailabilityOutbound"]["AvailabilityFlight"]
+
+
+def test_parity_across_chunk_boundaries():
+    xml = availability_fixtures()["small"]
+    expected = parse_yeti_xml_response(xml)
+    for chunk_size in (1, 7, 64):
+        assert _parse_result(xml, _DictBuilder(), chunk_size=chunk_size) == expected
+
+
+@pytest.mark.parametrize("message", ["Session expired", "Session &amp;lt;expired&amp;gt;"])
+def test_parity_on_soap_fault(message):
+    xml = Template(load_fixture("soap_fault.xml")).substitute(message=message)
+    parsed = assert_parity(xml)
+    if "&" not in message:
+        assert parsed == {"faultcode": "soap:Server", "faultstring": message}
+
+
+@pytest.mark.parametrize("declaration", [
+    '&lt;?xml version="1.0" encoding="utf-8"?&gt;',
+    '\n  &lt;?xml version="1.0"?&gt;\n',
+])
+def test_parity_with_nested_xml_declaration(declaration):
+    with_declaration = assert_parity(ENVELOPE.format(result=declaration + BOOKING))
+    without = assert_parity(ENVELOPE.format(result=BOOKING))
+    assert with_declaration == without == {"Booking": {"BookingHeader": {"record_locator": "ABC123"}}}
+
+
+def test_parity_when_result_holds_elements():
+    xml = ENVELOPE.format(result="<Booking><a>1</a><a>2</a></Booking>")
+    assert assert_parity(xml) == {"Booking": {"a": ["1", "2"]}}
+
+
+def test_parity_on_malformed_payload():
+    xml = ENVELOPE.format(result="&lt;Booking&gt;&lt;a&gt;1&lt;/Booking&gt;")
+    parsed = assert_parity(xml)
+    assert parsed["raw_response"] == xml
+
+
+def test_records_match_tree_parser():
+    xml = availability_fixtures()["medium"]
+    flights = parse_yeti_xml_response(xml)["Availability"]["AvailabilityOutbound"]["AvailabilityFlight"]
+    records = [record for tag, record in iter_yeti_records(xml, ("AvailabilityFlight",), chunk_size=4096)]
+    assert records == flights
@@ -0,0 +1,256 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.config import settings
+from src.exceptions.upstream_exception import CircuitOpenException
+from src.modules.circuit_breaker import CircuitState
+from src.modules import retry_policy as retry_policy_module
+from src.modules.retry_policy import RetryPolicy
+from src.modules.yeti_client import YetiClient
+
+OPERATION = "FlightAvailability"
+
+
+class FakeYeti:
+    """MockTransport handler that plays back one scripted answer per request."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.requests = 0
+        self.cancelled = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        number = self.requests
+        answer = self.answers.pop(0) if self.answers else 200
+        delay = 0.0
+        if isinstance(answer, tuple):
+            delay, answer = answer
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        if isinstance(answer, Exception):
+            raise answer
+        return httpx.Response(answer, text=f"<answer n='{number}'/>", request=request)
+
+
+@pytest.fixture
+def make_client():
+    def make(yeti: FakeYeti, max_attempts: int = 3) -> YetiClient:
+        client = YetiClient()
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(yeti))
+        client.retry_policy = RetryPolicy(max_attempts=max_attempts, base_delay=0.0, max_delay=0.0)
+        # Keep RQ/RS dumps out of logs/
+        client.log_to_file = lambda *args: None
+        return client
+
+    return make
+
+
+@pytest.fixture
+def hedging(monkeypatch):
+    monkeypatch.setattr(settings, "YETI_HEDGING_ENABLED", True)
+    monkeypatch.setattr(settings, "YETI_HEDGE_MIN_SAMPLES", 5)
+
+
+def seed_latency(client: YetiClient, seconds: float, operation: str = OPERATION) -> None:
+    for _ in range(5):
+        client.latency.record(operation, seconds)
+
+
+def connect_error():
+    return httpx.ConnectError("connection refused")
+
+
+def booking_request():
+    """Good enough for both soap_builder.flight_add and soap_builder.booking_save."""
+    return SimpleNamespace(
+        adults=1, children=0, infants=0, flight_id="F1", fare_id="R1", origin="KTM", destination="PKR",
+        booking_header=SimpleNamespace(
+            contact_name="A", contact_email="a@example.com", phone_mobile="1", phone_home="", phone_business="",
+        ),
+        passengers=[],
+        payment=SimpleNamespace(form_of_payment_rcd="CASH", currency_rcd="NPR", payment_amount=1),
+    )
+
+
+@pytest.mark.parametrize("failure", [503, 502, 504, "connect", "read_timeout"])
+@pytest.mark.asyncio
+async def test_retries_transient_failures(make_client, failure):
+    error = {"connect": connect_error(), "read_timeout": httpx.ReadTimeout("slow")}.get(failure, failure)
+    yeti = FakeYeti(error, 200)
+    client = make_client(yeti)
+
+    response = await client._post_idempotent(OPERATION, "search", b"<rq/>")
+
+    assert response.status_code == 200
+    assert yeti.requests == 2
+
+
+@pytest.mark.parametrize("status", [400, 404, 500])
+@pytest.mark.asyncio
+async def test_does_not_retry_client_errors_or_500(make_client, status):
+    yeti = FakeYeti(status, 200)
+    client = make_client(yeti)
+
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        await client._post_idempotent(OPERATION, "search", b"<rq/>")
+    assert exc_info.value.response.status_code == status
+    assert yeti.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_an_open_circuit(make_client):
+    yeti = FakeYeti()
+    client = make_client(yeti)
+    breaker = client.circuit_breakers.get(OPERATION)
+    breaker._transition(CircuitState.OPEN)
+
+    with pytest.raises(CircuitOpenException):
+        await client._post_idempotent(OPERATION, "search", b"<rq/>")
+    assert yeti.requests == 0
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_attempts_with_backoff_between(make_client):
+    yeti = FakeYeti(503, 503, 503, 200)
+    client = make_client(yeti, max_attempts=3)
+    delays = []
+    policy_delay = client.retry_policy.delay
+    client.retry_policy.delay = lambda attempt: delays.append(attempt) or policy_delay(attempt)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client._post_idempotent(OPERATION, "search", b"<rq/>")
+    assert yeti.requests == 3
+    # A wait after each failed attempt except the last
+    assert delays == [0, 1]
+
+
+def test_backoff_is_full_jitter_capped_at_max_delay(monkeypatch):
+    bounds = []
+    monkeypatch.setattr(retry_policy_module.random, "uniform", lambda low, high: bounds.append((low, high)) or high)
+    policy = RetryPolicy(max_attempts=5, base_delay=0.2, max_delay=1.0)
+
+    assert [policy.delay(attempt) for attempt in range(4)] == [0.2, 0.4, 0.8, 1.0]
+    assert bounds == [(0, 0.2), (0, 0.4), (0, 0.8), (0, 1.0)]
+
+
+@pytest.mark.parametrize("method", ["booking_save", "flight_add"])
+@pytest.mark.parametrize("failure", [503, "connect"])
+@pytest.mark.asyncio
+async def test_non_idempotent_operations_are_never_retried(make_client, hedging, method, failure):
+    yeti = FakeYeti(connect_error() if failure == "connect" else failure, 200)
+    client = make_client(yeti)
+    with pytest.raises(Exception):
+        await getattr(client, method)(booking_request(), "search")
+    assert yeti.requests == 1
+
+
+@pytest.mark.parametrize("method,operation", [("booking_save", "BookingSave"), ("flight_add", "FlightAdd")])
+@pytest.mark.asyncio
+async def test_non_idempotent_operations_are_never_hedged(make_client, hedging, method, operation):
+    yeti = FakeYeti((0.1, 200))
+    client = make_client(yeti)
+    seed_latency(client, 0.001, operation)
+    await getattr(client, method)(booking_request(), "search")
+    assert yeti.requests == 1
+    assert client.hedged == 0
+
+
+@pytest.mark.asyncio
+async def test_hedges_after_p95_and_cancels_the_loser(make_client, hedging):
+    yeti = FakeYeti((1.0, 200), 200)
+    client = make_client(yeti)
+    seed_latency(client, 0.01)
+
+    response = await client._post_idempotent(OPERATION, "search", b"<rq/>")
+
+    assert response.text == "<answer n='2'/>"
+    assert client.hedged == 1
+    assert client.hedges_won == 1
+    await asyncio.sleep(0)
+    assert yeti.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_the_first_attempt_is_fast(make_client, hedging):
+    yeti = FakeYeti(200)
+    client = make_client(yeti)
+    seed_latency(client, 0.5)
+
+    response = await client._post_idempotent(OPERATION, "search", b"<rq/>")
+
+    assert response.text == "<answer n='1'/>"
+    assert yeti.requests == 1
+    assert client.hedged == 0
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_enough_latency_samples(make_client, hedging):
+    yeti = FakeYeti((0.05, 200))
+    client = make_client(yeti)
+    client.latency.record(OPERATION, 0.001)
+
+    await client._post_idempotent(OPERATION, "search", b"<rq/>")
+
+    assert yeti.requests == 1
+    assert client.hedged == 0
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_spare_upstream_capacity(make_client, hedging):
+    yeti = FakeYeti((0.05, 200))
+    client = make_client(yeti)
+    seed_latency(client, 0.001)
+    # One slot, taken by the first attempt
+    client.concurrency_limiter.min_limit = 1
+    client.concurrency_limiter._limit = 1.0
+
+    await client._post_idempotent(OPERATION, "search", b"<rq/>")
+
+    assert yeti.requests == 1
+    assert client.hedged == 0
+
+
+@pytest.mark.asyncio
+async def test_first_success_wins_even_if_the_hedge_fails(make_client, hedging):
+    yeti = FakeYeti((0.05, 200), 400)
+    client = make_client(yeti, max_attempts=1)
+    seed_latency(client, 0.01)
+
+    response = await client._post_idempotent(OPERATION, "search", b"<rq/>")
+
+    assert response.text == "<answer n='1'/>"
+    assert client.hedged == 1
+    assert client.hedges_won == 0
+
+
+@pytest.mark.asyncio
+async def test_both_attempts_failing_raises_the_original_error(make_client, hedging):
+    yeti = FakeYeti((0.05, 503), 400)
+    client = make_client(yeti, max_attempts=1)
+    seed_latency(client, 0.01)
+
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        await client._post_idempotent(OPERATION, "search", b"<rq/>")
+    assert exc_info.value.response.status_code == 503
+    assert yeti.requests == 2
+    assert client.hedged == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_hedged_round_is_retried(make_client, hedging):
+    yeti = FakeYeti((0.05, 503), 503, 200)
+    client = make_client(yeti, max_attempts=2)
+    seed_latency(client, 0.01)
+
+    response = await client._post_idempotent(OPERATION, "search", b"<rq/>")
+
+    assert response.text == "<answer n='3'/>"
+    assert yeti.requests == 3
@@ -0,0 +1,36 @@
+"""Helpers for building stable cache/coalescing keys from request schemas."""
+import hashlib
+import json
+from typing import Optional
+
+
+def _normalize_date(date_str: Optional[str]) -> str:
+    # Mirrors YetiClient._format_date so equivalent requests share a key
+    if not date_str or date_str.lower() == 'string':
+        return ""
+    return date_str.replace('-', '')
+
+
+def normalize_availability_request(request) -> dict:
+    """Reduce a FlightAvailabilityRequest to the fields that affect the upstream result."""
+    depart_date = _normalize_date(request.depart_date)
+    depart_date_to = _normalize_date(getattr(request, "depart_date_to", None))
+    return {
+        "origin": request.origin.strip().upper(),
+        "destination": request.destination.strip().upper(),
+        "depart_date": depart_date,
+        # A one-day range is the same upstream query as a plain search
+        "depart_date_to": "" if depart_date_to == depart_date else depart_date_to,
+        "return_date": _normalize_date(request.return_date),
+        "adults": request.adults,
+        "children": request.children,
+        "infants": request.infants,
+        "others": request.others,
+        "nationality": (request.nationality or "").strip().upper(),
+    }
+
+
+def availability_key(request) -> str:
+    """Stable digest of a normalized FlightAvailabilityRequest."""
+    normalized = json.dumps(normalize_availability_request(request), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
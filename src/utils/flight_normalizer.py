@@ -0,0 +1,124 @@
+"""Builds the compact typed flight model from parsed availability payloads."""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.dtos.flight_offer_dto import FareDTO, FlightDTO, SegmentDTO
+
+FLIGHT_TAGS = ("AvailabilityFlight", "Flight")
+SORT_KEYS = ("price", "departure")
+
+
+def _as_list(value: Any) -> List[Any]:
+    # xmltodict yields a dict for one child and a list for several
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        value = value.get("#text")
+    return value if isinstance(value, str) else None
+
+
+def _first(row: Dict[str, Any], *keys: str) -> Optional[str]:
+    for key in keys:
+        value = _text(row.get(key))
+        if value is not None:
+            return value
+    return None
+
+
+def _float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _bool(value: Optional[str]) -> Optional[bool]:
+    if value is None:
+        return None
+    return value.strip().lower() in ("1", "true", "y", "yes")
+
+
+def _iter_flight_rows(node: Any, direction: str = "outbound") -> Iterator[Tuple[str, Dict[str, Any]]]:
+    if isinstance(node, list):
+        for child in node:
+            yield from _iter_flight_rows(child, direction)
+        return
+    if not isinstance(node, dict):
+        return
+    for key, value in node.items():
+        if key in FLIGHT_TAGS:
+            for row in _as_list(value):
+                if isinstance(row, dict):
+                    yield direction, row
+        elif isinstance(value, (dict, list)):
+            child_direction = "return" if "return" in key.lower() else direction
+            yield from _iter_flight_rows(value, child_direction)
+
+
+def _segment(row: Dict[str, Any]) -> SegmentDTO:
+    return SegmentDTO(
+        airline=_first(row, "airline_rcd", "airline"),
+        flight_number=_first(row, "flight_number"),
+        origin=_first(row, "origin_rcd", "origin"),
+        destination=_first(row, "destination_rcd", "destination"),
+        departure_date=_first(row, "departure_date", "flight_date"),
+        departure_time=_first(row, "planned_departure_time", "departure_time"),
+        arrival_time=_first(row, "planned_arrival_time", "arrival_time"),
+        aircraft=_first(row, "aircraft_type_rcd", "aircraft"),
+    )
+
+
+def _fare(row: Dict[str, Any], fare_id: str) -> FareDTO:
+    return FareDTO(
+        fare_id=fare_id,
+        booking_class=_first(row, "booking_class_rcd", "booking_class"),
+        boarding_class=_first(row, "boarding_class_rcd", "boarding_class"),
+        fare_code=_first(row, "fare_code"),
+        currency=_first(row, "currency_rcd", "currency"),
+        adult_fare=_float(_first(row, "adult_fare")),
+        child_fare=_float(_first(row, "child_fare")),
+        infant_fare=_float(_first(row, "infant_fare")),
+        total_adult_fare=_float(_first(row, "total_adult_fare", "adult_fare")),
+        tax_amount=_float(_first(row, "tax_amount")),
+        seats_available=_int(_first(row, "seat_available", "seats_available")),
+        refundable=_bool(_first(row, "refundable_flag", "refundable")),
+    )
+
+
+def normalize_availability(data: Any) -> List[FlightDTO]:
+    """
+    Walk a parsed availability payload once and group its flat flight/fare
+    rows into FlightDTOs, one per (direction, flight_id).
+    """
+    flights: Dict[Tuple[str, str], FlightDTO] = {}
+    for direction, row in _iter_flight_rows(data):
+        flight_id = _first(row, "flight_id") or ""
+        flight = flights.get((direction, flight_id))
+        if flight is None:
+            flight = FlightDTO(flight_id=flight_id, direction=direction, segments=[_segment(row)])
+            flights[(direction, flight_id)] = flight
+        fare_id = _first(row, "fare_id")
+        if fare_id:
+            flight.fares.append(_fare(row, fare_id))
+    return list(flights.values())
+
+
+def sort_flights(flights: List[FlightDTO], sort_by: str) -> List[FlightDTO]:
+    """Sort by lowest total adult fare or by departure; unpriced flights go last."""
+    if sort_by == "price":
+        return sorted(flights, key=lambda f: (f.lowest_fare is None, f.lowest_fare or 0.0))
+    if sort_by == "departure":
+        return sorted(flights, key=lambda f: (
+            f.segments[0].departure_date or "", (f.segments[0].departure_time or "").zfill(4)
+        ))
+    raise ValueError(f"Unsupported sort_by: {sort_by}")
@@ -0,0 +1,182 @@
+"""
+SOAP request envelopes for the Yeti API.
+
+Envelopes are compact and share one SOAP prefix/suffix. Each operation is
+a single f-string, so its static fragments are compiled into constants; a
+fragment-joining template engine measured slower than that (see
+benchmarks/bench_soap_builder.py). Builders return UTF-8 bytes that can be
+handed straight to httpx.
+
+Values are XML-escaped (and stripped of characters XML 1.0 forbids), so
+names containing '&' or '<' cannot produce malformed payloads; this also
+applies inside the CDATA-wrapped inner XML of FlightAdd and BookingSave,
+which Yeti parses as XML in its own right.
+"""
+import re
+from typing import Any, Optional
+
+_ENVELOPE_OPEN = (
+    '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" '
+    'xmlns:tem="http://tempuri.org/"><soapenv:Header/><soapenv:Body>'
+)
+_ENVELOPE_CLOSE = '</soapenv:Body></soapenv:Envelope>'
+
+# Characters not allowed anywhere in an XML 1.0 document
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def escape_xml(value: Any) -> str:
+    """Escape a field value for use as XML element text."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, (int, float)):
+        # Numbers never contain markup
+        return str(value)
+    else:
+        text = str(value)
+    # Most values (codes, dates, counts) need nothing; these checks are far
+    # cheaper than a regex scan
+    if not text.isprintable():
+        text = _INVALID_XML_CHARS.sub("", text)
+    elif "&" not in text and "<" not in text and ">" not in text:
+        return text
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+_esc = escape_xml
+
+
+def flight_availability(
+    *,
+    agency_code: str,
+    password: str,
+    origin: str,
+    destination: str,
+    depart_from: str,
+    depart_to: str,
+    return_from: str,
+    return_to: str,
+    adults: int,
+    children: int,
+    infants: int,
+    others: int,
+    nationality: str,
+) -> bytes:
+    """FlightAvailability envelope."""
+    return (
+        f"{_ENVELOPE_OPEN}<tem:FlightAvailability>"
+        f"<tem:strAgencyCode>{_esc(agency_code)}</tem:strAgencyCode>"
+        f"<tem:strPassword>{_esc(password)}</tem:strPassword>"
+        f"<tem:strOrigin>{_esc(origin)}</tem:strOrigin>"
+        f"<tem:strDestination>{_esc(destination)}</tem:strDestination>"
+        f"<tem:strDepartFrom>{_esc(depart_from)}</tem:strDepartFrom>"
+        f"<tem:strDepartTo>{_esc(depart_to)}</tem:strDepartTo>"
+        f"<tem:strReturnFrom>{_esc(return_from)}</tem:strReturnFrom>"
+        f"<tem:strReturnTo>{_esc(return_to)}</tem:strReturnTo>"
+        f"<tem:iAdult>{int(adults)}</tem:iAdult>"
+        f"<tem:iChild>{int(children)}</tem:iChild>"
+        f"<tem:iInfant>{int(infants)}</tem:iInfant>"
+        f"<tem:iOther>{int(others)}</tem:iOther>"
+        f"<tem:nationality>{_esc(nationality)}</tem:nationality>"
+        "<tem:strBookingClass></tem:strBookingClass>"
+        "<tem:strBoardingClass></tem:strBoardingClass>"
+        "<tem:strPromoCode></tem:strPromoCode>"
+        "<tem:strLanguageCode>EN</tem:strLanguageCode>"
+        f"</tem:FlightAvailability>{_ENVELOPE_CLOSE}"
+    ).encode("utf-8")
+
+
+def service_initialize(*, agency_code: str, username: str, password: str) -> bytes:
+    """ServiceInitialize envelope. This is the one operation Yeti expects as SOAP 1.2."""
+    return (
+        '<soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope" xmlns:tem="http://tempuri.org/">'
+        "<soap:Header/><soap:Body><tem:ServiceInitialize>"
+        f"<tem:strAgencyCode>{_esc(agency_code)}</tem:strAgencyCode>"
+        f"<tem:strUserName>{_esc(username)}</tem:strUserName>"
+        f"<tem:strPassword>{_esc(password)}</tem:strPassword>"
+        "<tem:strLanguageCode>EN</tem:strLanguageCode>"
+        "</tem:ServiceInitialize></soap:Body></soap:Envelope>"
+    ).encode("utf-8")
+
+
+def flight_add(
+    *,
+    adults: int,
+    children: int,
+    infants: int,
+    flight_id: str,
+    fare_id: Optional[str],
+    origin: str,
+    destination: str,
+) -> bytes:
+    """FlightAdd envelope with the booking XML wrapped in CDATA."""
+    return (
+        f"{_ENVELOPE_OPEN}<tem:FlightAdd><tem:strXml><![CDATA["
+        "<Booking><Header>"
+        f"<adult>{int(adults)}</adult>"
+        f"<child>{int(children)}</child>"
+        f"<infant>{int(infants)}</infant>"
+        "</Header><FlightSegment>"
+        f"<flight_id>{_esc(flight_id)}</flight_id>"
+        f"<fare_id>{_esc(fare_id)}</fare_id>"
+        f"<origin_rcd>{_esc(origin)}</origin_rcd>"
+        f"<destination_rcd>{_esc(destination)}</destination_rcd>"
+        "</FlightSegment></Booking>"
+        f"]]></tem:strXml></tem:FlightAdd>{_ENVELOPE_CLOSE}"
+    ).encode("utf-8")
+
+
+_BOOKING_GET_SESSION = f"{_ENVELOPE_OPEN}<tem:BookingGetSession/>{_ENVELOPE_CLOSE}".encode("utf-8")
+
+
+def booking_get_session() -> bytes:
+    """BookingGetSession envelope; it has no fields, so it is built once."""
+    return _BOOKING_GET_SESSION
+
+
+def _passenger(p) -> str:
+    return (
+        "<Passenger>"
+        f"<passenger_id>{_esc(p.passenger_id)}</passenger_id>"
+        f"<passenger_type_rcd>{_esc(p.passenger_type_rcd)}</passenger_type_rcd>"
+        f"<lastname>{_esc(p.lastname)}</lastname>"
+        f"<firstname>{_esc(p.firstname)}</firstname>"
+        f"<gender_type_rcd>{_esc(p.gender_type_rcd)}</gender_type_rcd>"
+        f"<nationality_rcd>{_esc(p.nationality_rcd)}</nationality_rcd>"
+        f"<date_of_birth>{_esc(p.date_of_birth)}</date_of_birth>"
+        "</Passenger>"
+    )
+
+
+def booking_save(request_data) -> bytes:
+    """BookingSave envelope built from a BookingSaveRequest."""
+    header = request_data.booking_header
+    payment = request_data.payment
+    return (
+        f"{_ENVELOPE_OPEN}<tem:BookingSave><tem:strXml><![CDATA["
+        "<Booking><BookingHeader>"
+        f"<contact_name>{_esc(header.contact_name)}</contact_name>"
+        f"<contact_email>{_esc(header.contact_email)}</contact_email>"
+        f"<phone_mobile>{_esc(header.phone_mobile)}</phone_mobile>"
+        f"<phone_home>{_esc(header.phone_home)}</phone_home>"
+        f"<phone_business>{_esc(header.phone_business)}</phone_business>"
+        "</BookingHeader>"
+        f"{''.join(map(_passenger, request_data.passengers))}"
+        "<Payment>"
+        f"<form_of_payment_rcd>{_esc(payment.form_of_payment_rcd)}</form_of_payment_rcd>"
+        f"<currency_rcd>{_esc(payment.currency_rcd)}</currency_rcd>"
+        f"<payment_amount>{_esc(payment.payment_amount)}</payment_amount>"
+        "</Payment></Booking>"
+        f"]]></tem:strXml></tem:BookingSave>{_ENVELOPE_CLOSE}"
+    ).encode("utf-8")
+
+
+def booking_get_itinerary(*, pnr: str) -> bytes:
+    """BookingGetItinerary envelope."""
+    return (
+        f"{_ENVELOPE_OPEN}<tem:BookingGetItinerary>"
+        f"<tem:strRecordLocator>{_esc(pnr)}</tem:strRecordLocator>"
+        f"</tem:BookingGetItinerary>{_ENVELOPE_CLOSE}"
+    ).encode("utf-8")
@@ -0,0 +1,253 @@
+"""
+Single-pass expat parser for Yeti SOAP responses.
+
+The Yeti API returns its payload as escaped XML text inside the
+`*Result` element. Instead of unescaping the whole envelope and building a
+tree for it, the outer parser skips the envelope and feeds the Result text
+(which expat has already unescaped) straight into an inner parser that
+builds the payload. Output matches `parse_yeti_xml_response`.
+"""
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.parsers import expat
+
+from src.utils.xml_parser import parse_yeti_xml_response
+
+logger = logging.getLogger(__name__)
+
+# Elements treated as individual records by iter_yeti_records
+DEFAULT_RECORD_TAGS = ("AvailabilityFlight", "Flight", "FlightSegment", "Fare")
+
+RecordCallback = Callable[[str, Any], None]
+
+
+class _ResultNotFound(Exception):
+    """The envelope has no `*Result` element; defer to the tree parser."""
+
+
+def _forbid_entities(*_args, **_kwargs):
+    raise ValueError("entities are disabled")
+
+
+def _new_expat_parser():
+    parser = expat.ParserCreate("utf-8")
+    parser.ordered_attributes = True
+    parser.buffer_text = True
+    # Same protection xmltodict applies by default
+    parser.EntityDeclHandler = _forbid_entities
+    return parser
+
+
+class _DictBuilder:
+    """
+    Builds xmltodict-compatible dicts from expat events: attributes as
+    '@name', mixed text as '#text', repeated children as lists, whitespace
+    stripped, empty elements as None.
+
+    When `record_tags` is given, completed elements with those names are
+    passed to `on_record`; with `detach_records` they are not attached to
+    their parent, so memory stays bounded by one record.
+    """
+
+    def __init__(
+        self,
+        record_tags: Iterable[str] = (),
+        on_record: Optional[RecordCallback] = None,
+        detach_records: bool = False,
+    ):
+        self.record_tags = frozenset(record_tags)
+        self.on_record = on_record
+        self.detach_records = detach_records
+        self.item: Optional[Dict[str, Any]] = None
+        self.data: List[str] = []
+        self._stack: List[Tuple[Optional[Dict[str, Any]], List[str]]] = []
+
+    def start(self, name: str, attrs: List[str]) -> None:
+        self._stack.append((self.item, self.data))
+        if attrs:
+            self.item = {"@" + attrs[i]: attrs[i + 1] for i in range(0, len(attrs), 2)}
+        else:
+            self.item = None
+        self.data = []
+
+    def end(self, name: str) -> None:
+        data = "".join(self.data) if self.data else None
+        item = self.item
+        self.item, self.data = self._stack.pop()
+        if data:
+            data = data.strip() or None
+        if item is not None:
+            if data:
+                _push(item, "#text", data)
+            value = item
+        else:
+            value = data
+
+        if name in self.record_tags and self.on_record is not None:
+            self.on_record(name, value)
+            if self.detach_records:
+                return
+        self.item = _push(self.item, name, value)
+
+    def characters(self, data: str) -> None:
+        self.data.append(data)
+
+    def attach(self, parser) -> None:
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+        parser.CharacterDataHandler = self.characters
+
+
+def _push(item: Optional[Dict[str, Any]], key: str, value: Any) -> Dict[str, Any]:
+    if item is None:
+        item = {}
+    existing = item.get(key, _push)
+    if existing is _push:
+        item[key] = value
+    elif isinstance(existing, list):
+        existing.append(value)
+    else:
+        item[key] = [existing, value]
+    return item
+
+
+class _EnvelopeReader:
+    """
+    Walks the outer envelope with expat and hands everything inside the
+    first `*Result` element under soap Body to a _DictBuilder.
+    """
+
+    ENVELOPE_TAGS = ("soap:Envelope", "soapenv:Envelope")
+    BODY_TAGS = ("soap:Body", "soapenv:Body")
+
+    def __init__(self, builder: _DictBuilder):
+        self.builder = builder
+        self.depth = 0
+        self.path: List[str] = []
+        self.body_children = 0
+        self.result_depth: Optional[int] = None
+        self.result_seen = False
+        self._inner = None
+        self._has_elements = False
+
+    def start(self, name: str, attrs: List[str]) -> None:
+        self.depth += 1
+        if self.depth <= 3:
+            self.path.append(name)
+            if self.depth == 3:
+                self.body_children += 1
+        if self.result_depth is not None:
+            # Result holds real elements rather than escaped text
+            if self._inner is not None:
+                raise ValueError("mixed escaped text and elements in Result")
+            self._has_elements = True
+            self.builder.start(name, attrs)
+        elif (
+            self.depth == 4
+            and not self.result_seen
+            and name.endswith("Result")
+            and self.body_children == 1
+            and self.path[0] in self.ENVELOPE_TAGS
+            and self.path[1] in self.BODY_TAGS
+        ):
+            # Envelope > Body > first OperationResponse > OperationResult
+            self.result_depth = self.depth
+            self.result_seen = True
+            self.builder.start(name, attrs)
+
+    def end(self, name: str) -> None:
+        if self.result_depth is not None:
+            if self.depth == self.result_depth:
+                if self._inner is not None:
+                    self._inner.Parse("", True)
+                    self._inner = None
+                self.builder.end(name)
+                self.result_depth = None
+            else:
+                self.builder.end(name)
+        if self.depth <= 3:
+            self.path.pop()
+        self.depth -= 1
+
+    def characters(self, data: str) -> None:
+        if self.result_depth is None:
+            return
+        if self.depth != self.result_depth or self._has_elements:
+            self.builder.characters(data)
+            return
+        if self._inner is None:
+            # Skip leading whitespace so an inner XML declaration stays at the start
+            if not data.strip():
+                return
+            self._inner = _new_expat_parser()
+            self.builder.attach(self._inner)
+            data = data.lstrip()
+        self._inner.Parse(data, False)
+
+    def attach(self, parser) -> None:
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+        parser.CharacterDataHandler = self.characters
+
+
+def _chunks(text: str, size: int) -> Iterator[str]:
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+def _parse_result(xml_string: str, builder: _DictBuilder, chunk_size: int = 64 * 1024) -> Any:
+    reader = _EnvelopeReader(builder)
+    parser = _new_expat_parser()
+    reader.attach(parser)
+    # Feed in slices so no full-size encoded copy of the body is made
+    for chunk in _chunks(xml_string, chunk_size):
+        parser.Parse(chunk, False)
+    parser.Parse("", True)
+
+    if not reader.result_seen:
+        raise _ResultNotFound()
+    # builder.item is {ResultName: value}; callers want the value itself
+    return next(iter(builder.item.values()))
+
+
+def parse_yeti_xml_response_streaming(xml_string: str) -> Any:
+    """
+    Parse a Yeti SOAP response in one pass, returning the `*Result` payload.
+
+    Falls back to `parse_yeti_xml_response` for envelopes without a Result
+    element or with content the single-pass reader does not handle, so the
+    output always matches the tree parser.
+    """
+    try:
+        return _parse_result(xml_string, _DictBuilder())
+    except _ResultNotFound:
+        return parse_yeti_xml_response(xml_string)
+    except Exception as e:
+        logger.debug(f"Streaming parse failed, falling back to tree parser: {e}")
+        return parse_yeti_xml_response(xml_string)
+
+
+def iter_yeti_records(
+    xml_string: str,
+    record_tags: Iterable[str] = DEFAULT_RECORD_TAGS,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (tag, record) pairs for flight/fare elements as they are parsed.
+
+    Records are detached once yielded, so memory is bounded by the input
+    chunk size and a single record rather than the whole payload.
+    """
+    ready: List[Tuple[str, Any]] = []
+    builder = _DictBuilder(record_tags, on_record=lambda tag, value: ready.append((tag, value)),
+                           detach_records=True)
+    reader = _EnvelopeReader(builder)
+    parser = _new_expat_parser()
+    reader.attach(parser)
+    for chunk in _chunks(xml_string, chunk_size):
+        parser.Parse(chunk, False)
+        if ready:
+            yield from ready
+            ready.clear()
+    parser.Parse("", True)
+    yield from ready
@@ -1,9 +1,14 @@
 import xmltodict
 import html
 import logging
+import re
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# An XML declaration; once the payload is unescaped, only the envelope's may stay
+_XML_DECLARATION = re.compile(r"<\?xml\b[^>]*\?>")
+
 def parse_yeti_xml_response(xml_string: str):
     """
     Parses the raw SOAP/XML response from Yeti API, unescapes the inner XML,
@@ -12,6 +17,8 @@ def parse_yeti_xml_response(xml_string: str):
     try:
         # 1. Unescape HTML entities (converts &lt; to <, etc.)
         unescaped_xml = html.unescape(xml_string)
+        # Some payloads carry their own <?xml ...?>, which is illegal mid-document
+        unescaped_xml = unescaped_xml[:1] + _XML_DECLARATION.sub("", unescaped_xml[1:])
         
         # 2. Parse XML to Dict
         # Using xmltodict for easier handling of deep nested data
@@ -47,6 +54,18 @@ def parse_yeti_xml_response(xml_string: str):
         # Return raw if parsing fails
         return {"raw_response": xml_string, "error": str(e)}
 
+# <record_locator>ABC123</record_locator>, escaped or not, inside a booking payload
+_RECORD_LOCATOR = re.compile(
+    r"(?:<|&lt;)record_locator(?:>|&gt;)\s*([A-Za-z0-9]+)\s*(?:<|&lt;)/record_locator"
+)
+
+def extract_record_locator(xml_string: str) -> Optional[str]:
+    """Return the PNR (record locator) of a booking response, uppercased, if present."""
+    if not xml_string:
+        return None
+    match = _RECORD_LOCATOR.search(xml_string)
+    return match.group(1).upper() if match else None
+
 def unescape_xml(xml_string: str) -> str:
     """Helper to just unescape HTML entities for logging"""
     if not xml_string:
@@ -0,0 +1,105 @@
+"""
+Audit archiver: consumes the audit batches the API publishes with
+AUDIT_SINK=rabbitmq and stores them as {dir}/{search_id}/{seq:02d}_{id}_{filename}
+files, or in the segmented audit store with --format segments.
+
+    python -m src.workers.audit_archiver [--dir /mnt/audit] [--format segments]
+
+Point --dir (default AUDIT_ARCHIVE_DIR) at durable storage. A batch is
+acked only after it has been written, so a crash redelivers it; files
+are rewritten, and segment reads skip the repeated records. Several
+archivers can share the queue.
+"""
+import argparse
+import asyncio
+import signal
+from typing import Optional
+
+from aio_pika.abc import AbstractIncomingMessage
+
+from src.config import settings
+from src.logger import logger
+from src.modules.audit_writer import (
+    AuditSink,
+    FileAuditSink,
+    SegmentAuditSink,
+    decode_audit_batch,
+    declare_audit_topology,
+)
+from src.modules.segment_store import get_segment_store
+from src.modules.rabbitmq_client import RabbitMQClient
+
+
+class AuditArchiver:
+    """Writes received audit batches to a sink and counts them."""
+
+    def __init__(self, sink: Optional[AuditSink] = None):
+        self.sink = sink or FileAuditSink(settings.AUDIT_ARCHIVE_DIR)
+        self.batches = 0
+        self.records = 0
+        self.failed = 0
+
+    async def handle(self, message: AbstractIncomingMessage) -> None:
+        try:
+            records = await asyncio.to_thread(decode_audit_batch, message.body)
+        except Exception as e:
+            # Undecodable batches would fail forever; drop them loudly
+            self.failed += 1
+            logger.error(f"Discarding undecodable audit batch {message.message_id}: {e}")
+            await message.reject(requeue=False)
+            return
+        try:
+            await self.sink.write_batch(records)
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Audit archive write failed for {len(records)} records, requeueing: {e}")
+            # Storage is most likely unavailable; don't spin on the redelivery
+            await asyncio.sleep(1)
+            await message.nack(requeue=True)
+            return
+        await message.ack()
+        self.batches += 1
+        self.records += len(records)
+
+
+def create_archive_sink(archive_dir: str, archive_format: str) -> AuditSink:
+    if archive_format == "segments":
+        return SegmentAuditSink(get_segment_store(archive_dir))
+    return FileAuditSink(archive_dir)
+
+
+async def run(archive_dir: str, archive_format: str = "files") -> None:
+    rabbitmq = RabbitMQClient()
+    channel = await rabbitmq.get_channel()
+    await channel.set_qos(prefetch_count=settings.AUDIT_ARCHIVER_PREFETCH)
+    _, queue = await declare_audit_topology(channel)
+
+    archiver = AuditArchiver(create_archive_sink(archive_dir, archive_format))
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    consumer_tag = await queue.consume(archiver.handle)
+    logger.info(f"Audit archiver consuming {settings.AUDIT_QUEUE_NAME} into {archive_dir} ({archive_format})")
+    await stopping.wait()
+
+    await queue.cancel(consumer_tag)
+    await archiver.sink.close()
+    await rabbitmq.close()
+    logger.info(
+        f"Audit archiver stopped: {archiver.batches} batches, {archiver.records} records, "
+        f"{archiver.failed} failed"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive audit records from RabbitMQ")
+    parser.add_argument("--dir", default=settings.AUDIT_ARCHIVE_DIR, help="archive directory")
+    parser.add_argument("--format", choices=("files", "segments"), default="files", help="archive layout")
+    args = parser.parse_args()
+    asyncio.run(run(args.dir, args.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Booking worker: consumes queued BookingSave jobs and runs them against Yeti.
+
+    python -m src.workers.booking_worker
+
+Run as many as needed, independently of the API. Each one handles up to
+BOOKING_WORKER_CONCURRENCY jobs at a time; on SIGTERM it stops taking new
+jobs and finishes the ones in progress. Yeti session cookies must be
+visible to every process, so SESSION_STORE_BACKEND has to be "redis".
+"""
+import asyncio
+import signal
+from typing import Optional, Set
+
+import httpx
+from aio_pika.abc import AbstractIncomingMessage
+
+from src.config import settings
+from src.exceptions.base_exception import BaseCustomException
+from src.logger import logger, get_search_logger
+from src.modules.audit_writer import audit_writer
+from src.modules.booking_job_store import BookingJobStore, TERMINAL_STATUSES
+from src.modules.rabbitmq_client import RabbitMQClient
+from src.modules.redis_client import RedisClient
+from src.modules.yeti_client import yeti_client
+from src.schemas.booking_save_schema import BookingSaveRequest
+from src.services.booking_job_service import declare_booking_queue
+from src.services.flight_service_facade import FlightServiceFacade, flight_service_facade
+from src.utils.xml_parser import extract_record_locator
+
+INTERRUPTED = "The worker stopped during BookingSave; check the itinerary before booking again"
+NO_ANSWER = "No answer from Yeti to BookingSave; check the itinerary before booking again"
+
+
+def _sent_without_answer(error: BaseException) -> bool:
+    """True if the request may have reached Yeti but its answer was lost."""
+    # yeti_client re-raises httpx errors without `from`, hence __context__
+    while error is not None:
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            return False
+        if isinstance(error, httpx.TransportError):
+            return True
+        if isinstance(error, httpx.HTTPStatusError):
+            # A 5xx (often a 502/504 from a gateway) doesn't say whether Yeti saved it
+            return error.response.status_code >= 500
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class BookingWorker:
+    """Executes booking jobs and records their outcome in the job store."""
+
+    def __init__(self, facade: Optional[FlightServiceFacade] = None, store: Optional[BookingJobStore] = None):
+        self._facade = facade or flight_service_facade
+        self._store = store or BookingJobStore()
+        self._in_flight: Set[asyncio.Task] = set()
+
+    async def handle(self, message: AbstractIncomingMessage) -> None:
+        """Consumer callback: ack once the outcome is recorded, requeue if it couldn't be."""
+        task = asyncio.current_task()
+        self._in_flight.add(task)
+        try:
+            await self.process(message.message_id, message.body)
+        except Exception as e:
+            logger.error(f"Booking job {message.message_id} could not be recorded, requeueing: {e}")
+            # Redis is most likely down; don't spin on the redelivery
+            await asyncio.sleep(1)
+            await message.nack(requeue=True)
+        else:
+            await message.ack()
+        finally:
+            self._in_flight.discard(task)
+
+    async def process(self, job_id: str, body: bytes) -> None:
+        job = await self._store.get(job_id)
+        if job is None:
+            logger.warning(f"Booking job {job_id} has expired or does not exist; discarding it")
+            return
+        if job["status"] in TERMINAL_STATUSES:
+            return
+        search_logger = get_search_logger(job["search_id"])
+        # BookingSave is not idempotent: a redelivered job that was already
+        # claimed must not be sent again
+        if not await self._store.claim(job_id):
+            search_logger.warning(f"Booking job {job_id} was interrupted; outcome unknown")
+            await self._store.update(job_id, "unknown", error=INTERRUPTED)
+            return
+
+        await self._store.update(job_id, "running")
+        search_logger.info(f"Running booking job {job_id}")
+        try:
+            request = BookingSaveRequest.model_validate_json(body)
+            response = await self._facade.save_booking(request)
+        except BaseCustomException as e:
+            search_logger.error(f"Booking job {job_id} failed: {e.message}")
+            await self._store.update(job_id, "failed", error=e.message)
+            return
+        except Exception as e:
+            if _sent_without_answer(e):
+                search_logger.error(f"Booking job {job_id} outcome unknown: {e}")
+                await self._store.update(job_id, "unknown", error=NO_ANSWER)
+            else:
+                search_logger.error(f"Booking job {job_id} failed: {e}")
+                await self._store.update(job_id, "failed", error=str(e))
+            return
+
+        pnr = extract_record_locator(response.raw_response)
+        if pnr:
+            search_logger.info(f"Booking job {job_id} saved pnr={pnr}")
+            await self._store.update(job_id, "succeeded", pnr=pnr, raw_response=response.raw_response)
+        else:
+            search_logger.error(f"Booking job {job_id}: BookingSave returned no record locator")
+            await self._store.update(
+                job_id, "failed", error="BookingSave returned no record locator", raw_response=response.raw_response
+            )
+
+    async def drain(self, timeout: float) -> None:
+        """Wait for the jobs in progress to finish."""
+        if self._in_flight:
+            await asyncio.wait(set(self._in_flight), timeout=timeout)
+
+
+async def run() -> None:
+    if settings.SESSION_STORE_BACKEND.lower() != "redis":
+        raise SystemExit("The booking worker needs SESSION_STORE_BACKEND=redis to see the API's Yeti sessions")
+
+    await audit_writer.start()
+    await yeti_client.start()
+    rabbitmq = RabbitMQClient()
+    channel = await rabbitmq.get_channel()
+    await channel.set_qos(prefetch_count=settings.BOOKING_WORKER_CONCURRENCY)
+    queue = await declare_booking_queue(channel)
+
+    worker = BookingWorker()
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    consumer_tag = await queue.consume(worker.handle)
+    logger.info(
+        f"Booking worker consuming {settings.BOOKING_QUEUE_NAME} "
+        f"(concurrency={settings.BOOKING_WORKER_CONCURRENCY})"
+    )
+    await stopping.wait()
+
+    logger.info("Booking worker stopping; finishing jobs in progress")
+    await queue.cancel(consumer_tag)
+    # Bounded by the Yeti timeout; unacked jobs left behind are redelivered as interrupted
+    await worker.drain(settings.YETI_HTTP_TIMEOUT + 5)
+    await yeti_client.close()
+    await RedisClient().close()
+    await audit_writer.stop()
+    await rabbitmq.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())